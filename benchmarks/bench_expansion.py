@@ -0,0 +1,78 @@
+"""Benchmark instance expansion on a spec that reuses instance-tagged types in many places.
+
+Generates a spec where every component type references the same few instance-tagged types (seats, doors, windows
+and wheels with two or three tag levels), as vehicle specs do, and times ``expand_instances_in_schema`` on a fresh
+fork of the schema for every run. Forking is not timed. The number of created intermediate types is reported
+along with the timings; it only depends on the tagged types, not on how often they are referenced.
+
+Usage:
+    python benchmarks/bench_expansion.py [--components 2000] [--repeat 3]
+"""
+
+import argparse
+import statistics
+import time
+
+from graphql import build_schema
+
+from s2dm import log
+from s2dm.exporters.utils.instance_tag import expand_instances_in_schema
+from s2dm.exporters.utils.schema_fork import fork_schema
+
+TAGGED_TYPES_SDL = """directive @instanceTag on OBJECT
+
+enum RowEnum { ROW1 ROW2 ROW3 }
+enum SideEnum { DRIVERSIDE PASSENGERSIDE }
+enum PositionEnum { LEFT CENTER RIGHT }
+enum AxleEnum { FRONT REAR }
+
+type SeatPosition @instanceTag { row: RowEnum position: PositionEnum }
+type DoorPosition @instanceTag { row: RowEnum side: SideEnum }
+type WindowPosition @instanceTag { row: RowEnum side: SideEnum position: PositionEnum }
+type WheelPosition @instanceTag { axle: AxleEnum side: SideEnum }
+
+type Seat { isOccupied: Boolean heating: Int instanceTag: SeatPosition }
+type Door { isOpen: Boolean isLocked: Boolean instanceTag: DoorPosition }
+type Window { position: Int isOpen: Boolean instanceTag: WindowPosition }
+type Wheel { speed: Float pressure: Int instanceTag: WheelPosition }
+"""
+
+REUSED_FIELDS = "  seats: [Seat]\n  doors: [Door]\n  windows: [Window]\n  wheels: [Wheel!]\n"
+
+
+def generate_schema_sdl(components: int) -> str:
+    """Return the SDL of a spec whose component types all reference the same instance-tagged types."""
+    blocks = [TAGGED_TYPES_SDL]
+    for index in range(components):
+        blocks.append(f"type Component{index} {{\n  name: String\n{REUSED_FIELDS}}}\n")
+    query_fields = "\n".join(f"  component{index}: Component{index}" for index in range(components))
+    blocks.append(f"type Query {{\n{query_fields}\n}}\n")
+    return "\n".join(blocks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, default=2000, help="Types referencing the instance-tagged types")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs (the median is reported)")
+    args = parser.parse_args()
+
+    log.setLevel("WARNING")
+
+    schema = build_schema(generate_schema_sdl(args.components))
+    print(f"Synthetic spec: {len(schema.type_map)} types, {args.components * 4} expandable fields")
+
+    timings = []
+    for _ in range(args.repeat):
+        forked = fork_schema(schema)
+        start = time.perf_counter()
+        _, type_metadata, field_metadata = expand_instances_in_schema(forked)
+        timings.append(time.perf_counter() - start)
+
+    intermediate_types = sum(1 for metadata in type_metadata.values() if metadata.is_intermediate_type)
+    print(f"expanded fields         {len(field_metadata):>10}")
+    print(f"intermediate types      {intermediate_types:>10}")
+    print(f"expansion               {statistics.median(timings) * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
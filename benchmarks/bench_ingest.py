@@ -0,0 +1,103 @@
+"""Benchmark concurrent ingestion of schema files.
+
+Generates a synthetic spec tree with many small GraphQL files and compares reading and parsing them with a single
+thread against the thread pool of the schema loader. The schema cache is disabled, so every run parses all files.
+
+Parsing is CPU bound and holds the GIL, so the thread pool pays off where reading a file has latency, e.g. on network
+file systems. ``--read-latency-ms`` adds a fixed delay to every file read to simulate such a file system.
+
+Usage:
+    python benchmarks/bench_ingest.py [--files 2000] [--workers 1 4 8 16] [--repeat 3] [--read-latency-ms 2]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from s2dm import log
+from s2dm.exporters.utils.schema_cache import set_default_schema_cache
+from s2dm.exporters.utils.schema_loader import (
+    build_schema_document_with_source_map,
+    build_schema_from_document,
+    resolve_graphql_files,
+)
+
+FILES_PER_DIRECTORY = 50
+FIELDS_PER_TYPE = 12
+
+
+def generate_spec_tree(root: Path, num_files: int) -> None:
+    """Write ``num_files`` GraphQL files, each defining one object type and one enum, into nested directories."""
+    for index in range(num_files):
+        directory = root / f"domain{index // FILES_PER_DIRECTORY:03d}" / f"area{index % 5}"
+        directory.mkdir(parents=True, exist_ok=True)
+        fields = "\n".join(
+            f'  """Signal {i} of component {index}."""\n  signal{i}: Float' for i in range(FIELDS_PER_TYPE)
+        )
+        content = (
+            f'"""Component {index}."""\n'
+            f"type Component{index} {{\n{fields}\n  state: Component{index}_State_Enum\n}}\n\n"
+            f"enum Component{index}_State_Enum {{\n  OFF\n  STANDBY\n  ON\n  FAULT\n}}\n"
+        )
+        (directory / f"Component{index}.graphql").write_text(content)
+    query_fields = "\n".join(f"  component{index}: Component{index}" for index in range(num_files))
+    (root / "Query.graphql").write_text(f"type Query {{\n{query_fields}\n}}\n")
+
+
+def simulate_read_latency(latency_ms: float) -> None:
+    """Delay every ``Path.read_text`` call by the given latency without holding the GIL."""
+    original_read_text = Path.read_text
+
+    def slow_read_text(self: Path, *args: Any, **kwargs: Any) -> str:
+        time.sleep(latency_ms / 1000)
+        return original_read_text(self, *args, **kwargs)
+
+    Path.read_text = slow_read_text  # type: ignore[method-assign]
+
+
+def time_ingest(files: list[Path], max_workers: int, repeat: int) -> float:
+    """Return the median wall time of reading and parsing all files with the given number of threads."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_schema_document_with_source_map(files, max_workers=max_workers)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000, help="Number of generated schema files")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16], help="Thread counts to compare")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per thread count (the median is reported)")
+    parser.add_argument("--read-latency-ms", type=float, default=0.0, help="Simulated latency of every file read")
+    args = parser.parse_args()
+
+    log.setLevel("WARNING")
+    set_default_schema_cache(None)
+
+    with tempfile.TemporaryDirectory(prefix="s2dm-bench-") as temp_dir:
+        root = Path(temp_dir)
+        generate_spec_tree(root, args.files)
+        files = resolve_graphql_files([root])
+
+        document, _ = build_schema_document_with_source_map(files, max_workers=1)
+        schema = build_schema_from_document(document)
+        print(f"Synthetic tree: {len(files)} files, {len(schema.type_map)} types")
+
+        if args.read_latency_ms:
+            simulate_read_latency(args.read_latency_ms)
+            print(f"Simulated read latency: {args.read_latency_ms} ms per file")
+
+        baseline = None
+        for max_workers in args.workers:
+            elapsed = time_ingest(files, max_workers, args.repeat)
+            baseline = baseline or elapsed
+            print(f"workers={max_workers:>3}  {elapsed * 1000:8.1f} ms  speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark the memory retained per field by the metadata records of the pipeline.
+
+Builds a schema with ``--fields`` signal fields and measures, with tracemalloc, the memory retained by the
+annotated schema metadata (one ``FieldMetadata`` per field) and by the ID generation specs (one
+``IDGenerationSpec`` per field). The schema itself and the directive cache are built before tracing starts, so
+only the records are counted. Results are reported in bytes per field.
+
+Usage:
+    python benchmarks/bench_memory.py [--fields 100000] [--fields-per-type 20]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import cast
+
+from graphql import GraphQLObjectType, GraphQLSchema, build_schema
+
+from s2dm import log
+from s2dm.exporters.utils.schema_loader import build_annotated_schema
+from s2dm.idgen.models import IDGenerationSpec
+
+SIGNAL_TYPES = [
+    "Float @range(min: 0, max: 250)",
+    "Boolean",
+    "Int",
+    "String",
+    "[String]",
+]
+
+
+def generate_schema(fields: int, fields_per_type: int) -> tuple[GraphQLSchema, dict[str, str]]:
+    """Return a schema with the given number of signal fields, and a source map of its types."""
+    blocks = ["directive @range(min: Float, max: Float) on FIELD_DEFINITION"]
+    type_names = []
+    for type_index in range(0, fields, fields_per_type):
+        type_name = f"Component{type_index // fields_per_type}"
+        type_names.append(type_name)
+        signals = "\n".join(
+            f"  signal{index}: {SIGNAL_TYPES[index % len(SIGNAL_TYPES)]}"
+            for index in range(min(fields_per_type, fields - type_index))
+        )
+        blocks.append(f"type {type_name} {{\n{signals}\n}}")
+    query_fields = "\n".join(f"  {type_name[0].lower()}{type_name[1:]}: {type_name}" for type_name in type_names)
+    blocks.append(f"type Query {{\n{query_fields}\n}}")
+
+    schema = build_schema("\n\n".join(blocks))
+    source_map = {type_name: f"spec/{type_name}.graphql" for type_name in type_names}
+    return schema, source_map
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Return the memory retained by the result of a function."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def build_id_specs(schema: GraphQLSchema) -> list[IDGenerationSpec]:
+    """Return the ID generation specs of every field of the component types."""
+    specs = []
+    for type_name, named_type in schema.type_map.items():
+        if not type_name.startswith("Component"):
+            continue
+        for field_name, field in cast(GraphQLObjectType, named_type).fields.items():
+            specs.append(IDGenerationSpec.from_field(parent_name=type_name, field_name=field_name, field=field))
+    return specs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fields", type=int, default=100_000, help="Number of signal fields")
+    parser.add_argument("--fields-per-type", type=int, default=20, help="Signal fields of every component type")
+    args = parser.parse_args()
+
+    log.setLevel("WARNING")
+
+    schema, source_map = generate_schema(args.fields, args.fields_per_type)
+    field_count = sum(len(getattr(named_type, "fields", {})) for named_type in schema.type_map.values())
+    print(f"Synthetic schema: {len(schema.type_map)} types, {field_count} fields")
+
+    # Parse the directives of every field before tracing, so their shared cache is not counted per record
+    build_id_specs(schema)
+
+    annotation = retained_bytes(lambda: build_annotated_schema(schema, source_map, {}, {}))
+    id_specs = retained_bytes(lambda: build_id_specs(schema))
+    print(f"{'annotated schema':<24}{annotation / 2**20:>10.1f} MiB{annotation / field_count:>10.0f} bytes/field")
+    print(f"{'ID generation specs':<24}{id_specs / 2**20:>10.1f} MiB{id_specs / args.fields:>10.0f} bytes/field")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Benchmark every stage of the s2dm pipeline on a synthetic VSS-style spec.
+
+Generates a spec with ``synthetic_schema.py`` and times loading, validation, pruning with a selection query,
+naming conversion with an empty name conversion cache, naming convention checks, instance expansion, annotation,
+composing, writing and reading an annotated schema artifact, every exporter, ID generation and search. Every stage
+runs on the same loaded schema; stages modifying the schema get a fresh fork of it, and forking is not timed.
+The schema cache is disabled, so loading always parses all files.
+
+The results are written as JSON. Passing an earlier result file with ``--compare`` prints the change of every stage
+and fails if a stage became slower than ``--max-slowdown`` times its earlier duration.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--depth 4] [--branching 6] [--repeat 1] [--output results.json]
+                                        [--compare baseline.json] [--max-slowdown 1.5]
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from graphql import GraphQLSchema, parse
+from synthetic_schema import SyntheticSpecOptions, generate_synthetic_spec
+
+from s2dm import __version__, log
+from s2dm.exporters.export_all import EXPORTERS, SELECTION_QUERY_EXPORTERS, ExportInputs, ExportOptions
+from s2dm.exporters.id import IDExporter
+from s2dm.exporters.utils.annotated_artifact import (
+    AnnotatedSchemaArtifact,
+    read_annotated_schema_artifact,
+    write_annotated_schema_artifact,
+)
+from s2dm.exporters.utils.instance_tag import expand_instances_in_schema
+from s2dm.exporters.utils.naming import apply_naming_to_schema, clear_name_conversion_cache, load_naming_config
+from s2dm.exporters.utils.schema import search_schema
+from s2dm.exporters.utils.schema_cache import set_default_schema_cache
+from s2dm.exporters.utils.schema_fork import fork_schema
+from s2dm.exporters.utils.schema_loader import (
+    SchemaSession,
+    build_annotated_schema,
+    check_correct_schema,
+    process_schema,
+    prune_schema_using_query_selection,
+    write_schema_with_directives_preserved,
+)
+from s2dm.tools.naming_checker import check_naming_conventions
+
+# Stages faster than this are not compared, as their timings are dominated by noise
+MIN_COMPARED_SECONDS = 0.01
+
+
+def time_stage(
+    func: Callable[..., object], repeat: int, setup: Callable[[], tuple[Any, ...]] | None = None
+) -> list[float]:
+    """Return the wall times of running a function, calling ``setup`` untimed before every run for its arguments."""
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmark(options: SyntheticSpecOptions, repeat: int) -> dict[str, Any]:
+    """Generate a synthetic spec and time every stage of the pipeline on it."""
+    timings: dict[str, list[float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="s2dm-bench-") as temp_dir:
+        root = Path(temp_dir)
+        spec = generate_synthetic_spec(root, options)
+        schema_paths = [spec.spec_dir]
+        query_document = parse(spec.query_paths[0].read_text())
+        naming_config = load_naming_config(spec.naming_config_path)
+        assert naming_config is not None
+
+        def load() -> tuple[GraphQLSchema, dict[str, str]]:
+            session = SchemaSession()
+            return session.schema(schema_paths), session.source_map(schema_paths)
+
+        timings["load"] = time_stage(load, repeat)
+        schema, source_map = load()
+
+        def fork() -> tuple[GraphQLSchema]:
+            return (fork_schema(schema),)
+
+        timings["validate"] = time_stage(check_correct_schema, repeat, lambda: (schema,))
+        timings["prune"] = time_stage(
+            lambda forked: prune_schema_using_query_selection(forked, query_document), repeat, fork
+        )
+
+        def fork_with_cold_naming_cache() -> tuple[GraphQLSchema]:
+            clear_name_conversion_cache()
+            return fork()
+
+        timings["naming"] = time_stage(
+            lambda forked: apply_naming_to_schema(forked, naming_config), repeat, fork_with_cold_naming_cache
+        )
+        # Checking converts the same names again, which the naming stage left in the conversion cache
+        timings["naming-check"] = time_stage(lambda: check_naming_conventions(schema, naming_config), repeat)
+        timings["expansion"] = time_stage(expand_instances_in_schema, repeat, fork)
+        timings["annotation"] = time_stage(lambda: build_annotated_schema(schema, source_map, {}, {}), repeat)
+        timings["compose"] = time_stage(
+            lambda: write_schema_with_directives_preserved(schema, io.StringIO(), source_map), repeat
+        )
+
+        artifact = AnnotatedSchemaArtifact(process_schema(schema, source_map, naming_config, expanded_instances=True))
+        artifact_path = root / "annotated.s2dm"
+        timings["artifact:write"] = time_stage(lambda: write_annotated_schema_artifact(artifact, artifact_path), repeat)
+        timings["artifact:read"] = time_stage(lambda: read_annotated_schema_artifact(artifact_path), repeat)
+
+        full_inputs = ExportInputs(annotated_schema=process_schema(schema, source_map), schema=schema)
+        query_inputs = ExportInputs(
+            annotated_schema=process_schema(schema, source_map, query_document=query_document),
+            schema=schema,
+            query_document=query_document,
+        )
+        export_options = ExportOptions(avro_namespace="org.example.vehicle", package_name="vehicle")
+        for name, exporter in EXPORTERS.items():
+            inputs = query_inputs if name in SELECTION_QUERY_EXPORTERS else full_inputs
+            timings[f"export:{name}"] = time_stage(
+                exporter, repeat, lambda inputs=inputs: (inputs, export_options, root / "output")
+            )
+
+        timings["id"] = time_stage(
+            lambda: IDExporter(schema=schema, output=None, strict_mode=False, dry_run=True).run(), repeat
+        )
+        timings["search"] = time_stage(
+            lambda: (
+                search_schema(schema, type_name="door", partial=True, case_insensitive=True)
+                and search_schema(schema, field_name="temperature", partial=True, case_insensitive=True)
+            ),
+            repeat,
+        )
+
+        spec_info = {
+            "files": sum(1 for _ in spec.spec_dir.iterdir()),
+            "object_types": spec.object_type_count,
+            "types": len(schema.type_map),
+        }
+
+    return {
+        "s2dm_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "options": asdict(options),
+        "repeat": repeat,
+        "spec": spec_info,
+        "stages": {
+            name: {"median_seconds": statistics.median(runs), "min_seconds": min(runs), "runs": runs}
+            for name, runs in timings.items()
+        },
+    }
+
+
+def compare(result: dict[str, Any], baseline: dict[str, Any], max_slowdown: float) -> list[str]:
+    """Print the change of every stage against a baseline and return the stages that became too slow."""
+    if baseline.get("options") != result["options"]:
+        print("Warning: the baseline was measured on a spec of a different size")
+
+    regressions = []
+    print(f"{'stage':<24}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, stage in result["stages"].items():
+        baseline_stage = baseline["stages"].get(name)
+        if baseline_stage is None:
+            print(f"{name:<24}{'-':>12}{stage['median_seconds'] * 1000:>10.1f}ms")
+            continue
+        before = baseline_stage["median_seconds"]
+        after = stage["median_seconds"]
+        ratio = after / before if before else float("inf")
+        print(f"{name:<24}{before * 1000:>10.1f}ms{after * 1000:>10.1f}ms{ratio:>9.2f}x")
+        if after >= MIN_COMPARED_SECONDS and ratio > max_slowdown:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = SyntheticSpecOptions()
+    parser.add_argument("--depth", type=int, default=defaults.depth, help="Branch levels below the Vehicle type")
+    parser.add_argument("--branching", type=int, default=defaults.branching, help="Child branches of every branch")
+    parser.add_argument("--signals", type=int, default=defaults.signals_per_type, help="Signals of every branch")
+    parser.add_argument("--units", type=int, default=defaults.unit_values, help="Values of the generated unit enums")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage (the median is reported)")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run to compare with")
+    parser.add_argument("--max-slowdown", type=float, default=1.5, help="Slowdown factor treated as a regression")
+    args = parser.parse_args()
+
+    log.setLevel("WARNING")
+    set_default_schema_cache(None)
+
+    options = SyntheticSpecOptions(
+        depth=args.depth, branching=args.branching, signals_per_type=args.signals, unit_values=args.units
+    )
+    result = run_benchmark(options, args.repeat)
+    spec_info = result["spec"]
+    print(f"Synthetic spec: {spec_info['files']} files, {spec_info['object_types']} object types", end=", ")
+    print(f"{spec_info['types']} types")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text()), args.max_slowdown)
+        if regressions:
+            print(f"Slower than {args.max_slowdown}x the baseline: {', '.join(regressions)}")
+            sys.exit(1)
+    else:
+        for name, stage in result["stages"].items():
+            print(f"{name:<24}{stage['median_seconds'] * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
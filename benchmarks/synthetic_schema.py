@@ -0,0 +1,288 @@
+"""Generate synthetic VSS-style GraphQL specs of configurable size.
+
+The generated spec mirrors the structure of real vehicle specs: a ``Vehicle`` type with a tree of branch types
+named after their path (``Vehicle_Cabin_Door``), signals with unit arguments and ``@range``, ``@cardinality``,
+``@metadata`` and ``@noDuplicates`` directives, an enum per enumerated signal, a large set of unit enums,
+``@instanceTag`` hierarchies and one file per top-level branch. Selection queries each select the whole subtree of
+one top-level branch, and a naming configuration converts every element name.
+
+The size is controlled by the depth and branching factor of the tree. The defaults produce about 1,500 object
+types and 4,700 types in total.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+BRANCH_NAMES = [
+    "body",
+    "cabin",
+    "chassis",
+    "powertrain",
+    "adas",
+    "obd",
+    "cockpit",
+    "seat",
+    "door",
+    "window",
+    "mirror",
+    "light",
+    "wheel",
+    "axle",
+    "battery",
+    "motor",
+    "sensor",
+    "camera",
+]
+
+COMMON_SDL = """directive @range(min: Float, max: Float) on FIELD_DEFINITION
+
+directive @cardinality(min: Int, max: Int) on FIELD_DEFINITION
+
+directive @noDuplicates on FIELD_DEFINITION
+
+directive @instanceTag on OBJECT
+
+directive @metadata(comment: String, vssType: String) on FIELD_DEFINITION | OBJECT
+
+scalar UInt8 @specifiedBy(url: "http://www.w3.org/2001/XMLSchema#unsignedByte")
+
+scalar UInt16 @specifiedBy(url: "http://www.w3.org/2001/XMLSchema#unsignedShort")
+"""
+
+UNITS_SDL = """enum VelocityUnitEnum {
+  KILOM_PER_HR
+  M_PER_SEC
+  MI_PER_HR
+}
+
+enum DimensionlessRatioUnitEnum {
+  PERCENT
+  FRACTION
+}
+
+enum TemperatureUnitEnum {
+  DEG_C
+  DEG_F
+  K
+}
+
+enum LengthUnitEnum {
+  MILLIM
+  CENTIM
+  M
+}
+"""
+
+INSTANCES_SDL = """enum RowEnum {
+  ROW1
+  ROW2
+}
+
+enum SideEnum {
+  DRIVERSIDE
+  PASSENGERSIDE
+}
+
+type InCabinArea2x2 @instanceTag {
+  row: RowEnum
+  side: SideEnum
+}
+
+enum PositionEnum {
+  FRONT
+  REAR
+}
+
+type FrontRear @instanceTag {
+  position: PositionEnum
+}
+"""
+
+INSTANCE_TAG_TYPES = ["InCabinArea2x2", "FrontRear"]
+
+NAMING_CONFIG_YAML = """type:
+  object: PascalCase
+  enum: PascalCase
+field:
+  object: snake_case
+enumValue: MACROCASE
+instanceTag: COBOL-CASE
+"""
+
+
+@dataclass
+class SyntheticSpecOptions:
+    """Size and shape of a synthetic spec.
+
+    Attributes:
+        depth: Number of branch levels below the Vehicle type
+        branching: Number of child branches of every branch above the last level
+        signals_per_type: Number of signals of every branch type
+        instance_every: Every n-th child branch is a list of tagged instances
+        instance_depth: Instances are only used on the first levels, as nested instances multiply when expanded
+        unit_values: Number of values of additional unit enums, standing in for the units synced from QUDT
+    """
+
+    depth: int = 4
+    branching: int = 6
+    signals_per_type: int = 12
+    instance_every: int = 4
+    instance_depth: int = 2
+    unit_values: int = 4000
+
+
+@dataclass
+class SyntheticSpec:
+    """Files of a generated spec."""
+
+    spec_dir: Path
+    query_paths: list[Path]
+    naming_config_path: Path
+    object_type_count: int
+
+
+UNIT_PREFIXES = ["", "KILO", "MILLI", "MICRO", "MEGA"]
+UNIT_NAMES = ["M", "SEC", "GM", "A", "V", "W", "J", "PA", "HZ", "K"]
+UNITS_PER_ENUM = 40
+
+
+def _unit_enums_sdl(value_count: int) -> str:
+    """Return the SDL of unit enums with the given number of values in total, named like QUDT units."""
+    blocks = []
+    for enum_index in range(0, value_count, UNITS_PER_ENUM):
+        values = []
+        for index in range(enum_index, min(enum_index + UNITS_PER_ENUM, value_count)):
+            prefix = UNIT_PREFIXES[index % len(UNIT_PREFIXES)]
+            numerator = UNIT_NAMES[index % len(UNIT_NAMES)]
+            denominator = UNIT_NAMES[(index // len(UNIT_NAMES)) % len(UNIT_NAMES)]
+            values.append(f"  {prefix}{numerator}_PER_{denominator}_{index}")
+        blocks.append(f"enum Quantity{enum_index // UNITS_PER_ENUM}UnitEnum {{\n" + "\n".join(values) + "\n}\n")
+    return "\n".join(blocks)
+
+
+def _signal(type_name: str, index: int) -> tuple[str, str, str | None]:
+    """Return the name and SDL of a signal field, and the SDL of the enum it uses if any."""
+    kind = index % 6
+    enum_sdl = None
+    if kind == 0:
+        name = f"speed{index}"
+        definition = (
+            f"{name}(unit: VelocityUnitEnum = KILOM_PER_HR): Float"
+            ' @range(min: 0, max: 250) @metadata(vssType: "sensor")'
+        )
+    elif kind == 1:
+        name = f"isActive{index}"
+        definition = f'{name}: Boolean @metadata(vssType: "actuator")'
+    elif kind == 2:
+        name = f"mode{index}"
+        enum_name = f"{type_name}_Mode{index}_Enum"
+        definition = f"{name}: {enum_name}"
+        enum_sdl = f"enum {enum_name} {{\n  OFF\n  STANDBY\n  ACTIVE\n  FAULT\n}}\n"
+    elif kind == 3:
+        name = f"level{index}"
+        definition = f"{name}(unit: DimensionlessRatioUnitEnum = PERCENT): UInt8 @range(min: 0, max: 100)"
+    elif kind == 4:
+        name = f"temperature{index}"
+        definition = (
+            f"{name}(unit: TemperatureUnitEnum = DEG_C): Float"
+            f' @range(min: -40, max: 125) @metadata(comment: "Measured at sensor {index}.", vssType: "sensor")'
+        )
+    else:
+        name = f"codes{index}"
+        definition = f"{name}: [String] @noDuplicates @cardinality(min: 0, max: 16)"
+    return name, f'  """Signal {index} of {type_name}."""\n  {definition}', enum_sdl
+
+
+class _SpecBuilder:
+    def __init__(self, options: SyntheticSpecOptions) -> None:
+        self.options = options
+        self.blocks_by_file: dict[str, list[str]] = {}
+        self.fields_by_type: dict[str, list[str]] = {}
+        self.children_by_type: dict[str, list[tuple[str, str]]] = {}
+
+    def add_branch(self, type_name: str, level: int, file_name: str, instance_tag: str | None) -> None:
+        blocks = self.blocks_by_file.setdefault(file_name, [])
+        fields: list[str] = []
+        signal_names: list[str] = []
+        for index in range(self.options.signals_per_type):
+            signal_name, field_sdl, enum_sdl = _signal(type_name, index)
+            fields.append(field_sdl)
+            signal_names.append(signal_name)
+            if enum_sdl:
+                blocks.append(enum_sdl)
+
+        children: list[tuple[str, str]] = []
+        if level < self.options.depth:
+            for index in range(self.options.branching):
+                child_field = f"{BRANCH_NAMES[index % len(BRANCH_NAMES)]}{index // len(BRANCH_NAMES) or ''}"
+                child_type = f"{type_name}_{child_field[0].upper()}{child_field[1:]}"
+                child_file = file_name if level > 0 else f"{child_type}.graphql"
+
+                child_tag = None
+                if level < self.options.instance_depth and index % self.options.instance_every == 0:
+                    child_tag = INSTANCE_TAG_TYPES[(level + index) % len(INSTANCE_TAG_TYPES)]
+                    fields.append(f"  {child_field}: [{child_type}] @noDuplicates")
+                else:
+                    fields.append(f"  {child_field}: {child_type}")
+                children.append((child_field, child_type))
+                self.add_branch(child_type, level + 1, child_file, child_tag)
+
+        if instance_tag:
+            fields.append(f"  instanceTag: {instance_tag}")
+
+        body = "\n".join(fields)
+        blocks.append(f'"""Branch {type_name}."""\ntype {type_name} {{\n{body}\n}}\n')
+        self.fields_by_type[type_name] = signal_names
+        self.children_by_type[type_name] = children
+
+    def selection(self, type_name: str, indent: int) -> str:
+        padding = "  " * indent
+        lines = [f"{padding}{name}" for name in self.fields_by_type[type_name]]
+        for child_field, child_type in self.children_by_type[type_name]:
+            lines.append(f"{padding}{child_field} {{\n{self.selection(child_type, indent + 1)}\n{padding}}}")
+        return "\n".join(lines)
+
+
+def generate_synthetic_spec(root: Path, options: SyntheticSpecOptions | None = None) -> SyntheticSpec:
+    """Write a synthetic spec with selection queries and a naming configuration below a directory.
+
+    Args:
+        root: Directory to write the spec to. The schema files are written to ``root / "spec"``.
+        options: Size and shape of the spec
+
+    Returns:
+        The paths of the generated files
+    """
+    options = options or SyntheticSpecOptions()
+    builder = _SpecBuilder(options)
+    builder.add_branch("Vehicle", 0, "Vehicle.graphql", None)
+
+    spec_dir = root / "spec"
+    spec_dir.mkdir(parents=True, exist_ok=True)
+    (spec_dir / "common.graphql").write_text(COMMON_SDL)
+    (spec_dir / "units.graphql").write_text(UNITS_SDL + "\n" + _unit_enums_sdl(options.unit_values))
+    (spec_dir / "instances.graphql").write_text(INSTANCES_SDL)
+    (spec_dir / "Query.graphql").write_text("type Query {\n  vehicle: Vehicle\n}\n")
+    for file_name, blocks in builder.blocks_by_file.items():
+        (spec_dir / file_name).write_text("\n".join(blocks))
+
+    query_dir = root / "queries"
+    query_dir.mkdir(parents=True, exist_ok=True)
+    query_paths = []
+    for child_field, child_type in builder.children_by_type["Vehicle"]:
+        query_path = query_dir / f"{child_field}.graphql"
+        selection = builder.selection(child_type, 3)
+        query_path.write_text(
+            f"query Selection {{\n  vehicle {{\n    {child_field} {{\n{selection}\n    }}\n  }}\n}}\n"
+        )
+        query_paths.append(query_path)
+
+    naming_config_path = root / "naming.yaml"
+    naming_config_path.write_text(NAMING_CONFIG_YAML)
+
+    return SyntheticSpec(
+        spec_dir=spec_dir,
+        query_paths=query_paths,
+        naming_config_path=naming_config_path,
+        object_type_count=len(builder.fields_by_type),
+    )
@@ -19,3 +19,20 @@ def tests(session: nox.Session) -> None:
         "--cov-fail-under=90",
         *session.posargs,
     )
+
+
+@nox.session(python=PYTHON_VERSIONS[-1])
+def bench(session: nox.Session) -> None:
+    """Benchmark the pipeline on a synthetic spec, e.g. `nox -s bench -- --compare baseline.json`."""
+    session.run_install(
+        "uv",
+        "sync",
+        env={"UV_PROJECT_ENVIRONMENT": session.virtualenv.location},
+    )
+    session.run(
+        "python",
+        "benchmarks/bench_pipeline.py",
+        "--output",
+        "benchmarks/results/pipeline.json",
+        *session.posargs,
+    )
@@ -1,54 +1,53 @@
+import functools
 import json
 import logging
 import sys
+import time
 from collections.abc import Callable
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import rich_click as click
 from graphql import DocumentNode, GraphQLSchema, parse
-from rich.traceback import install
 
 from s2dm import __version__, log
-from s2dm.concept.services import create_concept_uri_model, iter_all_concepts
-from s2dm.exporters.avro import translate_to_avro_protocol, translate_to_avro_schema
-from s2dm.exporters.id import IDExporter
-from s2dm.exporters.jsonschema import translate_to_jsonschema
-from s2dm.exporters.protobuf import translate_to_protobuf
-from s2dm.exporters.shacl import translate_to_shacl
-from s2dm.exporters.spec_history import SpecHistoryExporter
-from s2dm.exporters.utils.extraction import get_all_named_types, get_all_object_types, get_root_level_types_from_query
+from s2dm.exporters.export_all import AVRO_EXPORTERS, EXPORTERS, SELECTION_QUERY_EXPORTERS
+from s2dm.exporters.utils.compose_batch import ComposeBatchInputs, compose_queries, resolve_query_files
+from s2dm.exporters.utils.extraction import get_all_object_types, get_root_level_types_from_query
+from s2dm.exporters.utils.file_watcher import watch_files
 from s2dm.exporters.utils.graphql_type import is_builtin_scalar_type, is_introspection_type
 from s2dm.exporters.utils.naming import load_naming_config
 from s2dm.exporters.utils.naming_config import ValidationMode, load_naming_convention_config
+from s2dm.exporters.utils.output_writer import open_output
+from s2dm.exporters.utils.profiling import Profiler, profile_stage, set_profiler
 from s2dm.exporters.utils.schema import search_schema
+from s2dm.exporters.utils.schema_cache import SchemaCache, get_default_schema_cache, set_default_schema_cache
+from s2dm.exporters.utils.schema_fetch import SchemaFetcher, get_default_schema_fetcher, set_default_schema_fetcher
 from s2dm.exporters.utils.schema_loader import (
+    SchemaSession,
     check_correct_schema,
     create_tempfile_to_composed_schema,
-    download_schema_to_temp,
     is_url,
     load_and_process_schema,
-    load_schema,
-    load_schema_with_source_map,
-    print_schema_with_directives_preserved,
     process_schema,
     resolve_graphql_files,
+    set_ingest_workers,
+    write_schema_with_directives_preserved,
 )
-from s2dm.exporters.vspec import translate_to_vspec
-from s2dm.tools.constraint_checker import ConstraintChecker
 from s2dm.tools.graphql_inspector import GraphQLInspector
-from s2dm.tools.skos_search import NO_LIMIT_KEYWORDS, SearchResult, SKOSSearchService
+from s2dm.tools.string import NO_LIMIT_KEYWORDS
 from s2dm.tools.validators import validate_language_tag
-from s2dm.units.sync import (
-    UNITS_META_FILENAME,
-    UNITS_META_VERSION_KEY,
-    UnitEnumError,
-    get_latest_qudt_version,
-    sync_qudt_units,
-)
+
+if TYPE_CHECKING:
+    from s2dm.exporters.utils.annotated_artifact import AnnotatedSchemaArtifact
+    from s2dm.tools.skos_search import SearchResult
+
+# The exporters and the modules depending on rdflib, jinja2, inflect or requests are slow to import. Commands
+# import them when they run, so that they do not slow down every other command (see tests/test_import_time.py).
 
 S2DM_HOME = Path.home() / ".s2dm"
 DEFAULT_QUDT_UNITS_DIR = S2DM_HOME / "units" / "qudt"
+DEFAULT_SCHEMA_CACHE_DIR = S2DM_HOME / "cache"
 
 
 class SchemaResolverOption(click.Option):
@@ -57,17 +56,19 @@ class SchemaResolverOption(click.Option):
         if not value:
             return None
 
+        urls = [str(item) for item in value if is_url(str(item))]
+        try:
+            downloaded_paths = dict(zip(urls, get_default_schema_fetcher().fetch_all(urls), strict=True))
+        except RuntimeError as e:
+            raise click.BadParameter(str(e), ctx=ctx, param=self) from e
+
         resolved_paths = []
 
         for item in value:
             item_str = str(item)
 
             if is_url(item_str):
-                try:
-                    temp_path = download_schema_to_temp(item_str)
-                    resolved_paths.append(temp_path)
-                except RuntimeError as e:
-                    raise click.BadParameter(str(e), ctx=ctx, param=self) from e
+                resolved_paths.append(downloaded_paths[item_str])
             else:
                 path = Path(item_str)
                 if not path.exists():
@@ -89,6 +90,25 @@ schema_option = click.option(
 )
 
 
+optional_schema_option = click.option(
+    "--schema",
+    "-s",
+    "schemas",
+    type=str,
+    cls=SchemaResolverOption,
+    required=False,
+    multiple=True,
+    help="GraphQL schema file, directory, or URL. Can be specified multiple times.",
+)
+
+
+annotated_option = click.option(
+    "--annotated",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Annotated schema artifact written by 'compose --emit-annotated', exported instead of processing a schema",
+)
+
+
 def selection_query_option(required: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     return click.option(
         "--selection-query",
@@ -135,13 +155,34 @@ units_directory_option = click.option(
 )
 
 
-expanded_instances_option = click.option(
-    "--expanded-instances",
-    "-e",
-    is_flag=True,
-    default=False,
-    help="Expand instance tags into nested structure instead of arrays/repeated fields",
-)
+def expanded_instances_option(command: Callable[..., None]) -> Callable[..., None]:
+    """Add the --expanded-instances flag and a --max-expanded-paths budget checked before expanding."""
+
+    @functools.wraps(command)
+    def run(*args: Any, max_expanded_paths: int | None = None, **kwargs: Any) -> None:
+        from s2dm.exporters.utils.instance_tag import ExpansionBudgetError, set_max_expanded_paths
+
+        set_max_expanded_paths(max_expanded_paths)
+        try:
+            command(*args, **kwargs)
+        except ExpansionBudgetError as e:
+            raise click.ClickException(str(e)) from e
+        finally:
+            set_max_expanded_paths(None)
+
+    run = click.option(
+        "--max-expanded-paths",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Abort before expanding instance tags if the expansion would produce more leaf paths than this",
+    )(run)
+    return click.option(
+        "--expanded-instances",
+        "-e",
+        is_flag=True,
+        default=False,
+        help="Expand instance tags into nested structure instead of arrays/repeated fields",
+    )(run)
 
 
 strict_option = click.option(
@@ -169,6 +210,74 @@ naming_config_option = click.option(
 )
 
 
+def get_schema_session() -> SchemaSession:
+    """Return the schema session shared by the current command invocation.
+
+    The session is created on first use and stored on the click context, so every schema input is read and
+    parsed at most once per invocation.
+    """
+    return cast(click.Context, click.get_current_context()).ensure_object(SchemaSession)
+
+
+def get_watched_paths(params: dict[str, Any]) -> list[Path]:
+    """Return the input files of a command invocation that are watched in watch mode."""
+    paths: list[Path] = list(params.get("schemas") or [])
+    for name in ("selection_query", "naming_config", "annotated"):
+        if params.get(name):
+            paths.append(params[name])
+    if params.get("selection_queries"):
+        paths.extend(resolve_query_files(params["selection_queries"]))
+    return paths
+
+
+def run_build(build: Callable[[], None]) -> None:
+    """Run one build of a watched command with a fresh schema session, reporting failures instead of exiting."""
+    ctx = cast(click.Context, click.get_current_context())
+    ctx.obj = SchemaSession()
+    start = time.perf_counter()
+    try:
+        build()
+    except SystemExit as e:
+        if e.code:
+            log.error("Build failed")
+    except click.ClickException as e:
+        log.error(f"Build failed: {e.format_message()}")
+    except Exception as e:
+        log.error(f"Build failed: {e}")
+    log.info(f"Build finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def watch_option(command: Callable[..., None]) -> Callable[..., None]:
+    """Add a --watch flag that keeps rebuilding the outputs of a command whenever its input files change."""
+
+    @functools.wraps(command)
+    def run(*args: Any, watch: bool = False, **kwargs: Any) -> None:
+        if not watch:
+            command(*args, **kwargs)
+            return
+
+        # Keep the parsed documents of unchanged files in memory, so that only changed files are parsed again
+        if get_default_schema_cache() is None:
+            set_default_schema_cache(SchemaCache())
+
+        def build() -> None:
+            command(*args, **kwargs)
+
+        def rebuild(changed_paths: list[Path]) -> None:
+            log.info(f"Changed: {', '.join(str(path) for path in changed_paths)}")
+            run_build(build)
+
+        run_build(build)
+        watch_files(get_watched_paths(kwargs), rebuild)
+
+    return click.option(
+        "--watch",
+        is_flag=True,
+        default=False,
+        help="Keep running and rebuild the output whenever an input file changes",
+    )(run)
+
+
 def pretty_print_dict_json(result: dict[str, Any]) -> dict[str, Any]:
     """
     Recursively pretty-print a dict for JSON output:
@@ -189,6 +298,32 @@ def pretty_print_dict_json(result: dict[str, Any]) -> dict[str, Any]:
     return {k: multiline_str_representer(v) for k, v in result.items()}
 
 
+def report_profile(
+    profiler: Profiler,
+    timings: bool,
+    stats_path: Path | None,
+    trace_path: Path | None,
+    memory_report: bool,
+    memory_report_path: Path | None,
+) -> None:
+    """Print the stage breakdowns of a profiled command and write the requested profile files."""
+    set_profiler(None)
+    if timings:
+        click.echo(profiler.format_report(), err=True)
+    if memory_report:
+        click.echo(profiler.format_memory_report(), err=True)
+    if stats_path:
+        profiler.write_cprofile_stats(stats_path)
+        click.echo(f"cProfile statistics written to {stats_path}", err=True)
+    if trace_path:
+        profiler.write_trace(trace_path)
+        click.echo(f"Chrome trace written to {trace_path}", err=True)
+    if memory_report_path:
+        profiler.write_json(memory_report_path)
+        click.echo(f"Memory report written to {memory_report_path}", err=True)
+    profiler.close()
+
+
 def assert_correct_schema(schema: GraphQLSchema) -> None:
     schema_errors = check_correct_schema(schema)
     if schema_errors:
@@ -199,6 +334,58 @@ def assert_correct_schema(schema: GraphQLSchema) -> None:
         sys.exit(1)
 
 
+def load_export_schema(
+    annotated: Path | None,
+    schemas: list[Path] | None,
+    naming_config: Path | None = None,
+    selection_query: Path | None = None,
+    root_type: str | None = None,
+    expanded_instances: bool = False,
+    requires_selection_query: bool = False,
+) -> "AnnotatedSchemaArtifact":
+    """Return the processed schema of an export command, read from an artifact or processed from the schema files.
+
+    An artifact is already processed, so it cannot be combined with the options controlling the processing. The
+    selection query and root type it was processed with are restored from it.
+    """
+    from s2dm.exporters.utils.annotated_artifact import AnnotatedSchemaArtifact, read_annotated_schema_artifact
+
+    if annotated is None:
+        if not schemas:
+            raise click.UsageError("Missing option '--schema' / '-s' or '--annotated'.")
+        if requires_selection_query and selection_query is None:
+            raise click.UsageError("Missing option '--selection-query' / '-q'.")
+        annotated_schema, _, query_document = load_and_process_schema(
+            schema_paths=schemas,
+            naming_config_path=naming_config,
+            selection_query_path=selection_query,
+            root_type=root_type,
+            expanded_instances=expanded_instances,
+            session=get_schema_session(),
+        )
+        artifact = AnnotatedSchemaArtifact(annotated_schema, query_document, root_type)
+    else:
+        processing_options = {
+            "--schema": schemas,
+            "--selection-query": selection_query,
+            "--root-type": root_type,
+            "--naming-config": naming_config,
+            "--expanded-instances": expanded_instances,
+        }
+        conflicting = [option for option, value in processing_options.items() if value]
+        if conflicting:
+            raise click.UsageError(f"--annotated cannot be used with {', '.join(conflicting)}")
+        try:
+            artifact = read_annotated_schema_artifact(annotated)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--annotated'") from e
+        if requires_selection_query and artifact.query_document is None:
+            raise click.UsageError(f"'{annotated}' was composed without a selection query, which this export requires")
+
+    assert_correct_schema(artifact.annotated_schema.schema)
+    return artifact
+
+
 @click.group(context_settings={"auto_envvar_prefix": "s2dm"})
 @click.option(
     "-l",
@@ -213,8 +400,67 @@ def assert_correct_schema(schema: GraphQLSchema) -> None:
     type=click.Path(dir_okay=False, writable=True, path_type=Path),
     help="Log file",
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_SCHEMA_CACHE_DIR,
+    help="Directory for cached parsed and downloaded schema files",
+    show_default=True,
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Always parse and download the schema files instead of using cached results",
+)
+@click.option(
+    "--ingest-workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of threads used to read and parse schema files  [default: automatic]",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Print the wall time, CPU time and number of calls of every pipeline stage when the command finishes",
+)
+@click.option(
+    "--profile-stats",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Profile every function call and write the cProfile statistics to a file (implies --profile)",
+)
+@click.option(
+    "--profile-trace",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write the pipeline stages as a Chrome trace-event JSON file (implies --profile)",
+)
+@click.option(
+    "--memory-report",
+    is_flag=True,
+    default=False,
+    help="Trace memory allocations and print the memory retained by every pipeline stage and its top allocation sites",
+)
+@click.option(
+    "--memory-report-json",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write the memory report and the timings of every pipeline stage to a JSON file (implies --memory-report)",
+)
 @click.version_option(__version__)
-def cli(log_level: str, log_file: Path | None) -> None:
+@click.pass_context
+def cli(
+    ctx: click.Context,
+    log_level: str,
+    log_file: Path | None,
+    cache_dir: Path,
+    no_cache: bool,
+    ingest_workers: int | None,
+    profile: bool,
+    profile_stats: Path | None,
+    profile_trace: Path | None,
+    memory_report: bool,
+    memory_report_json: Path | None,
+) -> None:
     if log_file:
         file_handler = logging.FileHandler(log_file, mode="w")
         file_handler.setFormatter(logging.Formatter("%(asctime)s:%(levelname)s:%(message)s"))
@@ -222,8 +468,25 @@ def cli(log_level: str, log_file: Path | None) -> None:
 
     log.setLevel(log_level)
     if log_level == "DEBUG":
+        from rich.traceback import install
+
         _ = install(show_locals=True)
 
+    set_default_schema_cache(None if no_cache else SchemaCache(cache_dir))
+    set_default_schema_fetcher(SchemaFetcher(None if no_cache else cache_dir / "http"))
+    set_ingest_workers(ingest_workers)
+
+    timings = profile or profile_stats is not None or profile_trace is not None
+    memory_report = memory_report or memory_report_json is not None
+    if timings or memory_report:
+        profiler = Profiler(cprofile=profile_stats is not None, memory=memory_report)
+        set_profiler(profiler)
+        ctx.call_on_close(
+            functools.partial(
+                report_profile, profiler, timings, profile_stats, profile_trace, memory_report, memory_report_json
+            )
+        )
+
 
 @click.group()
 def check() -> None:
@@ -293,6 +556,7 @@ def units_sync(version: str | None, directory: Path, dry_run: bool) -> None:
         directory: Output directory for generated QUDT unit enums (default: ~/.s2dm/units/qudt)
         dry_run: Show what would be generated without actually writing files
     """
+    from s2dm.units.sync import UnitEnumError, get_latest_qudt_version, sync_qudt_units
 
     version_to_use = version or get_latest_qudt_version()
 
@@ -319,6 +583,7 @@ def units_check_version(directory: Path) -> None:
     Args:
         directory: Directory containing generated QUDT unit enums (default: ~/.s2dm/units/qudt)
     """
+    from s2dm.units.sync import UNITS_META_FILENAME, UNITS_META_VERSION_KEY, get_latest_qudt_version
 
     meta_path = directory / UNITS_META_FILENAME
     if not meta_path.exists():
@@ -357,32 +622,106 @@ def validate() -> None:
     pass
 
 
+def compose_selection_queries(inputs: ComposeBatchInputs, query_paths: list[Path], workers: int | None) -> None:
+    """Compose one filtered schema per selection query and report the time taken by each query."""
+    results = compose_queries(inputs, query_paths, workers)
+
+    log.rule("Selection queries")
+    for result in results:
+        timing = f"{result.seconds * 1000:.0f} ms"
+        if result.error:
+            log.error(f"{result.query_path.name} ({timing}): {result.error}")
+        else:
+            log.key_value(result.query_path.name, f"{timing} -> {result.output}")
+
+    failed = [result for result in results if result.error]
+    if failed:
+        log.error(f"Failed to compose {len(failed)} of {len(results)} selection queries")
+        sys.exit(1)
+    log.success(f"Successfully composed {len(results)} filtered schemas to {inputs.output_dir}")
+
+
 @click.command()
 @schema_option
 @selection_query_option()
+@click.option(
+    "--selection-queries",
+    "-Q",
+    type=str,
+    help="Directory or glob pattern of GraphQL query files. Composes one filtered schema per query into the "
+    "output directory",
+)
 @root_type_option
 @naming_config_option
-@output_option
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(writable=True, path_type=Path),
+    required=True,
+    help="Output file, or output directory with --selection-queries",
+)
+@click.option(
+    "--emit-annotated",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Also write the processed schema and its metadata to an annotated schema artifact, which export commands "
+    "read with --annotated",
+)
 @expanded_instances_option
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of selection queries composed in parallel processes (default: number of CPUs)",
+)
+@watch_option
 def compose(
     schemas: list[Path],
     root_type: str | None,
     selection_query: Path | None,
+    selection_queries: str | None,
     naming_config: Path | None,
     output: Path,
+    emit_annotated: Path | None,
     expanded_instances: bool,
+    workers: int | None,
 ) -> None:
     """Compose GraphQL schema files into a single output file."""
+    if selection_query and selection_queries:
+        raise click.UsageError("--selection-query and --selection-queries cannot be used together")
+    if emit_annotated and selection_queries:
+        raise click.UsageError("--emit-annotated and --selection-queries cannot be used together")
+
+    query_paths = resolve_query_files(selection_queries) if selection_queries else []
+    if selection_queries and not query_paths:
+        raise click.UsageError(f"No selection query files found for '{selection_queries}'")
+
     try:
-        graphql_schema, source_map = load_schema_with_source_map(schemas)
+        session = get_schema_session()
+        graphql_schema = session.schema(schemas)
+        source_map = session.source_map(schemas)
         assert_correct_schema(graphql_schema)
 
+        naming_config_dict = load_naming_config(naming_config)
+
+        if selection_queries:
+            compose_selection_queries(
+                ComposeBatchInputs(
+                    schema=graphql_schema,
+                    source_map=source_map,
+                    output_dir=output,
+                    naming_config=naming_config_dict,
+                    root_type=root_type,
+                    expanded_instances=expanded_instances,
+                ),
+                query_paths,
+                workers,
+            )
+            return
+
         query_document = None
         if selection_query:
             query_document = parse(selection_query.read_text())
 
-        naming_config_dict = load_naming_config(naming_config)
-
         annotated_schema = process_schema(
             schema=graphql_schema,
             source_map=source_map,
@@ -391,9 +730,19 @@ def compose(
             root_type=root_type,
             expanded_instances=expanded_instances,
         )
-        composed_schema_str = print_schema_with_directives_preserved(annotated_schema.schema, source_map)
+        with open_output(output) as output_file:
+            write_schema_with_directives_preserved(annotated_schema.schema, output_file, source_map)
 
-        output.write_text(composed_schema_str)
+        if emit_annotated:
+            from s2dm.exporters.utils.annotated_artifact import (
+                AnnotatedSchemaArtifact,
+                write_annotated_schema_artifact,
+            )
+
+            write_annotated_schema_artifact(
+                AnnotatedSchemaArtifact(annotated_schema, query_document, root_type), emit_annotated
+            )
+            log.info(f"Annotated schema artifact written to {emit_annotated}")
 
         if selection_query:
             log.success(f"Successfully composed and filtered schema based on selection query to {output}")
@@ -416,7 +765,8 @@ def compose(
 # SHACL
 # ----------
 @export.command
-@schema_option
+@optional_schema_option
+@annotated_option
 @selection_query_option()
 @output_option
 @root_type_option
@@ -462,8 +812,10 @@ def compose(
     show_default=True,
 )
 @expanded_instances_option
+@watch_option
 def shacl(
-    schemas: list[Path],
+    schemas: list[Path] | None,
+    annotated: Path | None,
     selection_query: Path | None,
     output: Path,
     root_type: str | None,
@@ -476,37 +828,38 @@ def shacl(
     expanded_instances: bool,
 ) -> None:
     """Generate SHACL shapes from a given GraphQL schema."""
-    annotated_schema, naming_config_dict, _ = load_and_process_schema(
-        schema_paths=schemas,
-        naming_config_path=naming_config,
-        selection_query_path=selection_query,
-        root_type=root_type,
-        expanded_instances=expanded_instances,
-    )
-    assert_correct_schema(annotated_schema.schema)
-
-    result = translate_to_shacl(
-        annotated_schema,
-        shapes_namespace,
-        shapes_namespace_prefix,
-        model_namespace,
-        model_namespace_prefix,
-    )
-    output.parent.mkdir(parents=True, exist_ok=True)
-    _ = result.serialize(destination=output, format=serialization_format)
+    from s2dm.exporters.shacl import translate_to_shacl
+
+    annotated_schema = load_export_schema(
+        annotated, schemas, naming_config, selection_query, root_type, expanded_instances
+    ).annotated_schema
+
+    with profile_stage("export:shacl"):
+        result = translate_to_shacl(
+            annotated_schema,
+            shapes_namespace,
+            shapes_namespace_prefix,
+            model_namespace,
+            model_namespace_prefix,
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        _ = result.serialize(destination=output, format=serialization_format)
 
 
 # Export -> yaml
 # ----------
 @export.command
-@schema_option
+@optional_schema_option
+@annotated_option
 @selection_query_option()
 @output_option
 @root_type_option
 @naming_config_option
 @expanded_instances_option
+@watch_option
 def vspec(
-    schemas: list[Path],
+    schemas: list[Path] | None,
+    annotated: Path | None,
     selection_query: Path | None,
     output: Path,
     root_type: str | None,
@@ -514,32 +867,31 @@ def vspec(
     expanded_instances: bool,
 ) -> None:
     """Generate VSPEC from a given GraphQL schema."""
-    annotated_schema, _, _ = load_and_process_schema(
-        schema_paths=schemas,
-        naming_config_path=naming_config,
-        selection_query_path=selection_query,
-        root_type=root_type,
-        expanded_instances=expanded_instances,
-    )
-    assert_correct_schema(annotated_schema.schema)
+    from s2dm.exporters.vspec import write_vspec
 
-    result = translate_to_vspec(annotated_schema)
-    output.parent.mkdir(parents=True, exist_ok=True)
-    _ = output.write_text(result)
+    annotated_schema = load_export_schema(
+        annotated, schemas, naming_config, selection_query, root_type, expanded_instances
+    ).annotated_schema
+
+    with open_output(output) as output_file:
+        write_vspec(annotated_schema, output_file)
 
 
 # Export -> json schema
 # ----------
 @export.command
-@schema_option
+@optional_schema_option
+@annotated_option
 @selection_query_option()
 @output_option
 @root_type_option
 @naming_config_option
 @strict_option
 @expanded_instances_option
+@watch_option
 def jsonschema(
-    schemas: list[Path],
+    schemas: list[Path] | None,
+    annotated: Path | None,
     selection_query: Path | None,
     output: Path,
     root_type: str | None,
@@ -548,17 +900,12 @@ def jsonschema(
     expanded_instances: bool,
 ) -> None:
     """Generate JSON Schema from a given GraphQL schema."""
-    annotated_schema, _, _ = load_and_process_schema(
-        schema_paths=schemas,
-        naming_config_path=naming_config,
-        selection_query_path=selection_query,
-        root_type=root_type,
-        expanded_instances=expanded_instances,
-    )
-    assert_correct_schema(annotated_schema.schema)
+    from s2dm.exporters.jsonschema import write_jsonschema
 
-    result = translate_to_jsonschema(annotated_schema, root_type, strict)
-    _ = output.write_text(result)
+    processed = load_export_schema(annotated, schemas, naming_config, selection_query, root_type, expanded_instances)
+
+    with open_output(output) as output_file:
+        write_jsonschema(processed.annotated_schema, output_file, processed.root_type, strict)
 
 
 # Export -> avro
@@ -570,16 +917,19 @@ def avro() -> None:
 
 
 @avro.command
-@schema_option
-@selection_query_option(required=True)
+@optional_schema_option
+@annotated_option
+@selection_query_option()
 @output_option
 @root_type_option
 @naming_config_option
 @avro_namespace_option
 @expanded_instances_option
+@watch_option
 def schema(
-    schemas: list[Path],
-    selection_query: Path,
+    schemas: list[Path] | None,
+    annotated: Path | None,
+    selection_query: Path | None,
     output: Path,
     root_type: str | None,
     naming_config: Path | None,
@@ -587,21 +937,27 @@ def schema(
     expanded_instances: bool,
 ) -> None:
     """Generate Apache Avro schema from a given GraphQL schema."""
-    annotated_schema, _, query_document = load_and_process_schema(
-        schema_paths=schemas,
-        naming_config_path=naming_config,
-        selection_query_path=selection_query,
-        root_type=root_type,
-        expanded_instances=expanded_instances,
+    from s2dm.exporters.avro import write_avro_schema
+
+    processed = load_export_schema(
+        annotated,
+        schemas,
+        naming_config,
+        selection_query,
+        root_type,
+        expanded_instances,
+        requires_selection_query=True,
     )
-    assert_correct_schema(annotated_schema.schema)
 
-    result = translate_to_avro_schema(annotated_schema, namespace, cast(DocumentNode, query_document))
-    _ = output.write_text(result)
+    with open_output(output) as output_file:
+        write_avro_schema(
+            processed.annotated_schema, namespace, cast(DocumentNode, processed.query_document), output_file
+        )
 
 
 @avro.command
-@schema_option
+@optional_schema_option
+@annotated_option
 @selection_query_option(required=False)
 @click.option(
     "--output",
@@ -615,8 +971,10 @@ def schema(
 @avro_namespace_option
 @expanded_instances_option
 @strict_option
+@watch_option
 def protocol(
-    schemas: list[Path],
+    schemas: list[Path] | None,
+    annotated: Path | None,
     selection_query: Path | None,
     output: Path,
     root_type: str | None,
@@ -626,14 +984,11 @@ def protocol(
     strict: bool,
 ) -> None:
     """Generate Avro IDL protocols for types marked with @struct directive."""
-    annotated_schema, _, _ = load_and_process_schema(
-        schema_paths=schemas,
-        naming_config_path=naming_config,
-        selection_query_path=selection_query,
-        root_type=root_type,
-        expanded_instances=expanded_instances,
-    )
-    assert_correct_schema(annotated_schema.schema)
+    from s2dm.exporters.avro import translate_to_avro_protocol
+
+    annotated_schema = load_export_schema(
+        annotated, schemas, naming_config, selection_query, root_type, expanded_instances
+    ).annotated_schema
 
     avro_protocols = translate_to_avro_protocol(annotated_schema, namespace, strict)
 
@@ -649,8 +1004,9 @@ def protocol(
 # Export -> protobuf
 # ----------
 @export.command
-@schema_option
-@selection_query_option(required=True)
+@optional_schema_option
+@annotated_option
+@selection_query_option()
 @output_option
 @root_type_option
 @naming_config_option
@@ -668,9 +1024,11 @@ def protocol(
     help="Protobuf package name",
 )
 @expanded_instances_option
+@watch_option
 def protobuf(
-    schemas: list[Path],
-    selection_query: Path,
+    schemas: list[Path] | None,
+    annotated: Path | None,
+    selection_query: Path | None,
     output: Path,
     root_type: str | None,
     naming_config: Path | None,
@@ -679,23 +1037,163 @@ def protobuf(
     expanded_instances: bool,
 ) -> None:
     """Generate Protocol Buffers (.proto) file from GraphQL schema."""
-    annotated_schema, _, query_document = load_and_process_schema(
-        schema_paths=schemas,
-        naming_config_path=naming_config,
-        selection_query_path=selection_query,
-        root_type=root_type,
-        expanded_instances=expanded_instances,
+    from s2dm.exporters.protobuf import write_protobuf
+
+    processed = load_export_schema(
+        annotated,
+        schemas,
+        naming_config,
+        selection_query,
+        root_type,
+        expanded_instances,
+        requires_selection_query=True,
     )
-    assert_correct_schema(annotated_schema.schema)
+    annotated_schema = processed.annotated_schema
+    query_document = processed.query_document
 
     flatten_root_types = None
     if flatten_naming:
         flatten_root_types = get_root_level_types_from_query(annotated_schema.schema, query_document)
 
-    result = translate_to_protobuf(
-        annotated_schema, cast(DocumentNode, query_document), package_name, flatten_root_types
+    with open_output(output) as output_file:
+        write_protobuf(
+            annotated_schema, cast(DocumentNode, query_document), output_file, package_name, flatten_root_types
+        )
+
+
+# Export -> all
+# ----------
+@export.command(name="all")
+@click.option(
+    "--schema",
+    "-s",
+    "schemas",
+    type=str,
+    cls=SchemaResolverOption,
+    multiple=True,
+    help="GraphQL schema file, directory, or URL. Can be specified multiple times. With --annotated, only used by "
+    "the skos-skeleton exporter, which runs on the unprocessed schema.",
+)
+@annotated_option
+@selection_query_option()
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+    required=True,
+    help="Output directory, every exporter writes to its own subdirectory",
+)
+@root_type_option
+@naming_config_option
+@expanded_instances_option
+@strict_option
+@click.option(
+    "--exporter",
+    "-x",
+    "exporters",
+    type=click.Choice(list(EXPORTERS)),
+    multiple=True,
+    help="Exporter to run. Can be specified multiple times. Defaults to all exporters the given options allow.",
+)
+@click.option("--avro-namespace", type=str, help="Avro namespace for types")
+@click.option("--package-name", type=str, help="Protobuf package name")
+@click.option("--flatten-naming", is_flag=True, default=False, help="Flatten nested Protobuf field names.")
+@click.option(
+    "--shacl-serialization-format", type=str, default="ttl", help="RDF serialization format of the SHACL output"
+)
+@click.option("--shacl-shapes-namespace", type=str, default="http://example.ns/shapes#", help="SHACL shapes namespace")
+@click.option("--shacl-shapes-prefix", type=str, default="shapes", help="SHACL shapes prefix")
+@click.option("--shacl-model-namespace", type=str, default="http://example.ns/model#", help="SHACL model namespace")
+@click.option("--shacl-model-prefix", type=str, default="model", help="SHACL model prefix")
+@click.option("--skos-namespace", type=str, default="https://example.org/vss#", help="SKOS concept namespace")
+@click.option("--skos-prefix", type=str, default="ns", help="SKOS concept prefix")
+@click.option(
+    "--skos-language", default="en", callback=validate_language_tag, help="BCP 47 language tag for SKOS prefLabels"
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of exporters running in parallel processes (default: number of CPUs)",
+)
+@watch_option
+def export_all(
+    schemas: list[Path] | None,
+    annotated: Path | None,
+    selection_query: Path | None,
+    output_dir: Path,
+    root_type: str | None,
+    naming_config: Path | None,
+    expanded_instances: bool,
+    strict: bool,
+    exporters: tuple[str, ...],
+    avro_namespace: str | None,
+    package_name: str | None,
+    flatten_naming: bool,
+    shacl_serialization_format: str,
+    shacl_shapes_namespace: str,
+    shacl_shapes_prefix: str,
+    shacl_model_namespace: str,
+    shacl_model_prefix: str,
+    skos_namespace: str,
+    skos_prefix: str,
+    skos_language: str,
+    workers: int | None,
+) -> None:
+    """Run several exporters on a schema that is loaded and processed only once."""
+    from s2dm.exporters.export_all import (
+        SCHEMA_EXPORTERS,
+        ExporterError,
+        ExportInputs,
+        ExportOptions,
+        run_exporters,
+        validate_export_request,
+    )
+
+    processed = load_export_schema(
+        annotated, None if annotated else schemas, naming_config, selection_query, root_type, expanded_instances
+    )
+
+    exporter_names = list(exporters) or [
+        name
+        for name in EXPORTERS
+        if (processed.query_document or name not in SELECTION_QUERY_EXPORTERS)
+        and (avro_namespace or name not in AVRO_EXPORTERS)
+        and (schemas or name not in SCHEMA_EXPORTERS)
+    ]
+
+    inputs = ExportInputs(
+        annotated_schema=processed.annotated_schema,
+        schema=get_schema_session().schema(schemas) if schemas else None,
+        query_document=processed.query_document,
+        root_type=processed.root_type,
+    )
+    options = ExportOptions(
+        strict=strict,
+        avro_namespace=avro_namespace,
+        package_name=package_name,
+        flatten_naming=flatten_naming,
+        shacl_serialization_format=shacl_serialization_format,
+        shacl_shapes_namespace=shacl_shapes_namespace,
+        shacl_shapes_namespace_prefix=shacl_shapes_prefix,
+        shacl_model_namespace=shacl_model_namespace,
+        shacl_model_namespace_prefix=shacl_model_prefix,
+        skos_namespace=skos_namespace,
+        skos_prefix=skos_prefix,
+        skos_language=skos_language,
     )
-    _ = output.write_text(result)
+
+    try:
+        validate_export_request(inputs, exporter_names, options)
+    except ValueError as e:
+        raise click.UsageError(str(e)) from e
+    try:
+        outputs = run_exporters(inputs, exporter_names, output_dir, options, workers)
+    except ExporterError as e:
+        raise click.ClickException(str(e)) from e
+
+    for name, output in outputs.items():
+        log.success(f"{name}: {output}")
 
 
 # Export -> skos
@@ -720,6 +1218,7 @@ def protobuf(
     help="BCP 47 language tag for prefLabels",
     show_default=True,
 )
+@watch_option
 def skos_skeleton(
     schemas: list[Path],
     output: Path,
@@ -728,12 +1227,13 @@ def skos_skeleton(
     language: str,
 ) -> None:
     """Generate SKOS skeleton RDF file from GraphQL schema."""
-    from s2dm.exporters.skos import generate_skos_skeleton
+    from s2dm.exporters.skos import generate_skos_skeleton_from_schema
 
     try:
+        graphql_schema = get_schema_session().schema(schemas)
         with output.open("w") as output_stream:
-            generate_skos_skeleton(
-                schema_paths=schemas,
+            generate_skos_skeleton_from_schema(
+                graphql_schema=graphql_schema,
                 output_stream=output_stream,
                 namespace=namespace,
                 prefix=prefix,
@@ -820,7 +1320,13 @@ def version_bump(schemas: list[Path], previous: list[Path], output_type: bool) -
 @check.command(name="constraints")
 @schema_option
 @naming_config_option
-def check_constraints(schemas: list[Path], naming_config: Path | None) -> None:
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of processes checking naming conventions in parallel (default: number of CPUs)",
+)
+def check_constraints(schemas: list[Path], naming_config: Path | None, workers: int | None) -> None:
     """
     Enforce intended use of custom directives and naming conventions.
     Checks:
@@ -828,11 +1334,13 @@ def check_constraints(schemas: list[Path], naming_config: Path | None) -> None:
     - @range and @cardinality min/max
     - Naming conventions (optional, if --naming-config provided)
     """
-    gql_schema = load_schema(schemas)
+    from s2dm.tools.constraint_checker import ConstraintChecker
+
+    gql_schema = get_schema_session().schema(schemas)
     objects = get_all_object_types(gql_schema)
     naming_convention_config = load_naming_convention_config(naming_config, ValidationMode.CHECK)
 
-    constraint_checker = ConstraintChecker(gql_schema, naming_convention_config)
+    constraint_checker = ConstraintChecker(gql_schema, naming_convention_config, workers)
     errors = constraint_checker.run(objects)
 
     if errors:
@@ -910,8 +1418,9 @@ def diff_graphql(schemas: list[Path], val_schemas: list[Path], output: Path | No
 )
 def export_concept_uri(schemas: list[Path], output: Path | None, namespace: str, prefix: str) -> None:
     """Generate concept URIs for a GraphQL schema and output as JSON-LD."""
-    graphql_schema = load_schema(schemas)
-    concepts = iter_all_concepts(get_all_named_types(graphql_schema))
+    from s2dm.concept.services import create_concept_uri_model, iter_all_concepts
+
+    concepts = iter_all_concepts(get_schema_session().named_types(schemas))
     concept_uri_model = create_concept_uri_model(concepts, namespace, prefix)
     data = concept_uri_model.to_json_ld()
 
@@ -933,8 +1442,9 @@ def export_concept_uri(schemas: list[Path], output: Path | None, namespace: str,
 @click.option("--strict-mode/--no-strict-mode", default=False)
 def export_id(schemas: list[Path], output: Path | None, strict_mode: bool) -> None:
     """Generate concept IDs for GraphQL schema fields and enums."""
+    from s2dm.exporters.id import IDExporter
 
-    composed_schema = load_schema(schemas)
+    composed_schema = get_schema_session().schema(schemas)
     exporter = IDExporter(schema=composed_schema, output=output, strict_mode=strict_mode, dry_run=output is None)
     node_ids = exporter.run()
 
@@ -963,17 +1473,21 @@ def registry_init(
     concept_prefix: str,
 ) -> None:
     """Initialize your spec history with the given schema."""
+    from s2dm.concept.services import create_concept_uri_model, iter_all_concepts
+    from s2dm.exporters.id import IDExporter
+    from s2dm.exporters.spec_history import SpecHistoryExporter
+
     output.parent.mkdir(parents=True, exist_ok=True)
 
+    session = get_schema_session()
+
     # Generate concept IDs
-    composed_schema = load_schema(schemas)
+    composed_schema = session.schema(schemas)
     id_exporter = IDExporter(schema=composed_schema, output=None, strict_mode=False, dry_run=False)
     concept_ids = id_exporter.run()
 
     # Generate concept URIs
-    graphql_schema = load_schema(schemas)
-    all_named_types = get_all_named_types(graphql_schema)
-    concepts = iter_all_concepts(all_named_types)
+    concepts = iter_all_concepts(session.named_types(schemas))
     concept_uri_model = create_concept_uri_model(concepts, concept_namespace, concept_prefix)
     concept_uris = concept_uri_model.to_json_ld()
 
@@ -985,6 +1499,7 @@ def registry_init(
         schemas=schemas,
         output=output,
         history_dir=history_dir,
+        session=session,
     )
     spec_history_result = spec_history_exporter.init_spec_history_model(concept_uris, concept_ids, concept_uri_model)
 
@@ -1025,17 +1540,21 @@ def registry_update(
     concept_prefix: str,
 ) -> None:
     """Update a given spec history file with your new schema."""
+    from s2dm.concept.services import create_concept_uri_model, iter_all_concepts
+    from s2dm.exporters.id import IDExporter
+    from s2dm.exporters.spec_history import SpecHistoryExporter
+
     output.parent.mkdir(parents=True, exist_ok=True)
 
+    session = get_schema_session()
+
     # Generate concept IDs
-    schema = load_schema(schemas)
+    schema = session.schema(schemas)
     id_exporter = IDExporter(schema=schema, output=None, strict_mode=False, dry_run=False)
     concept_ids = id_exporter.run()
 
     # Generate concept URIs
-    graphql_schema = load_schema(schemas)
-    all_named_types = get_all_named_types(graphql_schema)
-    concepts = iter_all_concepts(all_named_types)
+    concepts = iter_all_concepts(session.named_types(schemas))
     concept_uri_model = create_concept_uri_model(concepts, concept_namespace, concept_prefix)
     concept_uris = concept_uri_model.to_json_ld()
 
@@ -1047,6 +1566,7 @@ def registry_update(
         schemas=schemas,
         output=output,
         history_dir=history_dir,
+        session=session,
     )
     spec_history_result = spec_history_exporter.update_spec_history_model(
         concept_uris=concept_uris,
@@ -1072,7 +1592,7 @@ def registry_update(
 def search_graphql(schemas: list[Path], type: str, case_insensitive: bool, exact: bool) -> None:
     """Search for a type or field in the GraphQL schema. If type was found returns type including all fields,
     if fields was found returns only field in parent type"""
-    gql_schema = load_schema(schemas)
+    gql_schema = get_schema_session().schema(schemas)
 
     type_results = search_schema(
         gql_schema,
@@ -1103,7 +1623,7 @@ def search_graphql(schemas: list[Path], type: str, case_insensitive: bool, exact
 
 
 def display_search_results(
-    results: list[SearchResult],
+    results: list["SearchResult"],
     term: str,
     limit_value: int | None = None,
     total_count: int | None = None,
@@ -1191,6 +1711,8 @@ def search_skos(ttl_file: Path, term: str, case_insensitive: bool, limit: str) -
     that contain the search term, focusing on meaningful content while
     excluding predicates from the search scope.
     """
+    from s2dm.tools.skos_search import SKOSSearchService
+
     # Create search service
     try:
         service = SKOSSearchService(ttl_file)
@@ -1258,7 +1780,7 @@ def similar_graphql(schemas: list[Path], keyword: str, output: Path | None) -> N
 @schema_option
 def stats_graphql(schemas: list[Path]) -> None:
     """Get stats of schema."""
-    gql_schema = load_schema(schemas)
+    gql_schema = get_schema_session().schema(schemas)
 
     # Count types by kind
     type_map = gql_schema.type_map
@@ -1295,6 +1817,69 @@ def stats_graphql(schemas: list[Path]) -> None:
     log.rule("GraphQL Schema Type Counts")
     log.print_dict(type_counts)
 
+    from s2dm.exporters.utils.instance_tag import estimate_expansion
+
+    expansion: dict[str, Any] = {
+        estimate.root: {
+            "paths": estimate.paths,
+            "expanded_paths": estimate.expanded_paths,
+            "expansion_factor": round(estimate.factor, 2),
+            "intermediate_types": estimate.intermediate_types,
+        }
+        for estimate in estimate_expansion(gql_schema)
+    }
+    if expansion:
+        log.rule("Instance Expansion (--expanded-instances)")
+        log.print_dict(expansion)
+
+
+# Serve
+# ----------
+@click.command()
+@click.option("--host", type=str, default="127.0.0.1", show_default=True, help="Host to listen on")
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=8765,
+    show_default=True,
+    help="TCP port to listen on",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Unix socket to listen on instead of the TCP port",
+)
+@click.option(
+    "--token",
+    type=str,
+    help="Token TCP clients must send in the Authorization header, a random token is generated by default",
+)
+def serve(host: str, port: int, socket_path: Path | None, token: str | None) -> None:
+    """Run a local server that keeps loaded schemas in memory and runs commands on request.
+
+    Send `POST /<command>` requests with a JSON body like `{"args": ["-s", "spec", "-o", "out.graphql"]}` to run
+    the compose, export, search, stats, check, registry, validate, diff, similar and generate commands.
+    Requests to the TCP port must send the token of the server as `Authorization: Bearer <token>`.
+    """
+    # Imported here, as the server runs the commands defined in this module
+    from s2dm.server import CommandRunner, create_server
+
+    try:
+        server = create_server(CommandRunner(cli), host, port, socket_path, token)
+    except OSError as e:
+        raise click.ClickException(f"Could not start server: {e}") from e
+
+    log.info(f"Serving s2dm commands on {server.location}. Press Ctrl+C to stop.")
+    if server.token is not None:
+        log.info(f"Send requests with the header 'Authorization: Bearer {server.token}'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Stopped server")
+    finally:
+        server.server_close()
+
 
 cli.add_command(check)
 cli.add_command(compose)
@@ -1306,6 +1891,7 @@ cli.add_command(generate)
 cli.add_command(registry)
 cli.add_command(similar)
 cli.add_command(search)
+cli.add_command(serve)
 cli.add_command(stats)
 cli.add_command(validate)
 cli.add_command(units)
@@ -1,6 +1,6 @@
 """Avro exporter module for S2DM."""
 
 from .protocol import translate_to_avro_protocol
-from .schema import translate_to_avro_schema
+from .schema import translate_to_avro_schema, write_avro_schema
 
-__all__ = ["translate_to_avro_schema", "translate_to_avro_protocol"]
+__all__ = ["translate_to_avro_schema", "translate_to_avro_protocol", "write_avro_schema"]
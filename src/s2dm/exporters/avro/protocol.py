@@ -7,6 +7,7 @@ from s2dm import log
 from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
 from s2dm.exporters.utils.directive import get_argument_content
 from s2dm.exporters.utils.extraction import get_all_object_types, get_all_objects_with_directive
+from s2dm.exporters.utils.profiling import profiled
 from s2dm.exporters.utils.schema_loader import get_referenced_types
 
 from .protocol_transformer import AvroProtocolTransformer
@@ -95,6 +96,7 @@ def _generate_protocol_for_struct_types(
     return protocols
 
 
+@profiled("export:avro-protocol")
 def translate_to_avro_protocol(
     annotated_schema: AnnotatedSchema,
     namespace: str,
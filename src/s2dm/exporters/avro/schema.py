@@ -1,13 +1,25 @@
 import json
+from typing import Any, TextIO
 
 from graphql import DocumentNode
 
 from s2dm import log
 from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
+from s2dm.exporters.utils.output_writer import write_json
+from s2dm.exporters.utils.profiling import profiled
 
 from .schema_transformer import AvroSchemaTransformer
 
 
+def _build_avro_schema(
+    annotated_schema: AnnotatedSchema, namespace: str, selection_query: DocumentNode
+) -> dict[str, Any]:
+    log.info(f"Transforming GraphQL schema to Avro schema with {len(annotated_schema.schema.type_map)} types")
+
+    transformer = AvroSchemaTransformer(annotated_schema, namespace, selection_query)
+    return transformer.transform()
+
+
 def transform(
     annotated_schema: AnnotatedSchema,
     namespace: str,
@@ -24,18 +36,14 @@ def transform(
     Returns:
         str: Avro schema representation as a JSON string
     """
-    log.info(f"Transforming GraphQL schema to Avro schema with {len(annotated_schema.schema.type_map)} types")
-
-    transformer = AvroSchemaTransformer(annotated_schema, namespace, selection_query)
-    avro_schema = transformer.transform()
-
-    avro_schema_str = json.dumps(avro_schema, indent=2)
+    avro_schema_str = json.dumps(_build_avro_schema(annotated_schema, namespace, selection_query), indent=2)
 
     log.info("Successfully converted GraphQL schema to Avro schema")
 
     return avro_schema_str
 
 
+@profiled("export:avro-schema")
 def translate_to_avro_schema(
     annotated_schema: AnnotatedSchema,
     namespace: str,
@@ -53,3 +61,26 @@ def translate_to_avro_schema(
         str: Avro schema representation as a JSON string
     """
     return transform(annotated_schema, namespace, selection_query)
+
+
+@profiled("export:avro-schema")
+def write_avro_schema(
+    annotated_schema: AnnotatedSchema,
+    namespace: str,
+    selection_query: DocumentNode,
+    output: TextIO,
+) -> None:
+    """
+    Translate a GraphQL schema to Avro schema format and write it to a stream.
+
+    The JSON document is written in chunks, so it is never held in memory as one string.
+
+    Args:
+        annotated_schema: The annotated GraphQL schema object
+        namespace: Namespace for Avro types (required for valid cross-type references)
+        selection_query: Required selection query document to determine root-level types
+        output: Stream to write the Avro schema to
+    """
+    write_json(_build_avro_schema(annotated_schema, namespace, selection_query), output)
+
+    log.info("Successfully converted GraphQL schema to Avro schema")
@@ -0,0 +1,257 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast
+
+from graphql import DocumentNode, GraphQLSchema
+
+from s2dm import log
+from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
+from s2dm.exporters.utils.extraction import get_root_level_types_from_query
+from s2dm.exporters.utils.forked_pool import fork_map
+from s2dm.exporters.utils.output_writer import open_output
+
+
+@dataclass
+class ExportInputs:
+    """Schema artifacts shared by all exporters of a run.
+
+    Attributes:
+        annotated_schema: The processed schema used by the model exporters
+        schema: Optional unprocessed schema, used by the concept (SKOS) exporter
+        query_document: Optional selection query the schema was filtered with
+        root_type: Optional root type the schema was filtered with
+    """
+
+    annotated_schema: AnnotatedSchema
+    schema: GraphQLSchema | None = None
+    query_document: DocumentNode | None = None
+    root_type: str | None = None
+
+
+@dataclass
+class ExportOptions:
+    """Exporter specific options of a run. The defaults match the ones of the individual export commands."""
+
+    strict: bool = False
+    avro_namespace: str | None = None
+    package_name: str | None = None
+    flatten_naming: bool = False
+    shacl_serialization_format: str = "ttl"
+    shacl_shapes_namespace: str = "http://example.ns/shapes#"
+    shacl_shapes_namespace_prefix: str = "shapes"
+    shacl_model_namespace: str = "http://example.ns/model#"
+    shacl_model_namespace_prefix: str = "model"
+    skos_namespace: str = "https://example.org/vss#"
+    skos_prefix: str = "ns"
+    skos_language: str = "en"
+
+
+Exporter = Callable[[ExportInputs, ExportOptions, Path], Path]
+
+# File extensions of the RDF serialization formats, formats not listed here are used as extension as is
+RDF_FILE_EXTENSIONS = {
+    "turtle": "ttl",
+    "xml": "rdf",
+    "pretty-xml": "rdf",
+    "json-ld": "jsonld",
+    "nquads": "nq",
+}
+
+# Every exporter imports its dependencies itself, so that a run only imports the exporters it uses
+
+
+def _export_shacl(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    from s2dm.exporters.shacl import translate_to_shacl
+
+    serialization_format = options.shacl_serialization_format
+    output = output_dir / "shacl" / f"schema.{RDF_FILE_EXTENSIONS.get(serialization_format, serialization_format)}"
+    result = translate_to_shacl(
+        inputs.annotated_schema,
+        options.shacl_shapes_namespace,
+        options.shacl_shapes_namespace_prefix,
+        options.shacl_model_namespace,
+        options.shacl_model_namespace_prefix,
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    _ = result.serialize(destination=output, format=serialization_format)
+    return output
+
+
+def _export_jsonschema(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    from s2dm.exporters.jsonschema import write_jsonschema
+
+    output = output_dir / "jsonschema" / "schema.json"
+    with open_output(output) as output_file:
+        write_jsonschema(inputs.annotated_schema, output_file, inputs.root_type, options.strict)
+    return output
+
+
+def _export_vspec(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    from s2dm.exporters.vspec import write_vspec
+
+    output = output_dir / "vspec" / "schema.vspec"
+    with open_output(output) as output_file:
+        write_vspec(inputs.annotated_schema, output_file)
+    return output
+
+
+def _export_avro_schema(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    from s2dm.exporters.avro import write_avro_schema
+
+    output = output_dir / "avro" / "schema.avsc"
+    with open_output(output) as output_file:
+        write_avro_schema(
+            inputs.annotated_schema,
+            cast(str, options.avro_namespace),
+            cast(DocumentNode, inputs.query_document),
+            output_file,
+        )
+    return output
+
+
+def _export_avro_protocol(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    from s2dm.exporters.avro import translate_to_avro_protocol
+
+    output = output_dir / "avro" / "protocol"
+    avro_protocols = translate_to_avro_protocol(
+        inputs.annotated_schema, cast(str, options.avro_namespace), options.strict
+    )
+    output.mkdir(parents=True, exist_ok=True)
+    for type_name, protocol in avro_protocols.items():
+        _ = (output / f"{type_name}.avdl").write_text(protocol)
+    return output
+
+
+def _export_protobuf(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    from s2dm.exporters.protobuf import write_protobuf
+
+    output = output_dir / "protobuf" / "schema.proto"
+    query_document = cast(DocumentNode, inputs.query_document)
+    flatten_root_types = None
+    if options.flatten_naming:
+        flatten_root_types = get_root_level_types_from_query(inputs.annotated_schema.schema, query_document)
+    with open_output(output) as output_file:
+        write_protobuf(inputs.annotated_schema, query_document, output_file, options.package_name, flatten_root_types)
+    return output
+
+
+def _export_skos_skeleton(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    from s2dm.exporters.skos import generate_skos_skeleton_from_schema
+
+    output = output_dir / "skos" / "schema.ttl"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as output_stream:
+        generate_skos_skeleton_from_schema(
+            cast(GraphQLSchema, inputs.schema),
+            output_stream,
+            namespace=options.skos_namespace,
+            prefix=options.skos_prefix,
+            language=options.skos_language,
+            validate=True,
+        )
+    return output
+
+
+EXPORTERS: dict[str, Exporter] = {
+    "shacl": _export_shacl,
+    "jsonschema": _export_jsonschema,
+    "vspec": _export_vspec,
+    "avro-schema": _export_avro_schema,
+    "avro-protocol": _export_avro_protocol,
+    "protobuf": _export_protobuf,
+    "skos-skeleton": _export_skos_skeleton,
+}
+
+# Exporters that can only run on a schema filtered with a selection query
+SELECTION_QUERY_EXPORTERS = frozenset({"avro-schema", "protobuf"})
+
+# Exporters that require an Avro namespace
+AVRO_EXPORTERS = frozenset({"avro-schema", "avro-protocol"})
+
+# Exporters that run on the unprocessed schema
+SCHEMA_EXPORTERS = frozenset({"skos-skeleton"})
+
+
+class ExporterError(Exception):
+    """Raised when an exporter fails while running."""
+
+    def __init__(self, exporter_name: str, message: str) -> None:
+        # Both values are kept in args, so the error can be sent back from a worker process
+        super().__init__(exporter_name, message)
+        self.exporter_name = exporter_name
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.exporter_name} failed: {self.message}"
+
+
+def _run_exporter(run: tuple[ExportInputs, ExportOptions, Path], name: str) -> Path:
+    inputs, options, output_dir = run
+    try:
+        output = EXPORTERS[name](inputs, options, output_dir)
+    except (ValueError, OSError) as e:
+        raise ExporterError(name, str(e)) from e
+    log.info(f"Exported {name} to {output}")
+    return output
+
+
+def validate_export_request(inputs: ExportInputs, exporter_names: list[str], options: ExportOptions) -> None:
+    """Check that the given exporters exist and that the inputs and options they require are given.
+
+    Args:
+        inputs: Schema artifacts shared by all exporters
+        exporter_names: Names of the exporters to run, see EXPORTERS
+        options: Exporter specific options
+
+    Raises:
+        ValueError: If an exporter is unknown or requires an input or option that was not given
+    """
+    unknown_names = [name for name in exporter_names if name not in EXPORTERS]
+    if unknown_names:
+        raise ValueError(f"Unknown exporters: {', '.join(unknown_names)}")
+    if inputs.query_document is None:
+        query_names = [name for name in exporter_names if name in SELECTION_QUERY_EXPORTERS]
+        if query_names:
+            raise ValueError(f"Exporters require a selection query: {', '.join(query_names)}")
+    if inputs.schema is None:
+        schema_names = [name for name in exporter_names if name in SCHEMA_EXPORTERS]
+        if schema_names:
+            raise ValueError(f"Exporters require the unprocessed schema: {', '.join(schema_names)}")
+    if options.avro_namespace is None:
+        avro_names = [name for name in exporter_names if name in AVRO_EXPORTERS]
+        if avro_names:
+            raise ValueError(f"Exporters require an Avro namespace: {', '.join(avro_names)}")
+
+
+def run_exporters(
+    inputs: ExportInputs,
+    exporter_names: list[str],
+    output_dir: Path,
+    options: ExportOptions | None = None,
+    max_workers: int | None = None,
+) -> dict[str, Path]:
+    """Run the given exporters on shared schema inputs, each writing its own output below the output directory.
+
+    Exporters are independent of each other and run concurrently in forked worker processes. Where processes
+    cannot be forked, or only one worker is requested, they run one after the other in the current process.
+
+    Args:
+        inputs: Schema artifacts shared by all exporters
+        exporter_names: Names of the exporters to run, see EXPORTERS
+        output_dir: Directory the exporters write their outputs to
+        options: Exporter specific options
+        max_workers: Optional maximum number of worker processes
+
+    Returns:
+        Mapping of exporter names to the paths of their outputs
+
+    Raises:
+        ValueError: If an exporter is unknown or requires an input or option that was not given
+        ExporterError: If an exporter fails while running
+    """
+    options = options or ExportOptions()
+    validate_export_request(inputs, exporter_names, options)
+
+    outputs = fork_map(_run_exporter, (inputs, options, output_dir), exporter_names, max_workers)
+    return dict(zip(exporter_names, outputs, strict=True))
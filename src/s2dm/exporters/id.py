@@ -14,6 +14,7 @@ from graphql import (
 from s2dm import log
 from s2dm.exporters.utils.extraction import get_all_named_types
 from s2dm.exporters.utils.graphql_type import is_id_type, is_introspection_or_root_type
+from s2dm.exporters.utils.profiling import profiled
 from s2dm.idgen.idgen import fnv1_32_wrapper
 from s2dm.idgen.models import IDGenerationSpec
 
@@ -61,6 +62,7 @@ class IDExporter:
                     if id_spec.is_leaf_field():
                         yield id_spec
 
+    @profiled("export:id")
     def run(self) -> dict[str, Any]:
         """Generate IDs for GraphQL schema fields and enums."""
         log.info(f"Generating IDs from schema '{self.schema}', output is '{self.output}'")
@@ -1,5 +1,5 @@
 """JSON Schema exporter module for S2DM."""
 
-from .jsonschema import translate_to_jsonschema
+from .jsonschema import translate_to_jsonschema, write_jsonschema
 
-__all__ = ["translate_to_jsonschema"]
+__all__ = ["translate_to_jsonschema", "write_jsonschema"]
@@ -1,13 +1,23 @@
 import json
+from typing import Any, TextIO
 
 from graphql import GraphQLSchema
 
 from s2dm import log
 from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
+from s2dm.exporters.utils.output_writer import write_json
+from s2dm.exporters.utils.profiling import profiled
 
 from .transformer import JsonSchemaTransformer
 
 
+def _build_json_schema(graphql_schema: GraphQLSchema, root_type: str | None, strict: bool) -> dict[str, Any]:
+    log.info(f"Transforming GraphQL schema to JSON Schema with {len(graphql_schema.type_map)} types")
+
+    transformer = JsonSchemaTransformer(graphql_schema, root_type, strict)
+    return transformer.transform()
+
+
 def transform(
     graphql_schema: GraphQLSchema,
     root_type: str | None = None,
@@ -24,18 +34,14 @@ def transform(
     Returns:
         str: JSON Schema representation as a string
     """
-    log.info(f"Transforming GraphQL schema to JSON Schema with {len(graphql_schema.type_map)} types")
-
-    transformer = JsonSchemaTransformer(graphql_schema, root_type, strict)
-    json_schema = transformer.transform()
-
-    json_schema_str = json.dumps(json_schema, indent=2)
+    json_schema_str = json.dumps(_build_json_schema(graphql_schema, root_type, strict), indent=2)
 
     log.info("Successfully converted GraphQL schema to JSON Schema")
 
     return json_schema_str
 
 
+@profiled("export:jsonschema")
 def translate_to_jsonschema(
     annotated_schema: AnnotatedSchema,
     root_type: str | None = None,
@@ -53,3 +59,26 @@ def translate_to_jsonschema(
         str: JSON Schema representation as a string
     """
     return transform(annotated_schema.schema, root_type, strict)
+
+
+@profiled("export:jsonschema")
+def write_jsonschema(
+    annotated_schema: AnnotatedSchema,
+    output: TextIO,
+    root_type: str | None = None,
+    strict: bool = False,
+) -> None:
+    """
+    Translate a GraphQL schema to JSON Schema format and write it to a stream.
+
+    The JSON document is written in chunks, so it is never held in memory as one string.
+
+    Args:
+        annotated_schema: The annotated GraphQL schema object to transform
+        output: Stream to write the JSON Schema to
+        root_type: Optional root type name for the JSON schema
+        strict: Enforce strict field nullability translation from GraphQL to JSON Schema
+    """
+    write_json(_build_json_schema(annotated_schema.schema, root_type, strict), output)
+
+    log.info("Successfully converted GraphQL schema to JSON Schema")
@@ -1,3 +1,3 @@
-from .protobuf import translate_to_protobuf
+from .protobuf import translate_to_protobuf, write_protobuf
 
-__all__ = ["translate_to_protobuf"]
+__all__ = ["translate_to_protobuf", "write_protobuf"]
@@ -1,7 +1,11 @@
+from typing import TextIO
+
 from graphql import DocumentNode
 
 from s2dm import log
 from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
+from s2dm.exporters.utils.output_writer import write_chunks
+from s2dm.exporters.utils.profiling import profiled
 
 from .transformer import ProtobufTransformer
 
@@ -37,6 +41,7 @@ def transform(
     return proto_content
 
 
+@profiled("export:protobuf")
 def translate_to_protobuf(
     annotated_schema: AnnotatedSchema,
     selection_query: DocumentNode,
@@ -59,3 +64,34 @@ def translate_to_protobuf(
         ValueError: If selection_query is not provided
     """
     return transform(annotated_schema, selection_query, package_name, flatten_root_types)
+
+
+@profiled("export:protobuf")
+def write_protobuf(
+    annotated_schema: AnnotatedSchema,
+    selection_query: DocumentNode,
+    output: TextIO,
+    package_name: str | None = None,
+    flatten_root_types: list[str] | None = None,
+) -> None:
+    """
+    Translate a GraphQL schema to Protocol Buffers format and write it to a stream.
+
+    The template is rendered chunk by chunk, so the .proto content is never held in memory as one string.
+
+    Args:
+        annotated_schema: The annotated GraphQL schema object
+        selection_query: Required selection query document to determine root-level types
+        output: Stream to write the Protocol Buffers representation to
+        package_name: Optional package name for the .proto file
+        flatten_root_types: Optional list of root type names for flatten mode
+
+    Raises:
+        ValueError: If selection_query is not provided
+    """
+    log.info(f"Transforming GraphQL schema to Protobuf with {len(annotated_schema.schema.type_map)} types")
+
+    transformer = ProtobufTransformer(annotated_schema, selection_query, package_name, flatten_root_types)
+    write_chunks(transformer.generate(), output)
+
+    log.info("Successfully converted GraphQL schema to Protobuf")
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from typing import Any, cast
 
 from graphql import (
@@ -6,7 +7,6 @@ from graphql import (
     GraphQLField,
     GraphQLInterfaceType,
     GraphQLList,
-    GraphQLNamedType,
     GraphQLNonNull,
     GraphQLObjectType,
     GraphQLScalarType,
@@ -29,7 +29,7 @@ from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
 from s2dm.exporters.utils.directive import get_directive_arguments, has_given_directive
 from s2dm.exporters.utils.extraction import get_all_named_types, get_query_operation_name
 from s2dm.exporters.utils.field import get_cardinality
-from s2dm.exporters.utils.schema_loader import get_referenced_types
+from s2dm.exporters.utils.reachability import get_reachability_index
 
 GRAPHQL_SCALAR_TO_PROTOBUF = {
     # Built-in GraphQL scalars
@@ -106,6 +106,15 @@ class ProtobufTransformer:
         Returns:
             str: Protobuf string representation of the GraphQL schema.
         """
+        return "".join(self.generate())
+
+    def generate(self) -> Iterator[str]:
+        """
+        Transform a GraphQL schema to Protocol Buffers format chunk by chunk.
+
+        Yields:
+            str: Consecutive chunks of the Protobuf representation of the GraphQL schema.
+        """
         log.info("Starting GraphQL to Protobuf transformation")
 
         user_defined_types = get_all_named_types(self.graphql_schema)
@@ -169,10 +178,9 @@ class ProtobufTransformer:
 
         template_vars = self._build_template_vars(proto_schema)
 
-        result = template.render(template_vars)
+        yield from template.generate(template_vars)
 
         log.info("Successfully transformed GraphQL schema to Protobuf")
-        return result
 
     def _has_field_options(self, proto_schema: ProtoSchema) -> bool:
         """Check if any field in the schema has field options."""
@@ -358,10 +366,8 @@ class ProtobufTransformer:
 
     def _add_type_with_dependencies(self, type_name: str, referenced_types: set[str]) -> None:
         """Add a type and all its transitive dependencies to the referenced_types set."""
-        dependencies = get_referenced_types(self.graphql_schema, type_name, include_instance_tag_fields=True)
-        for dependency in dependencies:
-            if isinstance(dependency, GraphQLNamedType):
-                referenced_types.add(dependency.name)
+        index = get_reachability_index(self.graphql_schema, include_instance_tag_fields=True)
+        referenced_types.update(index.reachable_names(type_name))
 
     def _flatten_fields(
         self,
@@ -18,6 +18,7 @@ from s2dm.exporters.utils.directive import get_argument_content
 from s2dm.exporters.utils.extraction import get_all_object_types
 from s2dm.exporters.utils.field import Cardinality, FieldCase, get_cardinality, get_field_case_extended, print_field_sdl
 from s2dm.exporters.utils.graphql_type import is_introspection_or_root_type
+from s2dm.exporters.utils.profiling import profiled
 
 SUPPORTED_FIELD_CASES = {
     FieldCase.DEFAULT,
@@ -50,6 +51,7 @@ def add_comment_to_property_node(field: GraphQLField, property_node: BNode, grap
         _ = graph.add((property_node, RDFS.comment, Literal(comment)))
 
 
+@profiled("export:shacl")
 def translate_to_shacl(
     annotated_schema: AnnotatedSchema,
     shapes_namespace: str,
@@ -11,6 +11,7 @@ from rdflib.term import Node
 from s2dm.concept.models import Concepts, FieldMetadata
 from s2dm.concept.services import iter_all_concepts
 from s2dm.exporters.utils.extraction import get_all_named_types
+from s2dm.exporters.utils.profiling import profiled
 from s2dm.exporters.utils.schema_loader import load_schema
 
 # Constants
@@ -248,8 +249,33 @@ def generate_skos_skeleton(
     """
     logging.info(f"Processing schema '{schema_paths}' for SKOS generation")
 
-    # Load schema and extract concepts
     graphql_schema = load_schema(schema_paths)
+    generate_skos_skeleton_from_schema(graphql_schema, output_stream, namespace, prefix, language, validate)
+
+
+@profiled("export:skos-skeleton")
+def generate_skos_skeleton_from_schema(
+    graphql_schema: GraphQLSchema,
+    output_stream: TextIO,
+    namespace: str,
+    prefix: str,
+    language: str,
+    validate: bool = True,
+) -> None:
+    """Generate SKOS skeleton RDF file from an already loaded GraphQL schema.
+
+    Args:
+        graphql_schema: The GraphQL schema to extract concepts from
+        output_stream: The output stream to write to
+        namespace: The namespace for the concepts
+        prefix: The prefix to use for the concepts
+        language: BCP 47 language tag for prefLabels (validated at CLI level)
+        validate: Whether to validate the generated RDF (default: True)
+
+    Raises:
+        ValueError: If validation is enabled and the generated RDF has errors
+    """
+    # Extract concepts
     named_types = get_all_named_types(graphql_schema)
     concepts = iter_all_concepts(named_types)
 
@@ -13,7 +13,7 @@ from s2dm.concept.services import (
     save_spec_history,
     update_spec_history_from_concept_uris,
 )
-from s2dm.exporters.utils.schema_loader import build_schema_str
+from s2dm.exporters.utils.schema_loader import SchemaSession
 
 
 class SpecHistoryExporter:
@@ -22,6 +22,7 @@ class SpecHistoryExporter:
         schemas: list[Path],
         output: Path | None,
         history_dir: Path,
+        session: SchemaSession | None = None,
     ):
         """
         Args:
@@ -32,10 +33,12 @@ class SpecHistoryExporter:
             spec_history: Path to an existing spec history JSON-LD file (for updates)
             output: Path to the output spec history JSON-LD file
             history_dir: Directory to store type history files
+            session: Schema session to reuse already loaded schema files from
         """
         self.schemas = schemas
         self.output = output
         self.history_dir = history_dir
+        self.session = session or SchemaSession()
 
     @staticmethod
     def extract_type_definition(content: str, type_name: str) -> str | None:
@@ -117,7 +120,7 @@ class SpecHistoryExporter:
         log.info(f"Processing type definitions for {len(new_concepts)} new and {len(updated_ids)} updated concepts")
         timestamp = datetime.now(UTC)
         concepts_to_process = new_concepts + updated_ids
-        schema_content = build_schema_str(schema_paths)
+        schema_content = self.session.composed_sdl(schema_paths)
         for concept_name in concepts_to_process:
             if concept_name not in concept_ids:
                 log.warning(f"No ID found for concept {concept_name}, skipping")
@@ -0,0 +1,291 @@
+import io
+import pickle
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import graphql
+from graphql import (
+    DirectiveLocation,
+    DocumentNode,
+    GraphQLArgument,
+    GraphQLDirective,
+    GraphQLEnumType,
+    GraphQLEnumValue,
+    GraphQLField,
+    GraphQLInputField,
+    GraphQLInputObjectType,
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLScalarType,
+    GraphQLSchema,
+    GraphQLUnionType,
+    Undefined,
+    introspection_types,
+    specified_directives,
+    specified_scalar_types,
+)
+from graphql.language import ast
+from graphql.language.ast import Node, OperationType
+
+from s2dm import __version__
+from s2dm.exporters.utils.annotated_schema import AnnotatedSchema, FieldMetadata, TypeMetadata
+from s2dm.exporters.utils.instance_tag import InstancePaths
+from s2dm.exporters.utils.output_writer import open_output
+from s2dm.exporters.utils.profiling import profiled
+
+ARTIFACT_MAGIC = "S2DM-ANNOTATED"
+ARTIFACT_FORMAT_VERSION = "1"
+
+# Types and directives every schema shares with graphql-core. They are stored by name and resolved to the
+# graphql-core objects when loading, as graphql-core compares some of them by identity.
+_STANDARD_TYPES: dict[str, GraphQLNamedType] = {**specified_scalar_types, **introspection_types}
+_SPECIFIED_DIRECTIVES = {directive.name: directive for directive in specified_directives}
+
+# Attributes holding the thunks of lazily defined types, replaced with their resolved values when storing a type
+_THUNK_ATTRIBUTES = ("_fields", "_interfaces", "_types")
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class AnnotatedSchemaArtifact:
+    """A processed schema with its metadata and the inputs exporters need besides it.
+
+    Attributes:
+        annotated_schema: The processed schema with its type and field metadata
+        query_document: Optional selection query the schema was filtered with
+        root_type: Optional root type the schema was filtered with
+    """
+
+    annotated_schema: AnnotatedSchema
+    query_document: DocumentNode | None = None
+    root_type: str | None = None
+
+
+def _restore_node(node_class: type[Node], values: tuple[Any, ...]) -> Node:
+    """Recreate an AST node without location from the values of its keys."""
+    node = node_class.__new__(node_class)
+    object.__setattr__(node, "loc", None)
+    for key, value in zip(node_class.keys[1:], values, strict=True):
+        object.__setattr__(node, key, value)
+    return node
+
+
+def _shared_node(node: Node) -> Node:
+    """Return an AST node stored once and referenced from several places."""
+    return node
+
+
+# The only classes and functions an artifact can refer to. Loading an artifact thus never calls anything else,
+# however the artifact was crafted.
+_ALLOWED_VALUES: tuple[type | Callable[..., Any], ...] = (
+    *(value for value in vars(ast).values() if isinstance(value, type) and issubclass(value, Node)),
+    OperationType,
+    DirectiveLocation,
+    GraphQLScalarType,
+    GraphQLObjectType,
+    GraphQLInterfaceType,
+    GraphQLUnionType,
+    GraphQLEnumType,
+    GraphQLInputObjectType,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLField,
+    GraphQLArgument,
+    GraphQLEnumValue,
+    GraphQLInputField,
+    GraphQLDirective,
+    TypeMetadata,
+    FieldMetadata,
+    InstancePaths,
+    _restore_node,
+    _shared_node,
+)
+_ALLOWED_GLOBALS = frozenset((value.__module__, value.__qualname__) for value in _ALLOWED_VALUES)
+
+
+class _NodeInterner:
+    """Maps structurally equal AST nodes to one of them.
+
+    The definitions of a schema repeat many AST nodes, such as the names of common types, directives and
+    descriptions. Storing equal nodes once makes the artifact smaller and faster to load. AST nodes are not
+    modified after parsing, so the loaded schema can share them.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[tuple[Any, ...], Node] = {}
+        self._canonical_nodes: dict[int, Node] = {}
+
+    def intern(self, node: Node) -> Node:
+        canonical_node = self._canonical_nodes.get(id(node))
+        if canonical_node is None:
+            key = (type(node), *(self._key(getattr(node, key)) for key in type(node).keys[1:]))
+            canonical_node = self._nodes.setdefault(key, node)
+            self._canonical_nodes[id(node)] = canonical_node
+        return canonical_node
+
+    def _key(self, value: Any) -> Any:
+        if isinstance(value, Node):
+            return id(self.intern(value))
+        if isinstance(value, tuple):
+            return tuple(self._key(item) for item in value)
+        return value
+
+
+def _named_type_state(named_type: GraphQLNamedType) -> dict[str, Any]:
+    """Return the attributes of a named type, with its thunks replaced by the values they resolve to.
+
+    Attributes set to the default of their class, such as the `out_type` of input object types, are left out and
+    fall back to the class when loading.
+    """
+    type_class = type(named_type)
+    state = {key: value for key, value in vars(named_type).items() if getattr(type_class, key, _MISSING) is not value}
+    for attribute in _THUNK_ATTRIBUTES:
+        if attribute in state:
+            state[attribute] = getattr(named_type, attribute[1:])
+            state[attribute[1:]] = state[attribute]
+    return state
+
+
+class _ArtifactPickler(pickle.Pickler):
+    """Pickler storing references to named types by name, so every type is stored on its own and not nested
+    in the types referencing it."""
+
+    def __init__(self, file: io.BytesIO, protocol: int) -> None:
+        super().__init__(file, protocol)
+        self.node_interner = _NodeInterner()
+
+    def persistent_id(self, obj: Any) -> tuple[str, str] | None:
+        if obj is Undefined:
+            return ("undefined", "")
+        if isinstance(obj, GraphQLNamedType):
+            return ("type", obj.name)
+        if isinstance(obj, GraphQLDirective) and _SPECIFIED_DIRECTIVES.get(obj.name) is obj:
+            return ("directive", obj.name)
+        return None
+
+    def reducer_override(self, obj: Any) -> Any:
+        # AST nodes are stored once and without locations, and restored without going through their __setattr__
+        if isinstance(obj, Node):
+            canonical_node = self.node_interner.intern(obj)
+            if canonical_node is not obj:
+                return _shared_node, (canonical_node,)
+            node_class = type(obj)
+            return _restore_node, (node_class, tuple(getattr(obj, key) for key in node_class.keys[1:]))
+        return NotImplemented
+
+
+class _ArtifactUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, named_types: dict[str, GraphQLNamedType]) -> None:
+        super().__init__(file)
+        self.named_types = named_types
+
+    def persistent_load(self, pid: tuple[str, str]) -> Any:
+        kind, name = pid
+        if kind == "undefined":
+            return Undefined
+        if kind == "type":
+            return self.named_types[name]
+        if kind == "directive":
+            return _SPECIFIED_DIRECTIVES[name]
+        raise pickle.UnpicklingError(f"Unknown reference: {kind}")
+
+    def find_class(self, module: str, name: str) -> Any:
+        # Dotted names are resolved attribute by attribute, which could reach any object through a module
+        if "." in name or (module, name) not in _ALLOWED_GLOBALS:
+            raise pickle.UnpicklingError(f"Artifacts cannot contain '{module}.{name}'")
+        return super().find_class(module, name)
+
+
+def _artifact_header() -> bytes:
+    return f"{ARTIFACT_MAGIC} {ARTIFACT_FORMAT_VERSION} {__version__} {graphql.__version__}\n".encode()
+
+
+@profiled("write_artifact")
+def write_annotated_schema_artifact(artifact: AnnotatedSchemaArtifact, output: Path) -> None:
+    """Write a processed schema and its metadata to a compact binary artifact.
+
+    Every named type is stored with its resolved fields, arguments, directives and descriptions, so loading
+    the artifact neither parses SDL nor builds the schema from it again. The artifact is compressed and
+    starts with a header naming the s2dm and graphql-core versions that wrote it; it can only be read by the
+    same versions. The artifact is written to a temporary file first, so readers never see a partial artifact.
+
+    Args:
+        artifact: The processed schema with its metadata
+        output: Path of the artifact file, missing parent directories are created
+    """
+    schema = artifact.annotated_schema.schema
+    named_types = [named_type for name, named_type in schema.type_map.items() if name not in _STANDARD_TYPES]
+
+    payload = io.BytesIO()
+    # The classes and names of the types come first, so the loader can create every type before any
+    # reference to it is read
+    pickle.dump([(type(named_type), named_type.name) for named_type in named_types], payload, pickle.HIGHEST_PROTOCOL)
+    _ArtifactPickler(payload, pickle.HIGHEST_PROTOCOL).dump(
+        (
+            [_named_type_state(named_type) for named_type in named_types],
+            dict(vars(schema)),
+            artifact.annotated_schema.type_metadata,
+            artifact.annotated_schema.field_metadata,
+            artifact.query_document,
+            artifact.root_type,
+        )
+    )
+
+    with open_output(output, binary=True) as output_file:
+        output_file.write(_artifact_header())
+        output_file.write(zlib.compress(payload.getvalue()))
+
+
+@profiled("read_artifact")
+def read_annotated_schema_artifact(path: Path) -> AnnotatedSchemaArtifact:
+    """Read a processed schema and its metadata from an artifact written by `write_annotated_schema_artifact`.
+
+    Args:
+        path: Path of the artifact file
+
+    Returns:
+        The processed schema with its metadata and the inputs it was processed with
+
+    Raises:
+        ValueError: If the file is not an artifact, or was written by other s2dm or graphql-core versions
+    """
+    data = path.read_bytes()
+    header, _, body = data.partition(b"\n")
+    fields = header.decode(errors="replace").split(" ")
+    if len(fields) != 4 or fields[0] != ARTIFACT_MAGIC:
+        raise ValueError(f"'{path}' is not an annotated schema artifact")
+    if header + b"\n" != _artifact_header():
+        raise ValueError(
+            f"'{path}' was written by s2dm {fields[2]} with graphql-core {fields[3]} (format {fields[1]}), "
+            "compose it again with this version"
+        )
+
+    try:
+        payload = io.BytesIO(zlib.decompress(body))
+        named_types = {
+            name: type_class.__new__(type_class) for type_class, name in _ArtifactUnpickler(payload, {}).load()
+        }
+        type_states, schema_state, type_metadata, field_metadata, query_document, root_type = _ArtifactUnpickler(
+            payload, named_types | _STANDARD_TYPES
+        ).load()
+    except (zlib.error, pickle.UnpicklingError, EOFError, KeyError, ValueError, TypeError) as e:
+        raise ValueError(f"'{path}' is not a valid annotated schema artifact: {e}") from e
+
+    for named_type, state in zip(named_types.values(), type_states, strict=True):
+        vars(named_type).update(state)
+
+    schema = GraphQLSchema.__new__(GraphQLSchema)
+    vars(schema).update(schema_state)
+
+    return AnnotatedSchemaArtifact(
+        annotated_schema=AnnotatedSchema(schema=schema, type_metadata=type_metadata, field_metadata=field_metadata),
+        query_document=query_document,
+        root_type=root_type,
+    )
@@ -1,24 +1,25 @@
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
 from graphql import GraphQLField, GraphQLSchema
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeMetadata:
     source: str | None
     is_intermediate_type: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class FieldMetadata:
-    resolved_names: list[str]
+    resolved_names: Sequence[str]
     resolved_type: str
     is_expanded: bool
     original_field: GraphQLField | None = None
-    instances: list[list[str]] = field(default_factory=list)
+    instances: Sequence[Sequence[str]] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class AnnotatedSchema:
     schema: GraphQLSchema
     type_metadata: dict[str, TypeMetadata] = field(default_factory=dict)
@@ -0,0 +1,103 @@
+import glob
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from graphql import GraphQLError, GraphQLSchema, parse
+
+from s2dm import log
+from s2dm.exporters.utils.forked_pool import fork_map
+from s2dm.exporters.utils.naming_config import NamingConventionConfig
+from s2dm.exporters.utils.output_writer import open_output
+from s2dm.exporters.utils.schema_loader import (
+    GRAPHQL_FILE_EXTENSIONS,
+    process_schema,
+    write_schema_with_directives_preserved,
+)
+
+
+@dataclass
+class ComposeBatchInputs:
+    """Base schema and settings shared by all selection queries of a batch."""
+
+    schema: GraphQLSchema
+    source_map: dict[str, str]
+    output_dir: Path
+    naming_config: NamingConventionConfig | None = None
+    root_type: str | None = None
+    expanded_instances: bool = False
+
+
+@dataclass
+class QueryComposeResult:
+    """Outcome of composing the schema for a single selection query."""
+
+    query_path: Path
+    output: Path
+    seconds: float
+    error: str | None = None
+
+
+def resolve_query_files(query_pattern: str) -> list[Path]:
+    """Resolve a directory or glob pattern into the selection query files it contains.
+
+    Args:
+        query_pattern: Directory containing query files, or a glob pattern matching them
+
+    Returns:
+        Sorted list of query files
+    """
+    query_dir = Path(query_pattern)
+    if query_dir.is_dir():
+        return sorted(path for path in query_dir.iterdir() if path.is_file() and path.suffix in GRAPHQL_FILE_EXTENSIONS)
+    return sorted(Path(path) for path in glob.glob(query_pattern, recursive=True) if Path(path).is_file())
+
+
+def _compose_query(inputs: ComposeBatchInputs, query_path: Path) -> QueryComposeResult:
+    output = inputs.output_dir / f"{query_path.stem}.graphql"
+    start = time.perf_counter()
+    try:
+        query_document = parse(query_path.read_text())
+        annotated_schema = process_schema(
+            schema=inputs.schema,
+            source_map=inputs.source_map,
+            naming_config=inputs.naming_config,
+            query_document=query_document,
+            root_type=inputs.root_type,
+            expanded_instances=inputs.expanded_instances,
+        )
+        with open_output(output) as output_file:
+            write_schema_with_directives_preserved(annotated_schema.schema, output_file, inputs.source_map)
+    except (OSError, ValueError, GraphQLError) as e:
+        return QueryComposeResult(query_path, output, time.perf_counter() - start, error=str(e))
+    return QueryComposeResult(query_path, output, time.perf_counter() - start)
+
+
+def compose_queries(
+    inputs: ComposeBatchInputs, query_paths: list[Path], max_workers: int | None = None
+) -> list[QueryComposeResult]:
+    """Compose one filtered schema per selection query from a single base schema.
+
+    Every query is applied to its own fork of the base schema, so the queries are independent of each other. They
+    run in parallel in forked worker processes, each writing `<query name>.graphql` to the output directory. A
+    query that fails does not stop the others; its error is reported in its result.
+
+    Args:
+        inputs: Base schema and settings shared by all queries
+        query_paths: Selection query files
+        max_workers: Optional maximum number of worker processes
+
+    Returns:
+        Results in the order of the query files
+
+    Raises:
+        ValueError: If two query files have the same name and would write the same output file
+    """
+    duplicate_names = [name for name, count in Counter(path.stem for path in query_paths).items() if count > 1]
+    if duplicate_names:
+        raise ValueError(f"Selection queries with the same file name: {', '.join(sorted(duplicate_names))}")
+
+    inputs.output_dir.mkdir(parents=True, exist_ok=True)
+    log.info(f"Composing {len(query_paths)} selection queries")
+    return fork_map(_compose_query, inputs, query_paths, max_workers)
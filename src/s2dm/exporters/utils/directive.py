@@ -1,4 +1,6 @@
-import re
+import functools
+import weakref
+from collections.abc import Iterable
 from typing import Any
 
 from graphql import (
@@ -15,9 +17,7 @@ from graphql import (
     GraphQLUnionType,
     IntValueNode,
 )
-from graphql.language.ast import StringValueNode
-
-GRAPHQL_TYPE_DEFINITION_PATTERN = r"^(type|interface|input|enum|union|scalar)\s+(\w+)"
+from graphql.language.ast import DirectiveNode, Node, StringValueNode, ValueNode
 
 
 def get_type_directive_location(graphql_type: GraphQLType) -> DirectiveLocation | None:
@@ -37,6 +37,74 @@ def get_type_directive_location(graphql_type: GraphQLType) -> DirectiveLocation
     return None
 
 
+ParsedDirectives = dict[str, dict[str, Any]]
+
+
+def _parse_argument_value(value: ValueNode) -> Any:
+    """Convert an argument value node to a Python value, keeping nodes without a plain value (lists, objects)."""
+    if isinstance(value, IntValueNode):
+        return int(value.value)
+    if isinstance(value, FloatValueNode):
+        return float(value.value)
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def _parse_directives(directive_nodes: Iterable[DirectiveNode]) -> ParsedDirectives:
+    """Map the names of directives to their arguments. Only the first use of a repeated directive is kept."""
+    parsed: ParsedDirectives = {}
+    for directive_node in directive_nodes:
+        parsed.setdefault(
+            directive_node.name.value,
+            {argument.name.value: _parse_argument_value(argument.value) for argument in directive_node.arguments},
+        )
+    return parsed
+
+
+class DirectiveIndex:
+    """Parsed directives of schema elements, keyed by the identity of their AST nodes.
+
+    The directives of every AST node are parsed once, on first use. The index is keyed by AST node rather than by
+    type and field name, so it stays valid when elements are renamed by naming conversion or dropped by pruning, and
+    it is shared between forks of a schema, which all keep the AST nodes of their elements. Entries are removed when
+    their AST node is garbage collected.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref[Node], ParsedDirectives]] = {}
+
+    def directives(self, element: GraphQLField | GraphQLObjectType) -> ParsedDirectives:
+        """Return the directives of an element mapped to their arguments. The result must not be modified."""
+        node = element.ast_node
+        if node is None or not node.directives:
+            return _NO_DIRECTIVES
+
+        key = id(node)
+        entry = self._entries.get(key)
+        if entry is None or entry[0]() is not node:
+            entry = (weakref.ref(node, functools.partial(self._remove, key)), _parse_directives(node.directives))
+            self._entries[key] = entry
+        return entry[1]
+
+    def _remove(self, key: int, node_ref: weakref.ref[Node]) -> None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is node_ref:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_NO_DIRECTIVES: ParsedDirectives = {}
+_directive_index = DirectiveIndex()
+
+
+def get_directive_index() -> DirectiveIndex:
+    """Return the directive index used by `has_given_directive` and `get_directive_arguments`."""
+    return _directive_index
+
+
 def get_directive_arguments(element: GraphQLField | GraphQLObjectType, directive_name: str) -> dict[str, Any]:
     """
     Extracts the arguments of a specified directive from a GraphQL element.
@@ -46,34 +114,12 @@ def get_directive_arguments(element: GraphQLField | GraphQLObjectType, directive
     Returns:
         dict[str, Any]: A dictionary containing the directive arguments with proper type conversion.
     """
-    if not has_given_directive(element, directive_name) or not element.ast_node:
-        return {}
-
-    directive = next(d for d in element.ast_node.directives if d.name.value == directive_name)
-    args: dict[str, Any] = {}
-
-    for arg in directive.arguments:
-        arg_name = arg.name.value
-        if hasattr(arg.value, "value"):
-            if isinstance(arg.value, IntValueNode):
-                args[arg_name] = int(arg.value.value)
-            elif isinstance(arg.value, FloatValueNode):
-                args[arg_name] = float(arg.value.value)
-            else:
-                args[arg_name] = arg.value.value
-        else:
-            args[arg_name] = arg.value
-
-    return args
+    return dict(_directive_index.directives(element).get(directive_name, _NO_DIRECTIVES))
 
 
 def has_given_directive(element: GraphQLObjectType | GraphQLField, directive_name: str) -> bool:
     """Check whether a GraphQL element (field, object type) has a particular specified directive."""
-    if element.ast_node and element.ast_node.directives:
-        for directive in element.ast_node.directives:
-            if directive.name.value == directive_name:
-                return True
-    return False
+    return directive_name in _directive_index.directives(element)
 
 
 def get_argument_content(
@@ -176,59 +222,3 @@ def build_directive_map(schema: GraphQLSchema) -> dict[str | tuple[str, str], li
                         directive_map[(type_name, enum_value_name)] = directive_strings
 
     return directive_map
-
-
-def add_directives_to_schema(schema_str: str, directive_map: dict[str | tuple[str, str], list[str]]) -> str:
-    def find_first_unquoted_brace(line: str) -> int:
-        """Find the first { that is not inside a string literal. Returns -1 if not found."""
-        in_comment = False
-        i = 0
-        while i < len(line):
-            if line[i] == '"' and (i == 0 or line[i - 1] != "\\"):
-                in_comment = not in_comment
-            elif line[i] == "{" and not in_comment:
-                return i
-            i += 1
-        return -1
-
-    lines = schema_str.split("\n")
-    result_lines = []
-    current_type = None
-
-    for line in lines:
-        type_match = re.match(GRAPHQL_TYPE_DEFINITION_PATTERN, line)
-        if type_match:
-            type_kind = type_match.group(1)
-            type_name = type_match.group(2)
-            current_type = type_name
-
-            if type_name in directive_map:
-                directives_str = " " + " ".join(directive_map[type_name])
-
-                brace_pos = find_first_unquoted_brace(line)
-                if brace_pos != -1:
-                    line = line[:brace_pos].rstrip() + directives_str + " " + line[brace_pos:]
-                else:
-                    line = line.replace(f"{type_kind} {type_name}", f"{type_kind} {type_name}{directives_str}")
-
-        elif current_type:
-            field_match = re.match(r"^\s+(\w+)(?:\([^)]*\))?\s*:\s*", line)
-            if field_match:
-                field_name = field_match.group(1)
-                if current_type and (current_type, field_name) in directive_map:
-                    directives_str = " " + " ".join(directive_map[(current_type, field_name)])
-                    line = line.rstrip() + directives_str
-
-            enum_match = re.match(r"^\s+(\w+)\s*$", line)
-            if enum_match:
-                enum_value_name = enum_match.group(1)
-                if current_type and (current_type, enum_value_name) in directive_map:
-                    directives_str = " " + " ".join(directive_map[(current_type, enum_value_name)])
-                    line = line.rstrip() + directives_str
-
-        if line.strip() == "}":
-            current_type = None
-
-        result_lines.append(line)
-
-    return "\n".join(result_lines)
@@ -0,0 +1,87 @@
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from s2dm import log
+
+DEFAULT_POLL_INTERVAL_SECONDS = 0.5
+
+FileState = tuple[int, int]
+
+
+def get_file_state(path: Path) -> FileState | None:
+    """Return the modification time and size of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """Detects content changes of a fixed set of files by polling.
+
+    Every poll compares the modification time and size of each file with the previous poll. Only files whose
+    metadata changed are hashed, and a file is reported as changed only if its content hash differs. Saving a
+    file without modifying it therefore does not trigger a rebuild.
+    """
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self.paths = sorted(set(paths))
+        self._states: dict[Path, FileState | None] = {}
+        self._hashes: dict[Path, str | None] = {}
+        for path in self.paths:
+            self._states[path] = get_file_state(path)
+            self._hashes[path] = self._hash(path)
+
+    @staticmethod
+    def _hash(path: Path) -> str | None:
+        try:
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def poll(self) -> list[Path]:
+        """Return the files whose content changed, appeared or disappeared since the last poll.
+
+        Returns:
+            Changed files, in sorted order
+        """
+        changed: list[Path] = []
+        for path in self.paths:
+            state = get_file_state(path)
+            if state == self._states[path]:
+                continue
+            self._states[path] = state
+
+            content_hash = self._hash(path)
+            if content_hash != self._hashes[path]:
+                self._hashes[path] = content_hash
+                changed.append(path)
+        return changed
+
+
+def watch_files(
+    paths: Iterable[Path],
+    on_change: Callable[[list[Path]], None],
+    poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+) -> None:
+    """Call a function every time some of the given files change, until interrupted.
+
+    Args:
+        paths: Files to watch
+        on_change: Function called with the changed files
+        poll_interval: Seconds between two polls
+    """
+    watcher = FileWatcher(paths)
+    log.info(f"Watching {len(watcher.paths)} files for changes. Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            time.sleep(poll_interval)
+            changed = watcher.poll()
+            if changed:
+                on_change(changed)
+    except KeyboardInterrupt:
+        log.info("Stopped watching")
@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from s2dm.exporters.utils.profiling import ProfileData, get_profiler
+
+SharedT = TypeVar("SharedT")
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+# State shared with the worker processes of the pool in progress. Workers are forked and inherit it, because most
+# shared state (such as a GraphQL schema) cannot be pickled and sent to a worker.
+_shared: Any = None
+
+# Set while workers must not be forked, see `run_in_process`
+_in_process = False
+
+
+def _call_with_shared(function: Callable[[Any, ItemT], ResultT], item: ItemT) -> tuple[ResultT, ProfileData | None]:
+    profiler = get_profiler()
+    if profiler is None:
+        return function(_shared, item), None
+
+    # Send the stages recorded for this item back to the profiler of the parent process
+    profiler.start_worker()
+    result = function(_shared, item)
+    return result, profiler.take()
+
+
+def can_fork() -> bool:
+    """Return whether worker processes can be forked on this platform."""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+@contextmanager
+def run_in_process() -> Iterator[None]:
+    """Make `fork_map` call its function in the current process while the context is active.
+
+    A forked worker only inherits the thread that forked it, together with every lock held by the other threads
+    at that moment. Multithreaded callers, such as the server handling requests in threads, use this to avoid
+    workers deadlocking on such a lock.
+    """
+    global _in_process
+
+    previous, _in_process = _in_process, True
+    try:
+        yield
+    finally:
+        _in_process = previous
+
+
+def fork_map(
+    function: Callable[[SharedT, ItemT], ResultT],
+    shared: SharedT,
+    items: Sequence[ItemT],
+    max_workers: int | None = None,
+) -> list[ResultT]:
+    """Call a function for every item in forked worker processes.
+
+    The function receives the shared state inherited from the current process and one item. Only the function
+    reference, the items and the results are pickled. Where processes cannot be forked, inside `run_in_process`,
+    or when at most one worker is needed, the function is called for every item in the current process.
+
+    Args:
+        function: Module level function to call
+        shared: State shared by all calls
+        items: Items to call the function for
+        max_workers: Optional maximum number of worker processes, defaults to the number of CPUs
+
+    Returns:
+        Results of the calls, in the order of the items
+    """
+    global _shared
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(items))
+
+    if max_workers <= 1 or _in_process or not can_fork():
+        return [function(shared, item) for item in items]
+
+    _shared = shared
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork")) as executor:
+            futures = [executor.submit(_call_with_shared, function, item) for item in items]
+            results = [future.result() for future in futures]
+    finally:
+        _shared = None
+
+    profiler = get_profiler()
+    for _, profile_data in results:
+        if profiler is not None and profile_data is not None:
+            profiler.merge(profile_data)
+    return [result for result, _ in results]
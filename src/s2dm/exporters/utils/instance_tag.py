@@ -1,9 +1,14 @@
+import math
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
 from itertools import product
-from typing import Any, cast
+from typing import Any, cast, overload
 
 from graphql import (
     GraphQLEnumType,
     GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLList,
     GraphQLNonNull,
     GraphQLObjectType,
     GraphQLSchema,
@@ -18,6 +23,115 @@ from s2dm.exporters.utils.directive import has_given_directive
 from s2dm.exporters.utils.extraction import get_all_object_types, get_all_objects_with_directive
 from s2dm.exporters.utils.naming import apply_naming_to_instance_values, convert_name
 from s2dm.exporters.utils.naming_config import ContextType, ElementType, NamingConventionConfig, get_case_for_element
+from s2dm.exporters.utils.profiling import profiled
+from s2dm.exporters.utils.reachability import get_reachability_index, invalidate_reachability_index
+
+# Separator between the prefix and the values of the instance tag levels in an instance path
+INSTANCE_PATH_SEPARATOR = "."
+
+
+class InstancePaths(Sequence[str]):
+    """Paths of all combinations of instance tag values, computed on demand.
+
+    The paths are the Cartesian product of the values of every instance tag level, joined with
+    ``INSTANCE_PATH_SEPARATOR`` and optionally preceded by a prefix (e.g. ``Door.ROW1.DRIVERSIDE``). Only the
+    per-level values are stored, so the size does not grow with the number of combinations. Lengths, indexing and
+    membership tests are computed from the levels; iterating yields the paths in product order.
+
+    Args:
+        levels: Values of every instance tag level, from the outermost level
+        prefix: Optional name every path starts with
+    """
+
+    def __init__(self, levels: Sequence[Sequence[str]], prefix: str | None = None) -> None:
+        self.levels = levels
+        self.prefix = prefix
+        self._positions: list[dict[str, int]] | None = None
+
+    def __len__(self) -> int:
+        return math.prod(len(values) for values in self.levels)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        length = len(self)
+        if isinstance(index, slice):
+            return [self._path(position) for position in range(*index.indices(length))]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("instance path index out of range")
+        return self._path(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for combination in product(*self.levels):
+            yield self._join(combination)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self._find(path) is not None
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, InstancePaths):
+            return self.prefix == other.prefix and [list(values) for values in self.levels] == [
+                list(values) for values in other.levels
+            ]
+        if isinstance(other, list | tuple):
+            return len(self) == len(other) and all(
+                path == other_path for path, other_path in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"InstancePaths(levels={self.levels!r}, prefix={self.prefix!r})"
+
+    def index(self, value: Any, start: int = 0, stop: int | None = None) -> int:
+        position = self._find(value) if isinstance(value, str) else None
+        if position is None or position < start or (stop is not None and position >= stop):
+            raise ValueError(f"{value!r} is not an instance path")
+        return position
+
+    def count(self, value: Any) -> int:
+        return 1 if value in self else 0
+
+    def _join(self, combination: Sequence[str]) -> str:
+        path = INSTANCE_PATH_SEPARATOR.join(combination)
+        return f"{self.prefix}{INSTANCE_PATH_SEPARATOR}{path}" if self.prefix is not None else path
+
+    def _path(self, index: int) -> str:
+        combination = []
+        for values in reversed(self.levels):
+            index, value_index = divmod(index, len(values))
+            combination.append(values[value_index])
+        return self._join(combination[::-1])
+
+    def _find(self, path: str) -> int | None:
+        """Return the index of a path, or None if it is not one of the paths."""
+        if self.prefix is not None:
+            prefix = f"{self.prefix}{INSTANCE_PATH_SEPARATOR}"
+            if not path.startswith(prefix):
+                return None
+            path = path[len(prefix) :]
+
+        parts = path.split(INSTANCE_PATH_SEPARATOR)
+        if len(parts) != len(self.levels) or not self.levels:
+            return None
+
+        if self._positions is None:
+            self._positions = [{value: position for position, value in enumerate(values)} for values in self.levels]
+
+        index = 0
+        for part, values, positions in zip(parts, self.levels, self._positions, strict=True):
+            position = positions.get(part)
+            if position is None:
+                return None
+            index = index * len(values) + position
+        return index
 
 
 def is_instance_tag_field(field_name: str) -> bool:
@@ -27,8 +141,8 @@ def is_instance_tag_field(field_name: str) -> bool:
 def get_all_expanded_instance_tags(
     schema: GraphQLSchema,
     naming_config: NamingConventionConfig | None = None,
-) -> dict[GraphQLObjectType, list[str]]:
-    all_expanded_instance_tags: dict[GraphQLObjectType, list[str]] = {}
+) -> dict[GraphQLObjectType, InstancePaths]:
+    all_expanded_instance_tags: dict[GraphQLObjectType, InstancePaths] = {}
     for object in get_all_objects_with_directive(get_all_object_types(schema), "instanceTag"):
         all_expanded_instance_tags[object] = expand_instance_tag(object, naming_config)
 
@@ -37,9 +151,10 @@ def get_all_expanded_instance_tags(
     return all_expanded_instance_tags
 
 
-def expand_instance_tag(object: GraphQLObjectType, naming_config: NamingConventionConfig | None = None) -> list[str]:
+def expand_instance_tag(
+    object: GraphQLObjectType, naming_config: NamingConventionConfig | None = None
+) -> InstancePaths:
     log.debug(f"Expanding instanceTag for object: {object.name}")
-    expanded_tags = []
     if not has_given_directive(object, "instanceTag"):
         raise ValueError(f"Object '{object.name}' does not have an instance tag directive.")
     else:
@@ -57,10 +172,9 @@ def expand_instance_tag(object: GraphQLObjectType, naming_config: NamingConventi
         log.debug(f"Tags per field: {tags_per_enum_field}")
 
         # Combine tags from different enum fields
-        for combination in product(*tags_per_enum_field):
-            expanded_tags.append(".".join(combination))  # <-- Character separator can be changed HERE
+        expanded_tags = InstancePaths(tags_per_enum_field)
 
-        log.debug(f"Expanded tags: {expanded_tags}")
+        log.debug(f"Expanded tags: {len(expanded_tags)} combinations")
 
         return expanded_tags
 
@@ -239,6 +353,192 @@ def _create_intermediate_types(
     return intermediate_types
 
 
+# Maximum number of paths instance expansion may produce, or None for no limit
+_max_expanded_paths: int | None = None
+
+
+class ExpansionBudgetError(ValueError):
+    """Raised when instance expansion would produce more paths than allowed."""
+
+
+@dataclass
+class ExpansionEstimate:
+    """Size of a root type before and after instance expansion.
+
+    Attributes:
+        root: Name of the root type, the type of a field of the Query type
+        paths: Number of leaf paths below the root without expansion
+        expanded_paths: Number of leaf paths below the root after expansion, every instance counted separately
+        intermediate_types: Number of intermediate types created for the types reachable from the root
+    """
+
+    root: str
+    paths: int
+    expanded_paths: int
+    intermediate_types: int
+
+    @property
+    def factor(self) -> float:
+        """Return how many times more paths expansion produces."""
+        return self.expanded_paths / self.paths if self.paths else 1.0
+
+
+def get_max_expanded_paths() -> int | None:
+    """Return the maximum number of paths instance expansion may produce (None means no limit)."""
+    return _max_expanded_paths
+
+
+def set_max_expanded_paths(max_expanded_paths: int | None) -> None:
+    """Set the maximum number of paths instance expansion may produce. Pass None for no limit."""
+    global _max_expanded_paths
+    if max_expanded_paths is not None and max_expanded_paths < 1:
+        raise ValueError("The maximum number of expanded paths must be at least 1")
+    _max_expanded_paths = max_expanded_paths
+
+
+class _ExpansionCounter:
+    """Counts leaf paths of types with and without instance expansion, memoized per type."""
+
+    def __init__(self, schema: GraphQLSchema) -> None:
+        self.schema = schema
+        self.instance_counts: dict[str, int] = {}
+        self._paths: dict[str, tuple[int, int]] = {}
+        self._in_progress: set[str] = set()
+
+    def instance_count(self, base_type: GraphQLObjectType) -> int:
+        """Return the number of instances of an instance-tagged type, the product of its tag value counts."""
+        if base_type.name not in self.instance_counts:
+            instance_tag_object = cast(GraphQLObjectType, get_instance_tag_object(base_type, self.schema))
+            levels = get_instance_tag_dict(instance_tag_object).values()
+            self.instance_counts[base_type.name] = math.prod(len(values) for values in levels)
+        return self.instance_counts[base_type.name]
+
+    def paths(self, type_name: str) -> tuple[int, int]:
+        """Return the number of leaf paths below a type without and with expansion.
+
+        A field referencing a type that is still being counted (a cycle) is counted as a single leaf.
+        """
+        if type_name in self._paths:
+            return self._paths[type_name]
+
+        named_type = self.schema.type_map[type_name]
+        if not isinstance(named_type, GraphQLObjectType | GraphQLInterfaceType):
+            return 1, 1
+
+        self._in_progress.add(type_name)
+        paths = expanded_paths = 0
+        for field_name, field in named_type.fields.items():
+            if is_instance_tag_field(field_name):
+                continue
+            field_type = get_named_type(field.type)
+            if field_type.name in self._in_progress:
+                paths += 1
+                expanded_paths += 1
+                continue
+
+            field_paths, field_expanded_paths = self.paths(field_type.name)
+            paths += field_paths
+            if is_expandable_field(field, self.schema):
+                field_expanded_paths *= self.instance_count(cast(GraphQLObjectType, field_type))
+            expanded_paths += field_expanded_paths
+        self._in_progress.discard(type_name)
+
+        self._paths[type_name] = (paths, expanded_paths)
+        return paths, expanded_paths
+
+
+def estimate_expansion(schema: GraphQLSchema) -> list[ExpansionEstimate]:
+    """Compute how many paths and intermediate types instance expansion produces, without expanding.
+
+    The estimate is computed per root, i.e. per type of a field of the Query type, from the instance tag values of
+    the expandable fields and the types reachable from the root. Leaf paths are counted as exporters flatten the
+    schema: every scalar or enum field below the root is one path, multiplied by the number of instances of every
+    expanded field on the way.
+
+    Args:
+        schema: The GraphQL schema before instance expansion
+
+    Returns:
+        The estimates per root, in the order of the Query fields
+    """
+    query_type = schema.query_type
+    if query_type is None:
+        return []
+
+    counter = _ExpansionCounter(schema)
+    reachability = get_reachability_index(schema)
+    estimates: list[ExpansionEstimate] = []
+    roots: set[str] = set()
+    for field in query_type.fields.values():
+        root = get_named_type(field.type)
+        if root.name in roots or not isinstance(root, GraphQLObjectType | GraphQLInterfaceType):
+            continue
+        roots.add(root.name)
+
+        intermediate_types: dict[tuple[str, bool], int] = {}
+        for type_name in reachability.reachable_names(root.name):
+            object_type = schema.type_map[type_name]
+            if not isinstance(object_type, GraphQLObjectType):
+                continue
+            for expandable_field in object_type.fields.values():
+                if not is_expandable_field(expandable_field, schema):
+                    continue
+                base_type = cast(GraphQLObjectType, get_named_type(expandable_field.type))
+                instance_tag_object = cast(GraphQLObjectType, get_instance_tag_object(base_type, schema))
+                intermediate_types[(base_type.name, _is_list_item_nullable(expandable_field))] = len(
+                    instance_tag_object.fields
+                )
+
+        paths, expanded_paths = counter.paths(root.name)
+        estimates.append(
+            ExpansionEstimate(
+                root=root.name,
+                paths=paths,
+                expanded_paths=expanded_paths,
+                intermediate_types=sum(intermediate_types.values()),
+            )
+        )
+
+    return estimates
+
+
+def check_expansion_budget(schema: GraphQLSchema, max_expanded_paths: int) -> list[ExpansionEstimate]:
+    """Check that instance expansion of a schema stays within a maximum number of paths.
+
+    Args:
+        schema: The GraphQL schema before instance expansion
+        max_expanded_paths: Maximum number of paths of all roots together
+
+    Returns:
+        The estimates per root
+
+    Raises:
+        ExpansionBudgetError: If expansion would produce more paths than allowed
+    """
+    estimates = estimate_expansion(schema)
+    total = sum(estimate.expanded_paths for estimate in estimates)
+    if total > max_expanded_paths:
+        roots = ", ".join(
+            f"{estimate.root}: {estimate.expanded_paths} ({estimate.factor:.1f}x)"
+            for estimate in sorted(estimates, key=lambda estimate: estimate.expanded_paths, reverse=True)
+        )
+        raise ExpansionBudgetError(
+            f"Instance expansion would produce {total} paths, more than the maximum of {max_expanded_paths} ({roots})"
+        )
+    return estimates
+
+
+def _is_list_item_nullable(field: GraphQLField) -> bool:
+    """Return whether the items of a (list) field are nullable, ignoring the nullability of the field itself."""
+    field_type = field.type
+    if is_non_null_type(field_type):
+        field_type = cast(GraphQLNonNull[Any], field_type).of_type
+    if is_list_type(field_type):
+        field_type = cast(GraphQLList[Any], field_type).of_type
+    return not is_non_null_type(field_type)
+
+
+@profiled("expansion")
 def expand_instances_in_schema(
     schema: GraphQLSchema,
     naming_config: NamingConventionConfig | None = None,
@@ -257,6 +557,9 @@ def expand_instances_in_schema(
     Returns:
         Tuple of (modified schema, type metadata dict, field metadata dict)
     """
+    if _max_expanded_paths is not None:
+        check_expansion_budget(schema, _max_expanded_paths)
+
     log.info("Starting instance expansion in schema")
 
     expandable_fields = _collect_expandable_fields(schema)
@@ -268,11 +571,12 @@ def expand_instances_in_schema(
     type_metadata: dict[str, TypeMetadata] = {}
     field_metadata: dict[tuple[str, str], FieldMetadata] = {}
 
-    # TODO: Optimization - Cache expanded types to avoid creating duplicate intermediate types
-    # When multiple fields reference the same base type (e.g., Cabin.doors and Vehicle.doors both reference [Door]),
-    # we currently create intermediate types twice. Instead, maintain a cache:
-    # expanded_types_cache: dict[str, GraphQLObjectType] = {}  # Maps base_type.name -> first_intermediate_type
-    # Check cache before creating, reuse if exists, otherwise create once and cache.
+    # Intermediate types are built once per base type and nullability of the list items, and shared by every field
+    # of that type (e.g. Cabin.doors and Vehicle.doors both reference [Door]).
+    expanded_types: dict[tuple[str, bool], tuple[GraphQLObjectType, dict[str, list[str]]]] = {}
+
+    type_case = get_case_for_element(ElementType.TYPE, ContextType.OBJECT, naming_config) if naming_config else None
+    field_case = get_case_for_element(ElementType.FIELD, ContextType.OBJECT, naming_config) if naming_config else None
 
     for parent_type, field_name in expandable_fields:
         original_field = parent_type.fields[field_name]
@@ -284,36 +588,32 @@ def expand_instances_in_schema(
         if is_non_null_type(unwrapped_type):
             unwrapped_type = unwrapped_type.of_type
 
-        target_type = unwrapped_type.of_type if is_list_type(unwrapped_type) else unwrapped_type
-        list_item_nullable = not is_non_null_type(target_type)
-
-        instance_tag_object = cast(GraphQLObjectType, get_instance_tag_object(base_type, schema))
-        instance_tag_dict = get_instance_tag_dict(instance_tag_object)
-        instance_tag_types_to_remove.add(instance_tag_object.name)
+        list_item_nullable = _is_list_item_nullable(original_field)
 
-        intermediate_types = _create_intermediate_types(base_type, instance_tag_dict, list_item_nullable)
-        first_intermediate_type = intermediate_types[-1]
+        cache_key = (base_type.name, list_item_nullable)
+        if cache_key in expanded_types:
+            first_intermediate_type, instance_tag_dict = expanded_types[cache_key]
+            log.debug(f"Reusing intermediate types of '{base_type.name}'")
+        else:
+            instance_tag_object = cast(GraphQLObjectType, get_instance_tag_object(base_type, schema))
+            instance_tag_dict = get_instance_tag_dict(instance_tag_object)
+            instance_tag_types_to_remove.add(instance_tag_object.name)
 
-        type_case = get_case_for_element(ElementType.TYPE, ContextType.OBJECT, naming_config) if naming_config else None
-        field_case = (
-            get_case_for_element(ElementType.FIELD, ContextType.OBJECT, naming_config) if naming_config else None
-        )
+            intermediate_types = _create_intermediate_types(base_type, instance_tag_dict, list_item_nullable)
+            first_intermediate_type = intermediate_types[-1]
+            expanded_types[cache_key] = (first_intermediate_type, instance_tag_dict)
 
-        for intermediate_type in intermediate_types:
-            type_name = convert_name(intermediate_type.name, type_case) if type_case else intermediate_type.name
-            intermediate_type.name = type_name
-            new_types[type_name] = intermediate_type
-            type_metadata[type_name] = TypeMetadata(source=None, is_intermediate_type=True)
+            for intermediate_type in intermediate_types:
+                type_name = convert_name(intermediate_type.name, type_case) if type_case else intermediate_type.name
+                intermediate_type.name = type_name
+                new_types[type_name] = intermediate_type
+                type_metadata[type_name] = TypeMetadata(source=None, is_intermediate_type=True)
 
         base_name = base_type.name if is_list_type(unwrapped_type) else field_name
         new_field_name = convert_name(base_name, field_case) if field_case else base_name
 
-        resolved_names = [
-            f"{new_field_name}.{'.'.join(instance_product)}"
-            for instance_product in product(*instance_tag_dict.values())
-        ]
-
         instances = list(instance_tag_dict.values())
+        resolved_names = InstancePaths(instances, prefix=new_field_name)
 
         new_field = GraphQLField(
             type_=GraphQLNonNull(first_intermediate_type),
@@ -351,6 +651,8 @@ def expand_instances_in_schema(
     for type_name, new_type in new_types.items():
         schema.type_map[type_name] = new_type
 
+    invalidate_reachability_index(schema)
+
     log.info(f"Instance expansion complete. Created {len(new_types)} intermediate types")
 
     return schema, type_metadata, field_metadata
@@ -1,3 +1,5 @@
+import functools
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
@@ -22,6 +24,8 @@ from s2dm.exporters.utils.naming_config import (
     get_case_for_element,
     load_naming_convention_config,
 )
+from s2dm.exporters.utils.profiling import profiled
+from s2dm.exporters.utils.reachability import invalidate_reachability_index
 
 CASE_CONVERTERS = {
     CaseFormat.CAMEL_CASE: camelcase,
@@ -44,9 +48,22 @@ TYPE_CONTEXTS = {
 }
 
 
+# Maximum number of memoized name conversions. Large enough to hold every element name of a vehicle spec together
+# with the enum values of the QUDT units (about 100k names), each costing a few hundred bytes.
+NAME_CONVERSION_CACHE_SIZE = 2**17
+
+
+@functools.lru_cache(maxsize=NAME_CONVERSION_CACHE_SIZE)
+def _convert_name(name: str, target_case: CaseFormat) -> str:
+    return str(CASE_CONVERTERS[target_case](name))
+
+
 def convert_name(name: str, target_case: CaseFormat) -> str:
     """Convert a name to the specified case format.
 
+    Conversions are memoized, so converting the same name again (e.g. when applying and then checking naming
+    conventions) is a cache lookup.
+
     Args:
         name: The name to convert
         target_case: The target case format
@@ -54,9 +71,28 @@ def convert_name(name: str, target_case: CaseFormat) -> str:
     Returns:
         The converted name
     """
-    return str(CASE_CONVERTERS[target_case](name))
+    return _convert_name(name, target_case)
+
+
+def convert_names(names: Iterable[str], target_case: CaseFormat) -> list[str]:
+    """Convert several names to the specified case format in one call.
+
+    Args:
+        names: The names to convert
+        target_case: The target case format
+
+    Returns:
+        The converted names, in the order of the given names
+    """
+    return [_convert_name(name, target_case) for name in names]
 
 
+def clear_name_conversion_cache() -> None:
+    """Forget all memoized name conversions."""
+    _convert_name.cache_clear()
+
+
+@profiled("naming")
 def apply_naming_to_schema(schema: GraphQLSchema, naming_config: NamingConventionConfig) -> None:
     """Apply naming conversion to a GraphQL schema by modifying it in place.
 
@@ -88,6 +124,8 @@ def apply_naming_to_schema(schema: GraphQLSchema, naming_config: NamingConventio
         type_obj.name = new_name
         schema.type_map[new_name] = type_obj
 
+    invalidate_reachability_index(schema)
+
 
 def is_instance_tag_field(field_name: str, field: Any, schema: GraphQLSchema) -> bool:
     """Check if a field is an instanceTag field that should not be renamed.
@@ -135,26 +173,23 @@ def convert_field_names(
     target_case = get_case_for_element(ElementType.FIELD, context, naming_config)
     if target_case:
         new_fields = {}
-        for old_name, field in type_obj.fields.items():
+        for (old_name, field), new_name in zip(
+            type_obj.fields.items(), convert_names(type_obj.fields, target_case), strict=True
+        ):
             if is_instance_tag_field(old_name, field, schema):
                 new_fields[old_name] = field
             else:
-                new_name = convert_name(old_name, target_case)
                 new_fields[new_name] = field
 
         type_obj.fields.clear()
         type_obj.fields.update(new_fields)
 
     if context in (ContextType.OBJECT, ContextType.INTERFACE):
-        for field in type_obj.fields.values():
-            if field.args:
-                arg_target_case = get_case_for_element(ElementType.ARGUMENT, ContextType.FIELD, naming_config)
-                if arg_target_case:
-                    new_args = {}
-                    for old_name, arg in field.args.items():
-                        new_name = convert_name(old_name, arg_target_case)
-                        new_args[new_name] = arg
-
+        arg_target_case = get_case_for_element(ElementType.ARGUMENT, ContextType.FIELD, naming_config)
+        if arg_target_case:
+            for field in type_obj.fields.values():
+                if field.args:
+                    new_args = dict(zip(convert_names(field.args, arg_target_case), field.args.values(), strict=True))
                     field.args.clear()
                     field.args.update(new_args)
 
@@ -170,11 +205,7 @@ def convert_enum_values(type_obj: GraphQLEnumType, naming_config: NamingConventi
     if not target_case:
         return
 
-    new_values = {}
-    for old_name, enum_value in type_obj.values.items():
-        new_name = convert_name(old_name, target_case)
-        new_values[new_name] = enum_value
-
+    new_values = dict(zip(convert_names(type_obj.values, target_case), type_obj.values.values(), strict=True))
     type_obj.values.clear()
     type_obj.values.update(new_values)
 
@@ -198,7 +229,7 @@ def apply_naming_to_instance_values(
     if not target_case:
         return instance_values
 
-    return [convert_name(value, target_case) for value in instance_values]
+    return convert_names(instance_values, target_case)
 
 
 def load_naming_config(config_path: Path | None) -> NamingConventionConfig | None:
@@ -0,0 +1,62 @@
+import json
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Literal, TextIO, overload
+
+
+@overload
+def open_output(output: Path, binary: Literal[False] = False) -> AbstractContextManager[TextIO]: ...
+
+
+@overload
+def open_output(output: Path, binary: Literal[True]) -> AbstractContextManager[BinaryIO]: ...
+
+
+@contextmanager
+def open_output(output: Path, binary: bool = False) -> Iterator[Any]:
+    """Open an output file for exporters that write their result in chunks.
+
+    The chunks are written to a temporary file next to the output, which replaces the output once the block exits
+    without an error. A failing exporter thus never leaves a truncated output file behind.
+
+    Args:
+        output: Path of the output file, missing parent directories are created
+        binary: Whether to open the file in binary instead of text mode
+
+    Yields:
+        Stream to write the result to
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    partial_output = output.with_name(f".{output.name}.partial")
+    try:
+        with partial_output.open("wb" if binary else "w") as output_file:
+            yield output_file
+        os.replace(partial_output, output)
+    finally:
+        partial_output.unlink(missing_ok=True)
+
+
+def write_chunks(chunks: Iterable[str], output: TextIO) -> None:
+    """Write text chunks to a stream one at a time.
+
+    Args:
+        chunks: Text chunks, e.g. from a generator or a template stream
+        output: Stream to write the chunks to
+    """
+    for chunk in chunks:
+        output.write(chunk)
+
+
+def write_json(data: Any, output: TextIO, indent: int | None = 2) -> None:
+    """Write data as JSON to a stream without building the whole document as one string.
+
+    The output is identical to `json.dumps(data, indent=indent)`.
+
+    Args:
+        data: JSON serializable data
+        output: Stream to write the JSON to
+        indent: Indentation of nested values, None for a single line
+    """
+    write_chunks(json.JSONEncoder(indent=indent).iterencode(data), output)
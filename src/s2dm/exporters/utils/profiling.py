@@ -0,0 +1,373 @@
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Number of allocating source lines reported per stage by the memory report
+TOP_ALLOCATION_SITES = 5
+
+# Allocations made by the profiler itself are not attributed to the stages
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+@dataclass
+class AllocationSite:
+    """Memory allocated by one source line during a stage and still held at the end of it.
+
+    Attributes:
+        location: Source file and line number
+        size_bytes: Size of the memory blocks still held
+        count: Number of memory blocks still held
+    """
+
+    location: str
+    size_bytes: int
+    count: int
+
+
+@dataclass
+class StageMemory:
+    """Memory accounting of one pipeline stage.
+
+    Attributes:
+        retained_bytes: Memory allocated during the stage and still held when it finished, summed over all calls
+        peak_bytes: Largest amount of memory allocated above the level at the start of a call
+        allocation_sites: Retained memory by allocating source line, summed over all calls
+    """
+
+    retained_bytes: int = 0
+    peak_bytes: int = 0
+    allocation_sites: dict[str, AllocationSite] = field(default_factory=dict)
+
+    def add_call(self, retained_bytes: int, peak_bytes: int, sites: list[AllocationSite]) -> None:
+        """Add the memory accounting of one call of the stage."""
+        self.retained_bytes += retained_bytes
+        self.peak_bytes = max(self.peak_bytes, peak_bytes)
+        for site in sites:
+            total = self.allocation_sites.setdefault(site.location, AllocationSite(site.location, 0, 0))
+            total.size_bytes += site.size_bytes
+            total.count += site.count
+
+    def top_allocation_sites(self, limit: int = TOP_ALLOCATION_SITES) -> list[AllocationSite]:
+        """Return the source lines holding the most memory allocated during the stage."""
+        return sorted(self.allocation_sites.values(), key=lambda site: site.size_bytes, reverse=True)[:limit]
+
+
+@dataclass
+class StageStats:
+    """Accumulated cost of one pipeline stage.
+
+    Attributes:
+        calls: Number of times the stage ran
+        wall_seconds: Elapsed time spent in the stage
+        cpu_seconds: CPU time of the process spent in the stage
+        depth: Nesting depth of the stage when it first ran, 0 for top-level stages
+        memory: Memory accounting of the stage, if memory allocations are traced
+    """
+
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    depth: int = 0
+    memory: StageMemory | None = None
+
+
+@dataclass
+class ProfileData:
+    """Stages and trace events recorded by a profiler, in a form that can be sent between processes."""
+
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    trace_events: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class _MemoryFrame:
+    """Memory state at the start of a running stage."""
+
+    start_bytes: int
+    peak_bytes: int
+    snapshot: tracemalloc.Snapshot
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+def _format_location(frame: tracemalloc.Frame) -> str:
+    # The last path components identify a module without the environment-specific prefix
+    return f"{'/'.join(Path(frame.filename).parts[-3:])}:{frame.lineno}"
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+class Profiler:
+    """Records the wall time, CPU time and number of calls of the stages of a pipeline run.
+
+    Stages are named sections of code entered with `stage` (or `profile_stage` for the default profiler). A stage
+    entered again while it is already running in the same thread is counted once. Optionally, every function call
+    is profiled with cProfile; cProfile only covers the thread that started the profiler.
+
+    With memory tracing, tracemalloc snapshots are taken at the start and the end of every stage to find the memory
+    allocated and retained by it. Tracing slows every allocation down, so the timings are less accurate. Memory is
+    accounted for the whole process, so stages running concurrently in several threads are not told apart.
+    """
+
+    def __init__(self, cprofile: bool = False, memory: bool = False) -> None:
+        self.data = ProfileData()
+        self._lock = threading.Lock()
+        self._active = threading.local()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._cprofile: cProfile.Profile | None = None
+        if cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._memory = memory
+        self._started_tracemalloc = memory and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the time spent in the body of the with statement as a stage of the given name."""
+        active: list[str] = self._active.__dict__.setdefault("stages", [])
+        if name in active:
+            yield
+            return
+
+        depth = len(active)
+        active.append(name)
+        # Stages are reported in the order in which they were first entered
+        with self._lock:
+            self.data.stages.setdefault(name, StageStats(depth=depth))
+        memory_frame = self._enter_memory_frame() if self._memory else None
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            active.pop()
+            memory_call = self._exit_memory_frame(memory_frame) if memory_frame else None
+            with self._lock:
+                stats = self.data.stages.setdefault(name, StageStats(depth=depth))
+                stats.calls += 1
+                stats.wall_seconds += wall
+                stats.cpu_seconds += cpu
+                if memory_call is not None:
+                    stats.memory = stats.memory or StageMemory()
+                    stats.memory.add_call(*memory_call)
+                self.data.trace_events.append(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": start_wall * 1_000_000,
+                        "dur": wall * 1_000_000,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                    }
+                )
+
+    def _enter_memory_frame(self) -> _MemoryFrame:
+        frames: list[_MemoryFrame] = self._active.__dict__.setdefault("memory_frames", [])
+        snapshot = _take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        # The peak is reset to measure the peak of the new stage, so the running stages keep track of their own
+        for frame in frames:
+            frame.peak_bytes = max(frame.peak_bytes, peak)
+        tracemalloc.reset_peak()
+        frame = _MemoryFrame(start_bytes=current, peak_bytes=current, snapshot=snapshot)
+        frames.append(frame)
+        return frame
+
+    def _exit_memory_frame(self, frame: _MemoryFrame) -> tuple[int, int, list[AllocationSite]]:
+        frames: list[_MemoryFrame] = self._active.__dict__["memory_frames"]
+        frames.pop()
+        current, peak = tracemalloc.get_traced_memory()
+        frame.peak_bytes = max(frame.peak_bytes, peak)
+        if frames:
+            frames[-1].peak_bytes = max(frames[-1].peak_bytes, frame.peak_bytes)
+
+        differences = _take_snapshot().compare_to(frame.snapshot, "lineno")
+        sites = [
+            AllocationSite(_format_location(difference.traceback[0]), difference.size_diff, difference.count_diff)
+            for difference in differences[:TOP_ALLOCATION_SITES]
+            if difference.size_diff > 0
+        ]
+        return current - frame.start_bytes, frame.peak_bytes - frame.start_bytes, sites
+
+    def take(self) -> ProfileData:
+        """Return the data recorded so far and start recording from scratch."""
+        with self._lock:
+            data, self.data = self.data, ProfileData()
+        return data
+
+    def merge(self, data: ProfileData) -> None:
+        """Add data recorded by another profiler, e.g. in a worker process."""
+        with self._lock:
+            for name, other in data.stages.items():
+                stats = self.data.stages.setdefault(name, StageStats(depth=other.depth))
+                stats.calls += other.calls
+                stats.wall_seconds += other.wall_seconds
+                stats.cpu_seconds += other.cpu_seconds
+                if other.memory is not None:
+                    stats.memory = stats.memory or StageMemory()
+                    stats.memory.add_call(
+                        other.memory.retained_bytes,
+                        other.memory.peak_bytes,
+                        list(other.memory.allocation_sites.values()),
+                    )
+            self.data.trace_events.extend(data.trace_events)
+
+    def start_worker(self) -> None:
+        """Forget the state inherited by a forked worker process, so that the profiler only records its own stages.
+
+        Function calls are not profiled in worker processes.
+        """
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile = None
+        self._active = threading.local()
+        self._lock = threading.Lock()
+        self.take()
+
+    def format_report(self) -> str:
+        """Return a table of the recorded stages, followed by the totals since the profiler was created."""
+        rows = [f"{'Stage':<32}{'Calls':>8}{'Wall (s)':>12}{'CPU (s)':>12}"]
+        for name, stats in self.data.stages.items():
+            label = "  " * stats.depth + name
+            rows.append(f"{label:<32}{stats.calls:>8}{stats.wall_seconds:>12.3f}{stats.cpu_seconds:>12.3f}")
+        total_wall = time.perf_counter() - self._start_wall
+        total_cpu = time.process_time() - self._start_cpu
+        rows.append(f"{'Total':<32}{'':>8}{total_wall:>12.3f}{total_cpu:>12.3f}")
+        return "\n".join(rows)
+
+    def format_memory_report(self) -> str:
+        """Return the retained and peak memory of every recorded stage, each followed by its top allocation sites."""
+        rows = [f"{'Stage':<56}{'Retained':>12}{'Peak':>16}"]
+        for name, stats in self.data.stages.items():
+            if stats.memory is None:
+                continue
+            label = "  " * stats.depth + name
+            retained = _format_bytes(stats.memory.retained_bytes)
+            rows.append(f"{label:<56}{retained:>12}{_format_bytes(stats.memory.peak_bytes):>16}")
+            for site in stats.memory.top_allocation_sites():
+                site_label = "  " * (stats.depth + 2) + site.location
+                rows.append(f"{site_label:<56}{_format_bytes(site.size_bytes):>12}{f'{site.count} blocks':>16}")
+        if tracemalloc.is_tracing():
+            current, _ = tracemalloc.get_traced_memory()
+            rows.append(f"{'Held at exit':<56}{_format_bytes(current):>12}")
+        return "\n".join(rows)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the recorded stages as JSON-serializable data, e.g. for tracking them over time in CI."""
+        stages = []
+        for name, stats in self.data.stages.items():
+            stage: dict[str, Any] = {
+                "name": name,
+                "depth": stats.depth,
+                "calls": stats.calls,
+                "wall_seconds": stats.wall_seconds,
+                "cpu_seconds": stats.cpu_seconds,
+            }
+            if stats.memory is not None:
+                stage["retained_bytes"] = stats.memory.retained_bytes
+                stage["peak_bytes"] = stats.memory.peak_bytes
+                stage["top_allocation_sites"] = [
+                    {"location": site.location, "size_bytes": site.size_bytes, "count": site.count}
+                    for site in stats.memory.top_allocation_sites()
+                ]
+            stages.append(stage)
+        return {"stages": stages}
+
+    def write_json(self, path: Path) -> None:
+        """Write the recorded stages as JSON, see `to_dict`."""
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def close(self) -> None:
+        """Stop profiling function calls and tracing memory allocations."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._memory = False
+
+    def write_trace(self, path: Path) -> None:
+        """Write the recorded stages as a Chrome trace, viewable in chrome://tracing or Perfetto."""
+        path.write_text(json.dumps({"traceEvents": self.data.trace_events, "displayTimeUnit": "ms"}))
+
+    def write_cprofile_stats(self, path: Path) -> None:
+        """Write the cProfile statistics of the profiled function calls, readable with pstats or snakeviz.
+
+        Raises:
+            ValueError: If the profiler was created without cProfile
+        """
+        if self._cprofile is None:
+            raise ValueError("Function calls were not profiled")
+        self._cprofile.disable()
+        self._cprofile.dump_stats(path)
+
+
+_profiler: Profiler | None = None
+
+
+def get_profiler() -> Profiler | None:
+    """Return the profiler recording the current run, or None if profiling is disabled."""
+    return _profiler
+
+
+def set_profiler(profiler: Profiler | None) -> None:
+    """Set the profiler recording the current run. Pass None to disable profiling."""
+    global _profiler
+    _profiler = profiler
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    """Record the body of the with statement as a stage of the current profiler, if profiling is enabled."""
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(name):
+        yield
+
+
+def profiled(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a function to record every call of it as a stage of the current profiler."""
+
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _profiler is None:
+                return function(*args, **kwargs)
+            with _profiler.stage(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
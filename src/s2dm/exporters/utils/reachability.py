@@ -0,0 +1,203 @@
+from typing import cast
+from weakref import WeakKeyDictionary
+
+from graphql import (
+    GraphQLInputObjectType,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLType,
+    GraphQLUnionType,
+    get_named_type,
+)
+
+from s2dm.exporters.utils.directive import has_given_directive
+from s2dm.exporters.utils.graphql_type import is_introspection_or_root_type
+
+
+def _get_referenced_type_names(named_type: GraphQLNamedType, include_instance_tag_fields: bool) -> list[str]:
+    """Return the names of the types a named type refers to directly."""
+    if isinstance(named_type, GraphQLObjectType):
+        if has_given_directive(named_type, "instanceTag") and not include_instance_tag_fields:
+            return []
+        return [get_named_type(field.type).name for field in named_type.fields.values()] + [
+            interface.name for interface in named_type.interfaces
+        ]
+    if isinstance(named_type, GraphQLInterfaceType | GraphQLInputObjectType):
+        return [get_named_type(field.type).name for field in named_type.fields.values()]
+    if isinstance(named_type, GraphQLUnionType):
+        return [member.name for member in named_type.types]
+    # Scalar and enum types don't reference other types
+    return []
+
+
+class ReachabilityIndex:
+    """Answers which types of a schema are reachable from a given type.
+
+    The type reference graph of the schema is condensed into its strongly connected components once. All types of
+    a component reach the same types, so the transitive closure is computed and memoized per component on the
+    condensed graph, which has no cycles. Introspection and root types are not part of the graph.
+
+    The index reflects the schema at the time it was built. Use `get_reachability_index` to get an index that is
+    rebuilt after the schema has been modified.
+    """
+
+    def __init__(self, schema: GraphQLSchema, include_instance_tag_fields: bool = False) -> None:
+        """Build the index for a schema.
+
+        Args:
+            schema: The GraphQL schema
+            include_instance_tag_fields: Whether to follow the fields of @instanceTag types
+        """
+        self.schema = schema
+        self.type_count = len(schema.type_map)
+
+        edges = {
+            name: [
+                referenced_name
+                for referenced_name in _get_referenced_type_names(named_type, include_instance_tag_fields)
+                if referenced_name in schema.type_map and not is_introspection_or_root_type(referenced_name)
+            ]
+            for name, named_type in schema.type_map.items()
+            if not is_introspection_or_root_type(name)
+        }
+
+        self._component_of: dict[str, int] = {}
+        self._members: list[list[str]] = []
+        self._find_components(edges)
+
+        self._successors: list[set[int]] = [set() for _ in self._members]
+        for name, referenced_names in edges.items():
+            component = self._component_of[name]
+            for referenced_name in referenced_names:
+                referenced_component = self._component_of[referenced_name]
+                if referenced_component != component:
+                    self._successors[component].add(referenced_component)
+
+        self._closures: dict[int, frozenset[str]] = {}
+
+    def _find_components(self, edges: dict[str, list[str]]) -> None:
+        """Find the strongly connected components of the type graph with an iterative Tarjan's algorithm."""
+        index_of: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+
+        for start in edges:
+            if start in index_of:
+                continue
+
+            index_of[start] = lowlink[start] = len(index_of)
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(edges[start]))]
+
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if successor not in index_of:
+                        index_of[successor] = lowlink[successor] = len(index_of)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(edges[successor])))
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index_of[node]:
+                        component = len(self._members)
+                        members: list[str] = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            self._component_of[member] = component
+                            members.append(member)
+                            if member == node:
+                                break
+                        self._members.append(members)
+
+    def _closure(self, component: int) -> frozenset[str]:
+        """Return the names of all types reachable from a component, computing missing closures bottom-up."""
+        pending = [component]
+        while pending:
+            current = pending[-1]
+            if current in self._closures:
+                pending.pop()
+                continue
+
+            missing = [successor for successor in self._successors[current] if successor not in self._closures]
+            if missing:
+                pending.extend(missing)
+                continue
+
+            closure = set(self._members[current])
+            for successor in self._successors[current]:
+                closure.update(self._closures[successor])
+            self._closures[current] = frozenset(closure)
+            pending.pop()
+
+        return self._closures[component]
+
+    def reachable_names(self, type_name: str) -> frozenset[str]:
+        """Return the names of all types reachable from a type, including the type itself.
+
+        Args:
+            type_name: Name of the type to start from
+
+        Returns:
+            Names of the reachable types, empty for unknown, introspection and root types
+        """
+        component = self._component_of.get(type_name)
+        if component is None:
+            return frozenset()
+        return self._closure(component)
+
+    def reachable_types(self, type_name: str) -> set[GraphQLType]:
+        """Return all types reachable from a type, including the type itself.
+
+        Args:
+            type_name: Name of the type to start from
+
+        Returns:
+            The reachable GraphQL types, empty for unknown, introspection and root types
+        """
+        return {cast(GraphQLType, self.schema.type_map[name]) for name in self.reachable_names(type_name)}
+
+
+_indexes: WeakKeyDictionary[GraphQLSchema, dict[bool, ReachabilityIndex]] = WeakKeyDictionary()
+
+
+def get_reachability_index(schema: GraphQLSchema, include_instance_tag_fields: bool = False) -> ReachabilityIndex:
+    """Return the reachability index of a schema, building it on first use.
+
+    The index is kept for as long as the schema exists. It is rebuilt when types were added to or removed from the
+    schema, or after `invalidate_reachability_index` was called for the schema.
+
+    Args:
+        schema: The GraphQL schema
+        include_instance_tag_fields: Whether to follow the fields of @instanceTag types
+
+    Returns:
+        The reachability index of the schema
+    """
+    schema_indexes = _indexes.setdefault(schema, {})
+    index = schema_indexes.get(include_instance_tag_fields)
+    if index is None or index.type_count != len(schema.type_map):
+        index = ReachabilityIndex(schema, include_instance_tag_fields)
+        schema_indexes[include_instance_tag_fields] = index
+    return index
+
+
+def invalidate_reachability_index(schema: GraphQLSchema) -> None:
+    """Drop the reachability indexes of a schema after it has been modified in place.
+
+    Args:
+        schema: The modified GraphQL schema
+    """
+    _indexes.pop(schema, None)
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import graphql
+from graphql import DocumentNode
+
+from s2dm import __version__, log
+
+CACHE_FORMAT_VERSION = "2"
+CACHE_FILE_SUFFIX = ".pickle"
+
+# Documents kept in memory at most, enough for the files of several large specs
+DEFAULT_MAX_MEMORY_DOCUMENTS = 4096
+
+
+class SchemaCache:
+    """Content-addressed cache of parsed GraphQL schema files.
+
+    Every schema file is parsed into its own document, which is stored under a hash of the file content.
+    Editing one file of a large spec therefore only requires parsing that file again. Documents are kept
+    in memory and, if a cache directory is given, also on disk so that they can be reused by later runs.
+    The key also covers the s2dm and graphql-core versions, which invalidates all entries on upgrades.
+
+    The cache lives as long as the process in watch and server mode, so the documents kept in memory are
+    limited: a document is dropped once the file it was read from changes, and the least recently used
+    documents are dropped beyond `max_memory_documents`.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_memory_documents: int = DEFAULT_MAX_MEMORY_DOCUMENTS) -> None:
+        self.cache_dir = cache_dir
+        self.max_memory_documents = max_memory_documents
+        self._documents: OrderedDict[str, DocumentNode] = OrderedDict()
+        # Key of the latest content of every file, to drop the documents of superseded content
+        self._file_keys: dict[Path, str] = {}
+        # Schema files are loaded by a thread pool
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def compute_key(content: bytes) -> str:
+        """Compute the cache key for the content of a schema file.
+
+        Args:
+            content: Raw content of the schema file
+
+        Returns:
+            Hex digest identifying the content
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}:{__version__}:{graphql.__version__}\0".encode())
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}{CACHE_FILE_SUFFIX}"
+
+    def _remember(self, key: str, document: DocumentNode, path: Path | None) -> None:
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+
+            if path is not None:
+                previous_key = self._file_keys.get(path)
+                self._file_keys[path] = key
+                if previous_key is not None and previous_key != key and previous_key not in self._file_keys.values():
+                    self._documents.pop(previous_key, None)
+
+            while len(self._documents) > self.max_memory_documents:
+                self._documents.popitem(last=False)
+
+    def get(self, key: str, path: Path | None = None) -> DocumentNode | None:
+        """Return the cached document for the given key, or None on a miss or an unreadable entry.
+
+        Args:
+            key: Key of the file content, see `compute_key`
+            path: Optional file the content was read from, whose earlier content is then dropped from memory
+        """
+        document = self._documents.get(key)
+        if document is not None:
+            self._remember(key, document, path)
+            return document
+
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return None
+
+        try:
+            with entry_path.open("rb") as entry_file:
+                document = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            log.debug(f"Ignoring unreadable schema cache entry {entry_path}: {e}")
+            return None
+
+        if not isinstance(document, DocumentNode):
+            log.debug(f"Ignoring schema cache entry with unexpected content: {entry_path}")
+            return None
+
+        self._remember(key, document, path)
+        return document
+
+    def put(self, key: str, document: DocumentNode, path: Path | None = None) -> None:
+        """Store a document under the given key.
+
+        On disk, the document is written to a temporary file first and then moved into place, so concurrent
+        readers never see a partially written entry. Failures to write are logged and ignored.
+
+        Args:
+            key: Key of the file content, see `compute_key`
+            document: Document parsed from the content
+            path: Optional file the content was read from, whose earlier content is then dropped from memory
+        """
+        self._remember(key, document, path)
+
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return
+
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=entry_path.parent, suffix=".tmp", delete=False) as temp_file:
+                pickle.dump(document, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+                temp_path = Path(temp_file.name)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            log.debug(f"Could not write schema cache entry {key}: {e}")
+
+
+_default_schema_cache: SchemaCache | None = None
+
+
+def get_default_schema_cache() -> SchemaCache | None:
+    """Return the schema cache used by the schema loader, if any."""
+    return _default_schema_cache
+
+
+def set_default_schema_cache(cache: SchemaCache | None) -> None:
+    """Set the schema cache used by the schema loader. Pass None to disable caching."""
+    global _default_schema_cache
+    _default_schema_cache = cache
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from s2dm import log
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_MAX_SIZE_MB = 10
+DEFAULT_TIMEOUT_SECONDS = 30
+DEFAULT_FETCH_WORKERS = 8
+CHUNK_SIZE = 64 * 1024
+METADATA_FILE_NAME = "metadata.json"
+
+
+class SchemaFetcher:
+    """Downloads schema files from HTTP(S) URLs.
+
+    All downloads share one session, so connections to the same host are pooled and reused. The session is created
+    on the first download, so that commands without schema URLs do not import requests. Responses are streamed to
+    disk in chunks and aborted as soon as they exceed the size limit.
+
+    If a cache directory is given, every URL gets its own entry there holding the last downloaded file together
+    with its ETag and Last-Modified headers. Later downloads of the URL send these as conditional request headers,
+    and on a "304 Not Modified" response the cached file is used without downloading it again.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_size_mb: int = DEFAULT_MAX_SIZE_MB,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_size_mb = max_size_mb
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._session: requests.Session | None = None
+
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP session shared by all downloads, created on first use."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _entry_dir(self, url: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / hashlib.sha256(url.encode()).hexdigest()
+
+    @staticmethod
+    def _file_name(url: str) -> str:
+        """Name the downloaded file after the URL, which is the source shown in @reference directives."""
+        name = Path(urlparse(url).path).name
+        return name if name.endswith((".graphql", ".gql")) else "schema.graphql"
+
+    @staticmethod
+    def _read_metadata(entry_dir: Path) -> dict[str, str]:
+        try:
+            metadata = json.loads((entry_dir / METADATA_FILE_NAME).read_text())
+        except (OSError, ValueError):
+            return {}
+        return metadata if isinstance(metadata, dict) else {}
+
+    def fetch(self, url: str) -> Path:
+        """Download a schema file, or revalidate its cached copy.
+
+        Args:
+            url: Schema URL to download
+
+        Returns:
+            Path to the downloaded or cached schema file
+
+        Raises:
+            RuntimeError: If the download fails or the file exceeds the size limit
+        """
+        import requests
+
+        entry_dir = self._entry_dir(url)
+        headers: dict[str, str] = {}
+        cached_file: Path | None = None
+
+        if entry_dir is not None:
+            metadata = self._read_metadata(entry_dir)
+            cached_file = entry_dir / metadata.get("file_name", self._file_name(url))
+            if cached_file.is_file():
+                if "etag" in metadata:
+                    headers["If-None-Match"] = metadata["etag"]
+                if "last_modified" in metadata:
+                    headers["If-Modified-Since"] = metadata["last_modified"]
+            else:
+                cached_file = None
+
+        try:
+            log.info(f"Downloading schema from {url}")
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code == requests.codes.not_modified and cached_file is not None:
+                    log.debug(f"Schema at {url} is not modified, using cached file: {cached_file}")
+                    return cached_file
+
+                response.raise_for_status()
+                target_dir = entry_dir if entry_dir is not None else Path(tempfile.mkdtemp(prefix="s2dm-schema-"))
+                target_file = target_dir / self._file_name(url)
+                self._download(response, target_file)
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to download schema from {url}: {e}") from e
+
+        if entry_dir is not None:
+            metadata = {"url": url, "file_name": target_file.name}
+            if "ETag" in response.headers:
+                metadata["etag"] = response.headers["ETag"]
+            if "Last-Modified" in response.headers:
+                metadata["last_modified"] = response.headers["Last-Modified"]
+            (entry_dir / METADATA_FILE_NAME).write_text(json.dumps(metadata, indent=2))
+
+        log.debug(f"Schema downloaded to: {target_file}")
+        return target_file
+
+    def _download(self, response: "requests.Response", target_file: Path) -> None:
+        """Stream a response body into a file, enforcing the size limit while streaming."""
+        max_size_bytes = self.max_size_mb * 1024 * 1024
+
+        content_length = response.headers.get("content-length")
+        if content_length and int(content_length) > max_size_bytes:
+            raise RuntimeError(
+                f"Schema file too large: {int(content_length) / 1024 / 1024:.1f} MB (max {self.max_size_mb} MB)"
+            )
+
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=target_file.parent, suffix=".tmp", delete=False) as temp_file:
+            temp_path = Path(temp_file.name)
+            try:
+                size = 0
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size_bytes:
+                        raise RuntimeError(f"Schema file too large: more than {self.max_size_mb} MB")
+                    temp_file.write(chunk)
+            except BaseException:
+                temp_file.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+        os.replace(temp_path, target_file)
+
+    def fetch_all(self, urls: list[str]) -> list[Path]:
+        """Download several schema files concurrently.
+
+        Args:
+            urls: Schema URLs to download
+
+        Returns:
+            Paths to the downloaded or cached schema files, in the order of the URLs
+
+        Raises:
+            RuntimeError: If any of the downloads fails
+        """
+        if len(urls) <= 1:
+            return [self.fetch(url) for url in urls]
+
+        # Create the session before the worker threads share it
+        _ = self.session
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            return list(executor.map(self.fetch, urls))
+
+
+_default_schema_fetcher: SchemaFetcher | None = None
+
+
+def get_default_schema_fetcher() -> SchemaFetcher:
+    """Return the schema fetcher used for schema URLs, creating one without a cache if none was set."""
+    global _default_schema_fetcher
+    if _default_schema_fetcher is None:
+        _default_schema_fetcher = SchemaFetcher()
+    return _default_schema_fetcher
+
+
+def set_default_schema_fetcher(fetcher: SchemaFetcher | None) -> None:
+    """Set the schema fetcher used for schema URLs. Pass None to fall back to one without a cache."""
+    global _default_schema_fetcher
+    _default_schema_fetcher = fetcher
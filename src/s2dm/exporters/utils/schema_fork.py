@@ -0,0 +1,182 @@
+from typing import cast
+
+from graphql import (
+    GraphQLArgument,
+    GraphQLDirective,
+    GraphQLEnumType,
+    GraphQLField,
+    GraphQLInputField,
+    GraphQLInputObjectType,
+    GraphQLInputType,
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLNonNull,
+    GraphQLNullableType,
+    GraphQLObjectType,
+    GraphQLOutputType,
+    GraphQLScalarType,
+    GraphQLSchema,
+    GraphQLType,
+    GraphQLUnionType,
+    is_introspection_type,
+    is_specified_directive,
+    is_specified_scalar_type,
+)
+
+from s2dm.exporters.utils.profiling import profiled
+
+
+class _SchemaForker:
+    """Creates the forked named types, fields and arguments of a single schema fork."""
+
+    def __init__(self, schema: GraphQLSchema) -> None:
+        self.schema = schema
+        self.types: dict[str, GraphQLNamedType] = {}
+
+    def fork_type_reference(self, type_: GraphQLType) -> GraphQLType:
+        if isinstance(type_, GraphQLNonNull):
+            return GraphQLNonNull(cast(GraphQLNullableType, self.fork_type_reference(type_.of_type)))
+        if isinstance(type_, GraphQLList):
+            return GraphQLList(self.fork_type_reference(type_.of_type))
+        named_type = cast(GraphQLNamedType, type_)
+        return self.types.get(named_type.name, named_type)
+
+    def fork_arguments(self, args: dict[str, GraphQLArgument]) -> dict[str, GraphQLArgument]:
+        forked_args = {}
+        for name, arg in args.items():
+            kwargs = arg.to_kwargs()
+            kwargs["type_"] = cast(GraphQLInputType, self.fork_type_reference(arg.type))
+            forked_args[name] = GraphQLArgument(**kwargs)
+        return forked_args
+
+    def fork_fields(self, fields: dict[str, GraphQLField]) -> dict[str, GraphQLField]:
+        forked_fields = {}
+        for name, field in fields.items():
+            kwargs = field.to_kwargs()
+            kwargs["type_"] = cast(GraphQLOutputType, self.fork_type_reference(field.type))
+            kwargs["args"] = self.fork_arguments(field.args)
+            forked_fields[name] = GraphQLField(**kwargs)
+        return forked_fields
+
+    def fork_input_fields(self, fields: dict[str, GraphQLInputField]) -> dict[str, GraphQLInputField]:
+        forked_fields = {}
+        for name, field in fields.items():
+            kwargs = field.to_kwargs()
+            kwargs["type_"] = cast(GraphQLInputType, self.fork_type_reference(field.type))
+            forked_fields[name] = GraphQLInputField(**kwargs)
+        return forked_fields
+
+    def fork_interfaces(self, interfaces: tuple[GraphQLInterfaceType, ...]) -> list[GraphQLInterfaceType]:
+        return [cast(GraphQLInterfaceType, self.fork_type_reference(interface)) for interface in interfaces]
+
+    def fork_named_type(self, named_type: GraphQLNamedType) -> GraphQLNamedType:
+        # Fields, interfaces and union members are passed as thunks, so that they can refer to forked types that
+        # are created after this one.
+        if isinstance(named_type, GraphQLObjectType):
+            object_type = named_type
+            return GraphQLObjectType(
+                name=object_type.name,
+                fields=lambda: self.fork_fields(object_type.fields),
+                interfaces=lambda: self.fork_interfaces(object_type.interfaces),
+                is_type_of=object_type.is_type_of,
+                extensions=object_type.extensions,
+                description=object_type.description,
+                ast_node=object_type.ast_node,
+                extension_ast_nodes=object_type.extension_ast_nodes,
+            )
+        if isinstance(named_type, GraphQLInterfaceType):
+            interface_type = named_type
+            return GraphQLInterfaceType(
+                name=interface_type.name,
+                fields=lambda: self.fork_fields(interface_type.fields),
+                interfaces=lambda: self.fork_interfaces(interface_type.interfaces),
+                resolve_type=interface_type.resolve_type,
+                description=interface_type.description,
+                extensions=interface_type.extensions,
+                ast_node=interface_type.ast_node,
+                extension_ast_nodes=interface_type.extension_ast_nodes,
+            )
+        if isinstance(named_type, GraphQLUnionType):
+            union_type = named_type
+            return GraphQLUnionType(
+                name=union_type.name,
+                types=lambda: [
+                    cast(GraphQLObjectType, self.fork_type_reference(member)) for member in union_type.types
+                ],
+                resolve_type=union_type.resolve_type,
+                description=union_type.description,
+                extensions=union_type.extensions,
+                ast_node=union_type.ast_node,
+                extension_ast_nodes=union_type.extension_ast_nodes,
+            )
+        if isinstance(named_type, GraphQLInputObjectType):
+            input_type = named_type
+            return GraphQLInputObjectType(
+                name=input_type.name,
+                fields=lambda: self.fork_input_fields(input_type.fields),
+                description=input_type.description,
+                out_type=input_type.out_type,
+                extensions=input_type.extensions,
+                ast_node=input_type.ast_node,
+                extension_ast_nodes=input_type.extension_ast_nodes,
+            )
+        if isinstance(named_type, GraphQLEnumType | GraphQLScalarType):
+            # Enum values are not modified by the schema transformations, only the mapping holding them is.
+            return named_type.__copy__()
+        raise TypeError(f"Unexpected named type: {named_type!r}")
+
+    def fork_directive(self, directive: GraphQLDirective) -> GraphQLDirective:
+        if is_specified_directive(directive):
+            return directive
+        kwargs = directive.to_kwargs()
+        kwargs["args"] = self.fork_arguments(directive.args)
+        return GraphQLDirective(**kwargs)
+
+    def fork(self) -> GraphQLSchema:
+        for name, named_type in self.schema.type_map.items():
+            if is_introspection_type(named_type) or is_specified_scalar_type(named_type):
+                continue
+            self.types[name] = self.fork_named_type(named_type)
+
+        def fork_root_type(root_type: GraphQLObjectType | None) -> GraphQLObjectType | None:
+            return cast(GraphQLObjectType, self.types[root_type.name]) if root_type else None
+
+        forked_schema = GraphQLSchema(
+            query=fork_root_type(self.schema.query_type),
+            mutation=fork_root_type(self.schema.mutation_type),
+            subscription=fork_root_type(self.schema.subscription_type),
+            types=list(self.types.values()),
+            directives=[self.fork_directive(directive) for directive in self.schema.directives],
+            description=self.schema.description,
+            extensions=self.schema.extensions,
+            ast_node=self.schema.ast_node,
+            extension_ast_nodes=self.schema.extension_ast_nodes,
+        )
+
+        # Keep the type order of the original schema, which determines the order of printed schemas
+        forked_schema.type_map = {
+            name: forked_schema.type_map[name] for name in self.schema.type_map if name in forked_schema.type_map
+        } | forked_schema.type_map
+        return forked_schema
+
+
+@profiled("fork")
+def fork_schema(schema: GraphQLSchema) -> GraphQLSchema:
+    """Create a copy of a schema that can be modified without affecting the original schema.
+
+    The schema transformations (query pruning, naming conversion and instance expansion) modify the named types,
+    field mappings and type map of a schema in place. A fork gets its own named types, fields, arguments and
+    directives, so all of these can be changed freely. Everything the transformations never modify, such as the
+    AST nodes, descriptions, enum values and built-in types, is shared with the original schema.
+
+    Forking does not parse or validate the schema again, which makes it much cheaper than building a new schema
+    from the schema files. Many variants can thus be derived from one parsed base schema.
+
+    Args:
+        schema: The schema to fork
+
+    Returns:
+        A new schema with the same types and directives as the given schema
+    """
+    return _SchemaForker(schema).fork()
@@ -1,34 +1,34 @@
-import re
+import io
+import logging
+import os
+import sys
 import tempfile
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, cast
+from typing import TextIO, cast
 from urllib.parse import urlparse
 
-import requests
-from ariadne import load_schema_from_path
 from graphql import (
     DocumentNode,
     GraphQLEnumType,
     GraphQLField,
     GraphQLInputObjectType,
     GraphQLInterfaceType,
-    GraphQLList,
     GraphQLNamedType,
-    GraphQLNonNull,
     GraphQLObjectType,
     GraphQLSchema,
     GraphQLString,
+    GraphQLSyntaxError,
     GraphQLType,
-    GraphQLUnionType,
     Undefined,
+    build_ast_schema,
     build_schema,
     get_named_type,
     is_input_object_type,
     is_interface_type,
-    is_list_type,
-    is_non_null_type,
     is_object_type,
-    is_union_type,
     parse,
     print_schema,
     validate_schema,
@@ -41,6 +41,7 @@ from graphql.language.ast import (
     InlineFragmentNode,
     OperationDefinitionNode,
     SelectionSetNode,
+    TypeDefinitionNode,
 )
 
 from s2dm import log
@@ -50,16 +51,26 @@ from s2dm.exporters.utils.annotated_schema import (
     TypeMetadata,
 )
 from s2dm.exporters.utils.directive import (
-    GRAPHQL_TYPE_DEFINITION_PATTERN,
-    add_directives_to_schema,
     build_directive_map,
     get_type_directive_location,
-    has_given_directive,
 )
+from s2dm.exporters.utils.extraction import get_all_named_types
+from s2dm.exporters.utils.file_watcher import FileState, get_file_state
 from s2dm.exporters.utils.graphql_type import is_introspection_or_root_type
 from s2dm.exporters.utils.instance_tag import expand_instances_in_schema
 from s2dm.exporters.utils.naming import apply_naming_to_schema, convert_name, load_naming_config
 from s2dm.exporters.utils.naming_config import ContextType, ElementType, NamingConventionConfig, get_case_for_element
+from s2dm.exporters.utils.profiling import profiled
+from s2dm.exporters.utils.reachability import get_reachability_index, invalidate_reachability_index
+from s2dm.exporters.utils.schema_cache import SchemaCache, get_default_schema_cache
+from s2dm.exporters.utils.schema_fetch import SchemaFetcher
+from s2dm.exporters.utils.schema_fork import fork_schema
+from s2dm.exporters.utils.sdl_printer import write_schema_sdl
+
+GRAPHQL_FILE_EXTENSIONS = (".graphql", ".graphqls", ".gql")
+DEFAULT_MAX_INGEST_WORKERS = 8
+
+_ingest_workers: int | None = None
 
 
 def is_url(value: str) -> bool:
@@ -91,37 +102,7 @@ def download_schema_to_temp(url: str, max_size_mb: int = 10) -> Path:
     Raises:
         RuntimeError: If download fails or file exceeds size limit
     """
-    max_size_bytes = max_size_mb * 1024 * 1024
-
-    try:
-        log.info(f"Downloading schema from {url}")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        content_length = response.headers.get("content-length")
-        if content_length and int(content_length) > max_size_bytes:
-            raise RuntimeError(
-                f"Schema file too large: {int(content_length) / 1024 / 1024:.1f} MB (max {max_size_mb} MB)"
-            )
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".graphql", delete=False, encoding="utf-8") as temp_file:
-            temp_file.write(response.text)
-            temp_file.flush()
-            temp_path = Path(temp_file.name)
-
-        log.debug(f"Schema downloaded to temporary file: {temp_path}")
-        return temp_path
-
-    except requests.RequestException as e:
-        raise RuntimeError(f"Failed to download schema from {url}: {e}") from e
-
-
-def _extract_type_names_from_content(content: str) -> list[str]:
-    """Extract type names from GraphQL schema content."""
-    type_names: list[str] = []
-    matches = re.finditer(GRAPHQL_TYPE_DEFINITION_PATTERN, content, re.MULTILINE)
-    type_names.extend(match.group(2) for match in matches)
-    return type_names
+    return SchemaFetcher(max_size_mb=max_size_mb).fetch(url)
 
 
 def resolve_graphql_files(paths: list[Path]) -> list[Path]:
@@ -142,28 +123,180 @@ def resolve_graphql_files(paths: list[Path]) -> list[Path]:
             for file in path.rglob("*.graphql"):
                 resolved_files.add(file)
 
-    return list(resolved_files)
+    return sorted(resolved_files)
 
 
-def build_schema_str_with_optional_source_map(
-    graphql_schema_paths: list[Path], with_source_map: bool, naming_config: NamingConventionConfig | None = None
-) -> tuple[str, dict[str, str]]:
-    """Build a GraphQL schema from a file or folder, returning also a source map."""
-    schema_str = ""
+def _expand_schema_paths(graphql_schema_paths: list[Path]) -> list[Path]:
+    """Replace directories by the GraphQL files they contain (recursively, sorted), keeping the order of the paths."""
+    expanded_paths: list[Path] = []
+    for path in graphql_schema_paths:
+        if path.is_dir():
+            expanded_paths.extend(
+                sorted(
+                    file
+                    for file in path.rglob("*")
+                    if file.suffix.lower() in GRAPHQL_FILE_EXTENSIONS and file.is_file()
+                )
+            )
+        else:
+            expanded_paths.append(path)
+    return expanded_paths
+
+
+def _load_schema_file(graphql_file: Path, cache: SchemaCache | None) -> tuple[str, DocumentNode]:
+    """Read a GraphQL schema file and parse it into its own document.
+
+    Args:
+        graphql_file: GraphQL schema file
+        cache: Optional cache of parsed documents keyed by file content
+
+    Returns:
+        Tuple of (file content, parsed document)
+
+    Raises:
+        GraphQLFileSyntaxError: If the file is not valid GraphQL SDL
+    """
+    content = graphql_file.read_text(encoding="utf-8")
+
+    cache_key = None
+    if cache is not None:
+        cache_key = SchemaCache.compute_key(content.encode("utf-8"))
+        cached_document = cache.get(cache_key, graphql_file)
+        if cached_document is not None:
+            return content, cached_document
+
+    try:
+        document = parse(content, no_location=True)
+    except GraphQLSyntaxError as e:
+        # Imported only on errors, as importing ariadne is slow
+        from ariadne.exceptions import GraphQLFileSyntaxError
+
+        raise GraphQLFileSyntaxError(graphql_file, str(e)) from e
+
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, document, graphql_file)
+
+    return content, document
+
+
+def get_ingest_workers() -> int | None:
+    """Return the number of threads used to read and parse schema files (None means an automatic choice)."""
+    return _ingest_workers
+
+
+def set_ingest_workers(max_workers: int | None) -> None:
+    """Set the number of threads used to read and parse schema files. Pass None for an automatic choice."""
+    global _ingest_workers
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("The number of ingest workers must be at least 1")
+    _ingest_workers = max_workers
+
+
+def _load_schema_files(
+    graphql_schema_paths: list[Path], cache: SchemaCache | None, max_workers: int | None = None
+) -> list[tuple[str, DocumentNode]]:
+    """Read and parse GraphQL schema files concurrently.
+
+    Files are read and parsed by a thread pool, which hides file system latency when ingesting many small
+    files (e.g. on network file systems). The result is in the order of the given paths, so the merged
+    schema does not depend on the order in which the threads finish.
+
+    Args:
+        graphql_schema_paths: GraphQL schema files
+        cache: Optional cache of parsed documents keyed by file content
+        max_workers: Number of threads; defaults to the configured ingest workers or an automatic choice
+
+    Returns:
+        List of (file content, parsed document) in the order of the given paths
+    """
+    if max_workers is None:
+        max_workers = _ingest_workers or min(DEFAULT_MAX_INGEST_WORKERS, (os.cpu_count() or 1) + 4)
+    max_workers = min(max_workers, len(graphql_schema_paths))
+
+    if max_workers <= 1:
+        return [_load_schema_file(graphql_file, cache) for graphql_file in graphql_schema_paths]
+
+    log.debug(f"Ingesting {len(graphql_schema_paths)} schema files with {max_workers} threads")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s2dm-ingest") as executor:
+        return list(executor.map(lambda graphql_file: _load_schema_file(graphql_file, cache), graphql_schema_paths))
+
+
+@dataclass
+class SchemaFile:
+    """A GraphQL schema file together with its content and parsed document."""
+
+    path: Path
+    content: str
+    document: DocumentNode
+
+
+@profiled("read_and_parse")
+def load_schema_files(graphql_schema_paths: list[Path], max_workers: int | None = None) -> list[SchemaFile]:
+    """Read and parse GraphQL schema files, each into its own document.
+
+    Directories are expanded into the GraphQL files they contain. Parsed documents are served from the default
+    schema cache when available.
+
+    Args:
+        graphql_schema_paths: List of GraphQL schema files or directories
+        max_workers: Optional number of threads used to read and parse the files
+
+    Returns:
+        Loaded schema files in composition order
+    """
+    cache = get_default_schema_cache()
+    graphql_files = _expand_schema_paths(graphql_schema_paths)
+    loaded_files = _load_schema_files(graphql_files, cache, max_workers)
+    return [
+        SchemaFile(path=graphql_file, content=content, document=document)
+        for graphql_file, (content, document) in zip(graphql_files, loaded_files, strict=True)
+    ]
+
+
+def _get_type_definition_names(document: DocumentNode) -> list[str]:
+    """Get the names of all types defined (not extended) in a schema document."""
+    return [definition.name.value for definition in document.definitions if isinstance(definition, TypeDefinitionNode)]
+
+
+def build_source_map(
+    schema_files: list[SchemaFile], naming_config: NamingConventionConfig | None = None
+) -> dict[str, str]:
+    """Map every defined type name to the name of the file whose document defines it.
+
+    Args:
+        schema_files: Loaded schema files
+        naming_config: Optional naming configuration applied to the type names
+
+    Returns:
+        Mapping of type names to source file names
+    """
     source_map: dict[str, str] = {}
 
     type_case = get_case_for_element(ElementType.TYPE, ContextType.OBJECT, naming_config) if naming_config else None
 
-    for graphql_file in graphql_schema_paths:
-        content = load_schema_from_path(graphql_file)
-        schema_str += content + "\n"
-        if with_source_map:
-            type_names = _extract_type_names_from_content(content)
-            for type_name in type_names:
-                transformed_name = convert_name(type_name, type_case) if type_case else type_name
-                source_map[transformed_name] = graphql_file.name
+    for schema_file in schema_files:
+        for type_name in _get_type_definition_names(schema_file.document):
+            transformed_name = convert_name(type_name, type_case) if type_case else type_name
+            source_map[transformed_name] = schema_file.path.name
+
+    return source_map
+
 
-    return schema_str, source_map
+def compose_schema_files(schema_files: list[SchemaFile]) -> str:
+    """Concatenate the content of loaded schema files into a single SDL string."""
+    return "".join(schema_file.content + "\n" for schema_file in schema_files)
+
+
+def build_schema_str_with_optional_source_map(
+    graphql_schema_paths: list[Path],
+    with_source_map: bool,
+    naming_config: NamingConventionConfig | None = None,
+    max_workers: int | None = None,
+) -> tuple[str, dict[str, str]]:
+    """Build a GraphQL schema from a file or folder, returning also a source map."""
+    schema_files = load_schema_files(graphql_schema_paths, max_workers)
+    source_map = build_source_map(schema_files, naming_config) if with_source_map else {}
+    return compose_schema_files(schema_files), source_map
 
 
 def build_schema_str(graphql_schema_paths: list[Path]) -> str:
@@ -172,6 +305,36 @@ def build_schema_str(graphql_schema_paths: list[Path]) -> str:
     return schema_str
 
 
+def merge_documents(documents: list[DocumentNode]) -> DocumentNode:
+    """Merge the definitions of several documents into a single document, keeping their order."""
+    return DocumentNode(definitions=tuple(definition for document in documents for definition in document.definitions))
+
+
+def build_schema_document_with_source_map(
+    graphql_schema_paths: list[Path],
+    naming_config: NamingConventionConfig | None = None,
+    max_workers: int | None = None,
+) -> tuple[DocumentNode, dict[str, str]]:
+    """Parse GraphQL schema files into a single document, returning also a source map.
+
+    Every file is parsed into its own document and the definitions are merged at the AST level, in the order of
+    the given paths. When a default schema cache is configured, only files whose content changed since they were
+    last parsed are parsed again.
+
+    Args:
+        graphql_schema_paths: List of GraphQL schema files
+        naming_config: Optional naming configuration applied to the type names of the source map
+        max_workers: Optional number of threads used to read and parse the files
+
+    Returns:
+        Tuple of (merged schema document, source map)
+    """
+    schema_files = load_schema_files(graphql_schema_paths, max_workers)
+    document = merge_documents([schema_file.document for schema_file in schema_files])
+    return document, build_source_map(schema_files, naming_config)
+
+
+@profiled("build_schema")
 def build_schema_with_query(schema_str: str) -> GraphQLSchema:
     """Build a GraphQL schema from a schema string, ensuring it has a Query type."""
     schema = build_schema(schema_str)  # Convert GraphQL SDL to a GraphQLSchema object
@@ -180,24 +343,32 @@ def build_schema_with_query(schema_str: str) -> GraphQLSchema:
     return ensure_query(schema)
 
 
+@profiled("build_schema")
+def build_schema_from_document(document: DocumentNode) -> GraphQLSchema:
+    """Build a GraphQL schema from a parsed schema document, ensuring it has a Query type."""
+    schema = build_ast_schema(document)
+    log.info("Successfully built the given GraphQL schema document.")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(f"Read schema: \n{print_schema(schema)}")
+    return ensure_query(schema)
+
+
 def load_schema(graphql_schema_paths: Path | list[Path]) -> GraphQLSchema:
     """Load and build a GraphQL schema from files or folders."""
 
     if isinstance(graphql_schema_paths, Path):
         graphql_schema_paths = [graphql_schema_paths]
 
-    schema_str = build_schema_str(graphql_schema_paths)
-    return build_schema_with_query(schema_str)
+    document, _ = build_schema_document_with_source_map(graphql_schema_paths)
+    return build_schema_from_document(document)
 
 
 def load_schema_with_source_map(
     graphql_schema_paths: list[Path], naming_config: NamingConventionConfig | None = None
 ) -> tuple[GraphQLSchema, dict[str, str]]:
     """Load and build a GraphQL schema from files or folders, returning schema and source map."""
-    schema_str, source_map = build_schema_str_with_optional_source_map(
-        graphql_schema_paths, with_source_map=True, naming_config=naming_config
-    )
-    schema = build_schema_with_query(schema_str)
+    document, source_map = build_schema_document_with_source_map(graphql_schema_paths, naming_config)
+    schema = build_schema_from_document(document)
     return schema, source_map
 
 
@@ -211,6 +382,7 @@ def load_schema_with_naming(
     return schema
 
 
+@profiled("filter")
 def filter_schema(graphql_schema: GraphQLSchema, root_type: str) -> GraphQLSchema:
     """Filter a GraphQL schema by root type.
 
@@ -284,15 +456,17 @@ def load_schema_filtered(graphql_schema_paths: list[Path], root_type: str) -> Gr
     return filter_schema(graphql_schema, root_type)
 
 
-def print_schema_with_directives_preserved(schema: GraphQLSchema, source_map: dict[str, str] | None = None) -> str:
-    """Print schema while preserving custom directives.
+def build_directive_map_with_references(
+    schema: GraphQLSchema, source_map: dict[str, str] | None = None
+) -> dict[str | tuple[str, str], list[str]]:
+    """Collect the custom directives of a schema, adding @reference directives for the type sources.
 
     Args:
-        schema: The GraphQL schema to print
+        schema: The GraphQL schema
         source_map: Optional mapping of type names to source filenames for @reference directives
 
     Returns:
-        Schema string with all directives preserved
+        Directive strings keyed by type name or by (type name, field or enum value name)
     """
     directive_map = build_directive_map(schema)
 
@@ -317,15 +491,43 @@ def print_schema_with_directives_preserved(schema: GraphQLSchema, source_map: di
                 existing_directives.append(f'@reference(source: "{source_filename}")')
                 directive_map[type_name] = existing_directives
 
-    base_schema = print_schema(schema)
-    return add_directives_to_schema(base_schema, directive_map)
+    return directive_map
+
+
+@profiled("write_sdl")
+def write_schema_with_directives_preserved(
+    schema: GraphQLSchema, output: TextIO, source_map: dict[str, str] | None = None
+) -> None:
+    """Write schema to a stream while preserving custom directives.
+
+    Args:
+        schema: The GraphQL schema to write
+        output: Stream to write the schema to
+        source_map: Optional mapping of type names to source filenames for @reference directives
+    """
+    write_schema_sdl(schema, output, build_directive_map_with_references(schema, source_map))
+
+
+def print_schema_with_directives_preserved(schema: GraphQLSchema, source_map: dict[str, str] | None = None) -> str:
+    """Print schema while preserving custom directives.
+
+    Args:
+        schema: The GraphQL schema to print
+        source_map: Optional mapping of type names to source filenames for @reference directives
+
+    Returns:
+        Schema string with all directives preserved
+    """
+    output = io.StringIO()
+    write_schema_with_directives_preserved(schema, output, source_map)
+    return output.getvalue()
 
 
 def load_schema_as_str(graphql_schema_paths: list[Path], add_references: bool = False) -> str:
     """Load and build GraphQL schema but return as str."""
-    schema_str, source_map = build_schema_str_with_optional_source_map(graphql_schema_paths, add_references)
-    schema = build_schema_with_query(schema_str)
-    return print_schema_with_directives_preserved(schema, source_map)
+    document, source_map = build_schema_document_with_source_map(graphql_schema_paths)
+    schema = build_schema_from_document(document)
+    return print_schema_with_directives_preserved(schema, source_map if add_references else None)
 
 
 def create_tempfile_to_composed_schema(graphql_schema_paths: list[Path]) -> Path:
@@ -338,6 +540,103 @@ def create_tempfile_to_composed_schema(graphql_schema_paths: list[Path]) -> Path
     return Path(temp_path)
 
 
+SchemaKey = tuple[Path, ...]
+
+
+class SchemaSession:
+    """Memoizes the artifacts derived from a set of GraphQL schema inputs.
+
+    A single command often needs the same schema in several forms: the built schema, the source map, the list of
+    named types and the composed SDL. The session reads and parses every input set only once and derives all of
+    these from the same parsed documents. Results are keyed by the input paths, in order.
+
+    The schema returned by `schema` is shared between all callers and must be treated as read-only. It can be
+    passed to `process_schema`, which does not modify it. Callers that modify a schema themselves should use
+    `build_schema`, which returns a fork of the shared schema.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers
+        self._files: dict[SchemaKey, list[SchemaFile]] = {}
+        self._documents: dict[SchemaKey, DocumentNode] = {}
+        self._schemas: dict[SchemaKey, GraphQLSchema] = {}
+        self._named_types: dict[SchemaKey, list[GraphQLNamedType]] = {}
+        self._composed_sdl: dict[SchemaKey, str] = {}
+        self._file_states: dict[SchemaKey, dict[Path, FileState | None]] = {}
+
+    @staticmethod
+    def _key(graphql_schema_paths: Path | Sequence[Path]) -> SchemaKey:
+        if isinstance(graphql_schema_paths, Path):
+            return (graphql_schema_paths,)
+        return tuple(graphql_schema_paths)
+
+    def files(self, graphql_schema_paths: Path | Sequence[Path]) -> list[SchemaFile]:
+        """Return the loaded schema files of the given inputs, reading and parsing them on first use."""
+        key = self._key(graphql_schema_paths)
+        if key not in self._files:
+            self._files[key] = load_schema_files(list(key), self.max_workers)
+            # Directories are included, as adding or removing files changes their modification time
+            watched_paths = [*key, *(schema_file.path for schema_file in self._files[key])]
+            self._file_states[key] = {path: get_file_state(path) for path in watched_paths}
+        return self._files[key]
+
+    def refresh(self) -> None:
+        """Forget everything derived from inputs whose files changed on disk since they were read.
+
+        Long-running processes call this before reusing the session, so that edited schema files are picked up.
+        """
+        for key, file_states in list(self._file_states.items()):
+            if any(get_file_state(path) != state for path, state in file_states.items()):
+                log.debug(f"Schema inputs changed, reloading: {', '.join(str(path) for path in key)}")
+                for cache in (
+                    self._files,
+                    self._documents,
+                    self._schemas,
+                    self._named_types,
+                    self._composed_sdl,
+                    self._file_states,
+                ):
+                    cache.pop(key, None)
+
+    def document(self, graphql_schema_paths: Path | Sequence[Path]) -> DocumentNode:
+        """Return the merged schema document of the given inputs."""
+        key = self._key(graphql_schema_paths)
+        if key not in self._documents:
+            self._documents[key] = merge_documents([schema_file.document for schema_file in self.files(key)])
+        return self._documents[key]
+
+    def schema(self, graphql_schema_paths: Path | Sequence[Path]) -> GraphQLSchema:
+        """Return the shared, read-only schema built from the given inputs."""
+        key = self._key(graphql_schema_paths)
+        if key not in self._schemas:
+            self._schemas[key] = build_schema_from_document(self.document(key))
+        return self._schemas[key]
+
+    def build_schema(self, graphql_schema_paths: Path | Sequence[Path]) -> GraphQLSchema:
+        """Return a new schema from the given inputs that the caller is free to modify, forked from the shared one."""
+        return fork_schema(self.schema(graphql_schema_paths))
+
+    def source_map(
+        self, graphql_schema_paths: Path | Sequence[Path], naming_config: NamingConventionConfig | None = None
+    ) -> dict[str, str]:
+        """Return a mapping of type names to the names of the files defining them."""
+        return build_source_map(self.files(graphql_schema_paths), naming_config)
+
+    def named_types(self, graphql_schema_paths: Path | Sequence[Path]) -> list[GraphQLNamedType]:
+        """Return all named types of the shared schema, excluding introspection types."""
+        key = self._key(graphql_schema_paths)
+        if key not in self._named_types:
+            self._named_types[key] = get_all_named_types(self.schema(key))
+        return list(self._named_types[key])
+
+    def composed_sdl(self, graphql_schema_paths: Path | Sequence[Path]) -> str:
+        """Return the concatenated content of the given inputs, as produced by `build_schema_str`."""
+        key = self._key(graphql_schema_paths)
+        if key not in self._composed_sdl:
+            self._composed_sdl[key] = compose_schema_files(self.files(key))
+        return self._composed_sdl[key]
+
+
 def _check_directive_usage_on_node(schema: GraphQLSchema, directive_node: DirectiveNode, context: str) -> list[str]:
     """Check enum values in directive usage on a specific node."""
     errors: list[str] = []
@@ -454,6 +753,7 @@ def check_enum_defaults(schema: GraphQLSchema) -> list[str]:
     return errors
 
 
+@profiled("validate")
 def check_correct_schema(schema: GraphQLSchema) -> list[str]:
     """Assert that the schema conforms to GraphQL specification and has valid enum defaults.
 
@@ -517,6 +817,9 @@ def get_referenced_types(
     """
     Find all GraphQL types referenced from the root type through graph traversal.
 
+    The traversal is answered by the reachability index of the schema, so repeated calls on the same schema are
+    cheap.
+
     Args:
         graphql_schema: The GraphQL schema
         root_type: The root type to start traversal from
@@ -525,67 +828,7 @@ def get_referenced_types(
     Returns:
         Set[GraphQLType]: Set of referenced GraphQL type objects
     """
-    visited: set[str] = set()
-    referenced: set[GraphQLType] = set()
-
-    def visit_type(type_name: str) -> None:
-        if type_name in visited:
-            return
-
-        visited.add(type_name)
-
-        if is_introspection_or_root_type(type_name):
-            return
-
-        type_def = graphql_schema.type_map.get(type_name)
-        if not type_def:
-            return
-
-        referenced.add(type_def)
-
-        if is_object_type(type_def):
-            object_type = cast(GraphQLObjectType, type_def)
-            if not has_given_directive(object_type, "instanceTag") or include_instance_tag_fields:
-                visit_object_type(object_type)
-        elif is_interface_type(type_def):
-            visit_interface_type(cast(GraphQLInterfaceType, type_def))
-        elif is_union_type(type_def):
-            visit_union_type(cast(GraphQLUnionType, type_def))
-        elif is_input_object_type(type_def):
-            visit_input_object_type(cast(GraphQLInputObjectType, type_def))
-        # Scalar and enum types don't reference other types
-
-    def visit_object_type(obj_type: GraphQLObjectType) -> None:
-        for field in obj_type.fields.values():
-            visit_field_type(field.type)
-
-        for interface in obj_type.interfaces:
-            visit_type(interface.name)
-
-    def visit_interface_type(interface_type: GraphQLInterfaceType) -> None:
-        for field in interface_type.fields.values():
-            visit_field_type(field.type)
-
-    def visit_union_type(union_type: GraphQLUnionType) -> None:
-        for member_type in union_type.types:
-            visit_type(member_type.name)
-
-    def visit_input_object_type(input_type: GraphQLInputObjectType) -> None:
-        for field in input_type.fields.values():
-            visit_field_type(field.type)
-
-    def visit_field_type(field_type: GraphQLType) -> None:
-        unwrapped_type = field_type
-        while is_non_null_type(unwrapped_type) or is_list_type(unwrapped_type):
-            if is_non_null_type(unwrapped_type):
-                unwrapped_type = cast(GraphQLNonNull[Any], unwrapped_type).of_type
-            elif is_list_type(unwrapped_type):
-                unwrapped_type = cast(GraphQLList[Any], unwrapped_type).of_type
-
-        if hasattr(unwrapped_type, "name"):
-            visit_type(unwrapped_type.name)
-
-    visit_type(root_type)
+    referenced = get_reachability_index(graphql_schema, include_instance_tag_fields).reachable_types(root_type)
 
     log.info(f"Found {len(referenced)} referenced types from root type '{root_type}'")
     return referenced
@@ -606,6 +849,7 @@ def _validate_schema(schema: GraphQLSchema, document: DocumentNode) -> GraphQLSc
     return schema
 
 
+@profiled("prune")
 def prune_schema_using_query_selection(
     schema: GraphQLSchema, document: DocumentNode, include_instance_tag_fields: bool = False
 ) -> GraphQLSchema:
@@ -753,21 +997,27 @@ def prune_schema_using_query_selection(
 
     directives_used = collect_used_directives()
     schema.directives = tuple(directive for directive in schema.directives if directive.name in directives_used)
+    invalidate_reachability_index(schema)
 
     log.debug(f"Composed filtered schema with {len(fields_to_keep)} object types")
 
     return schema
 
 
+@profiled("annotation")
 def build_annotated_schema(
     schema: GraphQLSchema,
     source_map: dict[str, str],
     expansion_type_meta: dict[str, TypeMetadata],
     expansion_field_meta: dict[tuple[str, str], FieldMetadata],
 ) -> AnnotatedSchema:
-    """Build an annotated schema by combining source map and expansion metadata."""
+    """Build an annotated schema by combining source map and expansion metadata.
+
+    Type names, field names and sources are interned, as they repeat in the keys and values of the metadata of
+    every field.
+    """
     source_type_metadata = {
-        name: TypeMetadata(source=source_map[name], is_intermediate_type=False)
+        sys.intern(name): TypeMetadata(source=sys.intern(source_map[name]), is_intermediate_type=False)
         for name in schema.type_map
         if name in source_map and name not in expansion_type_meta
     }
@@ -783,16 +1033,16 @@ def build_annotated_schema(
             continue
 
         obj_type = cast(GraphQLObjectType | GraphQLInterfaceType, type_obj)
+        type_name = sys.intern(type_name)
         for field_name, field in obj_type.fields.items():
             if (type_name, field_name) in expansion_field_meta:
                 continue
 
-            field_type = get_named_type(field.type)
+            field_name = sys.intern(field_name)
             non_expanded_field_metadata[(type_name, field_name)] = FieldMetadata(
-                resolved_names=[field_name],
-                resolved_type=field_type.name,
+                resolved_names=(field_name,),
+                resolved_type=sys.intern(get_named_type(field.type).name),
                 is_expanded=False,
-                instances=[],
             )
 
     field_metadata = {**non_expanded_field_metadata, **expansion_field_meta}
@@ -800,6 +1050,7 @@ def build_annotated_schema(
     return AnnotatedSchema(schema=schema, type_metadata=type_metadata, field_metadata=field_metadata)
 
 
+@profiled("process_schema")
 def process_schema(
     schema: GraphQLSchema,
     source_map: dict[str, str],
@@ -810,6 +1061,9 @@ def process_schema(
 ) -> AnnotatedSchema:
     """Apply transformations to a GraphQL schema.
 
+    The given schema is not modified: the transformations are applied to a fork of it, so several variants can be
+    derived from the same base schema.
+
     Args:
         schema: The GraphQL schema to process
         source_map: Mapping of type names to their source files
@@ -821,6 +1075,9 @@ def process_schema(
     Returns:
         Annotated schema with metadata
     """
+    if query_document or naming_config or expanded_instances:
+        schema = fork_schema(schema)
+
     if query_document:
         schema = prune_schema_using_query_selection(schema, query_document, expanded_instances)
 
@@ -845,6 +1102,7 @@ def load_and_process_schema(
     selection_query_path: Path | None = None,
     root_type: str | None = None,
     expanded_instances: bool = False,
+    session: SchemaSession | None = None,
 ) -> tuple[AnnotatedSchema, NamingConventionConfig | None, DocumentNode | None]:
     """Load schema with naming config and apply filtering based on selection query and root type.
 
@@ -854,13 +1112,18 @@ def load_and_process_schema(
         selection_query_path: Optional path to GraphQL query file for filtering
         root_type: Optional root type name to filter the schema
         expanded_instances: Whether to include instance tag fields when filtering by root type
+        session: Optional schema session to reuse already parsed schema files from
 
     Returns:
         Tuple of (annotated schema, naming config dict, selection query document)
     """
     naming_config = load_naming_config(naming_config_path)
 
-    schema, source_map = load_schema_with_source_map(schema_paths, naming_config)
+    if session is None:
+        schema, source_map = load_schema_with_source_map(schema_paths, naming_config)
+    else:
+        schema = session.schema(schema_paths)
+        source_map = session.source_map(schema_paths, naming_config)
 
     query_document = None
     if selection_query_path:
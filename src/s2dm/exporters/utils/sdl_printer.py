@@ -0,0 +1,183 @@
+from typing import TextIO, cast
+
+from graphql import (
+    GraphQLArgument,
+    GraphQLEnumType,
+    GraphQLField,
+    GraphQLInputField,
+    GraphQLInputObjectType,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLScalarType,
+    GraphQLSchema,
+    GraphQLUnionType,
+    is_specified_directive,
+)
+from graphql.utilities.print_schema import (
+    is_defined_type,
+    print_deprecated,
+    print_description,
+    print_directive,
+    print_input_value,
+    print_schema_definition,
+    print_specified_by_url,
+)
+
+DirectiveMap = dict[str | tuple[str, str], list[str]]
+
+
+class SDLPrinter:
+    """Writes a schema as SDL in a single pass, including the custom directives of its elements.
+
+    The output matches graphql-core's `print_schema`, except that the directives in the directive map are written
+    right after the element they belong to: after the name and implemented interfaces of a type, after the type
+    and default value of a field or input field, and after the name of an enum value.
+    """
+
+    def __init__(self, output: TextIO, directive_map: DirectiveMap) -> None:
+        """Create a printer.
+
+        Args:
+            output: Stream to write the SDL to
+            directive_map: Directives to print, keyed by type name or by (type name, field or enum value name)
+        """
+        self.output = output
+        self.directive_map = directive_map
+
+    def directives(self, key: str | tuple[str, str]) -> str:
+        directives = self.directive_map.get(key)
+        return " " + " ".join(directives) if directives else ""
+
+    def write_schema(self, schema: GraphQLSchema) -> None:
+        """Write all definitions of a schema, separated by blank lines.
+
+        Args:
+            schema: The GraphQL schema to write
+        """
+        separator = ""
+        schema_definition = print_schema_definition(schema)
+        if schema_definition:
+            self.output.write(schema_definition)
+            separator = "\n\n"
+
+        for directive in schema.directives:
+            if is_specified_directive(directive):
+                continue
+            self.output.write(separator)
+            self.output.write(print_directive(directive))
+            separator = "\n\n"
+
+        for named_type in schema.type_map.values():
+            if not is_defined_type(named_type):
+                continue
+            self.output.write(separator)
+            self.write_type(named_type)
+            separator = "\n\n"
+
+    def write_type(self, named_type: GraphQLNamedType) -> None:
+        """Write the definition of a named type.
+
+        Args:
+            named_type: The type to write
+        """
+        write = self.output.write
+        write(print_description(named_type))
+
+        if isinstance(named_type, GraphQLScalarType):
+            write(f"scalar {named_type.name}{self.directives(named_type.name)}{print_specified_by_url(named_type)}")
+        elif isinstance(named_type, GraphQLObjectType | GraphQLInterfaceType):
+            kind = "type" if isinstance(named_type, GraphQLObjectType) else "interface"
+            write(f"{kind} {named_type.name}")
+            if named_type.interfaces:
+                write(" implements " + " & ".join(interface.name for interface in named_type.interfaces))
+            write(self.directives(named_type.name))
+            self.write_fields(named_type)
+        elif isinstance(named_type, GraphQLUnionType):
+            write(f"union {named_type.name}{self.directives(named_type.name)}")
+            if named_type.types:
+                write(" = " + " | ".join(member.name for member in named_type.types))
+        elif isinstance(named_type, GraphQLEnumType):
+            write(f"enum {named_type.name}{self.directives(named_type.name)}")
+            self.write_enum_values(named_type)
+        elif isinstance(named_type, GraphQLInputObjectType):
+            write(f"input {named_type.name}{self.directives(named_type.name)}")
+            self.write_input_fields(named_type)
+        else:
+            raise TypeError(f"Unexpected type: {named_type!r}")
+
+    def write_fields(self, type_: GraphQLObjectType | GraphQLInterfaceType) -> None:
+        fields: dict[str, GraphQLField] = type_.fields
+        if not fields:
+            return
+
+        write = self.output.write
+        write(" {\n")
+        for i, (name, field) in enumerate(fields.items()):
+            if i:
+                write("\n")
+            # The description helper of graphql-core handles fields as well, it is only typed more narrowly
+            write(print_description(cast(GraphQLArgument, field), "  ", not i))
+            write(f"  {name}")
+            self.write_arguments(field.args)
+            write(f": {field.type}{print_deprecated(field.deprecation_reason)}")
+            write(self.directives((type_.name, name)))
+        write("\n}")
+
+    def write_arguments(self, args: dict[str, GraphQLArgument]) -> None:
+        if not args:
+            return
+
+        write = self.output.write
+        # Like graphql-core, print all arguments on one line unless one of them has a description
+        if not any(arg.description for arg in args.values()):
+            write("(" + ", ".join(print_input_value(name, arg) for name, arg in args.items()) + ")")
+            return
+
+        write("(\n")
+        for i, (name, arg) in enumerate(args.items()):
+            if i:
+                write("\n")
+            write(print_description(arg, "    ", not i))
+            write(f"    {print_input_value(name, arg)}")
+        write("\n  )")
+
+    def write_input_fields(self, type_: GraphQLInputObjectType) -> None:
+        fields: dict[str, GraphQLInputField] = type_.fields
+        if not fields:
+            return
+
+        write = self.output.write
+        write(" {\n")
+        for i, (name, field) in enumerate(fields.items()):
+            if i:
+                write("\n")
+            write(print_description(cast(GraphQLArgument, field), "  ", not i))
+            write(f"  {print_input_value(name, cast(GraphQLArgument, field))}")
+            write(self.directives((type_.name, name)))
+        write("\n}")
+
+    def write_enum_values(self, type_: GraphQLEnumType) -> None:
+        if not type_.values:
+            return
+
+        write = self.output.write
+        write(" {\n")
+        for i, (name, value) in enumerate(type_.values.items()):
+            if i:
+                write("\n")
+            write(print_description(value, "  ", not i))
+            write(f"  {name}{print_deprecated(value.deprecation_reason)}")
+            write(self.directives((type_.name, name)))
+        write("\n}")
+
+
+def write_schema_sdl(schema: GraphQLSchema, output: TextIO, directive_map: DirectiveMap | None = None) -> None:
+    """Write a schema as SDL to a stream, including the given custom directives.
+
+    Args:
+        schema: The GraphQL schema to write
+        output: Stream to write the SDL to
+        directive_map: Optional directives to print, keyed by type name or by (type name, field or enum value name)
+    """
+    SDLPrinter(output, directive_map or {}).write_schema(schema)
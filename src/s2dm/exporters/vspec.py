@@ -1,6 +1,6 @@
 from collections.abc import Iterable
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO, cast
 
 import click
 import yaml
@@ -20,6 +20,7 @@ from s2dm.exporters.utils.directive import get_directive_arguments, has_given_di
 from s2dm.exporters.utils.extraction import get_all_object_types
 from s2dm.exporters.utils.field import FieldCase
 from s2dm.exporters.utils.graphql_type import is_introspection_or_root_type
+from s2dm.exporters.utils.profiling import profiled
 from s2dm.exporters.utils.schema_loader import load_schema_with_naming, process_schema
 
 UNITS_DICT = {  # TODO: move to a separate file or use the vss tools to get the mapping directly from dynamic_units
@@ -185,9 +186,23 @@ class CustomDumper(yaml.Dumper):
 # Register the custom representer for lists
 CustomDumper.add_representer(list, CustomDumper.represent_list)
 
+VSPEC_DUMP_OPTIONS: dict[str, Any] = {"default_flow_style": False, "Dumper": CustomDumper, "sort_keys": True}
 
+
+@profiled("export:vspec")
 def translate_to_vspec(annotated_schema: AnnotatedSchema) -> str:
     """Translate a GraphQL schema to YAML."""
+    return cast(str, yaml.dump(build_vspec_dict(annotated_schema), **VSPEC_DUMP_OPTIONS))
+
+
+@profiled("export:vspec")
+def write_vspec(annotated_schema: AnnotatedSchema, output: TextIO) -> None:
+    """Translate a GraphQL schema to YAML and write it to a stream while it is emitted."""
+    yaml.dump(build_vspec_dict(annotated_schema), output, **VSPEC_DUMP_OPTIONS)
+
+
+def build_vspec_dict(annotated_schema: AnnotatedSchema) -> dict[str, Any]:
+    """Build the VSPEC tree of a GraphQL schema, keyed by the dotted path of each branch and leaf."""
     schema = annotated_schema.schema
 
     all_object_types = get_all_object_types(schema)
@@ -238,7 +253,7 @@ def translate_to_vspec(annotated_schema: AnnotatedSchema) -> str:
                 new_key = ".".join(path_parts[:-1] + [key])
                 yaml_dict[new_key] = yaml_dict.pop(key)
                 break
-    return yaml.dump(yaml_dict, default_flow_style=False, Dumper=CustomDumper, sort_keys=True)
+    return yaml_dict
 
 
 def process_field(
@@ -289,17 +304,12 @@ def process_field(
                 field_dict["unit"] = UNITS_DICT[unit_arg]
 
         if has_given_directive(field, "metadata"):
-            metadata_directive = None
-            if field.ast_node and field.ast_node.directives:
-                metadata_directive = next(
-                    (directive for directive in field.ast_node.directives if directive.name.value == "metadata"), None
-                )
-
-            metadata_args = {}
-            if metadata_directive and metadata_directive.arguments:
-                for arg in metadata_directive.arguments:
-                    if hasattr(arg.value, "value"):  # Ensure arg.value has the 'value' attribute
-                        metadata_args[arg.name.value] = arg.value.value
+            # Only scalar arguments are mapped
+            metadata_args = {
+                name: value
+                for name, value in get_directive_arguments(field, "metadata").items()
+                if not isinstance(value, list | dict)
+            }
 
             comment = metadata_args.get("comment")
             vss_type = metadata_args.get("vssType")
@@ -329,7 +339,8 @@ def process_field(
         log.debug(f"Nested structure found: {object_type.name}.{resolved_type_name} (for field {field_name})")
 
         # Get instances from field_metadata
-        instances = field_meta.instances if field_meta.instances else None
+        # Copied, as the levels are shared by every field expanding the same type and YAML would alias them
+        instances = [list(values) for values in field_meta.instances] if field_meta.instances else None
 
         # Create branch dict inline
         obj_dict: dict[str, Any] = {"type": "branch"}
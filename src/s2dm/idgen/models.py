@@ -22,6 +22,8 @@ class FieldTypeWrapper:
         field_type: The GraphQL type to wrap
     """
 
+    __slots__ = ("_field_type",)
+
     def __init__(self, field_type: GraphQLType) -> None:
         self._field_type = field_type
 
@@ -98,7 +100,7 @@ class FieldTypeWrapper:
         return isinstance(self._field_type, GraphQLObjectType)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IDGenerationSpec:
     """Collection of fields and methods required for ID generation.
 
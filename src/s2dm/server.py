@@ -0,0 +1,282 @@
+import hmac
+import io
+import ipaddress
+import json
+import os
+import secrets
+import socketserver
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, cast
+
+import click
+
+from s2dm import __version__, log
+from s2dm.exporters.utils.forked_pool import run_in_process
+from s2dm.exporters.utils.schema_loader import SchemaSession
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_REQUEST_SIZE_BYTES = 1024 * 1024
+
+SERVED_COMMANDS = (
+    "check",
+    "compose",
+    "diff",
+    "export",
+    "generate",
+    "registry",
+    "search",
+    "similar",
+    "stats",
+    "validate",
+)
+
+
+@dataclass
+class CommandResult:
+    """Exit code and console output of a command run by the server."""
+
+    exit_code: int
+    output: str
+
+
+class CommandRunner:
+    """Runs s2dm commands inside the current process, sharing one schema session between all of them.
+
+    Schema inputs are read, parsed and built once and kept in memory together with the indexes derived from them,
+    until one of their files changes on disk. Commands run one at a time, because their console output is captured
+    by redirecting the process-wide standard streams. Commands that would fork worker processes run their work in
+    the server process instead, as forking a process serving requests in several threads is not safe.
+    """
+
+    def __init__(self, group: click.Group, commands: tuple[str, ...] = SERVED_COMMANDS) -> None:
+        self.group = group
+        self.commands = commands
+        self.session = SchemaSession()
+        self._lock = threading.Lock()
+
+    def run(self, command_name: str, args: list[str]) -> CommandResult:
+        """Run a command with the given arguments and capture its output.
+
+        Args:
+            command_name: Name of a served top-level command, e.g. "compose"
+            args: Command line arguments following the command name
+
+        Returns:
+            The exit code and the console output of the command
+
+        Raises:
+            ValueError: If the command is not served or the arguments would keep it running
+        """
+        command = self.group.commands.get(command_name)
+        if command_name not in self.commands or command is None:
+            raise ValueError(f"Unknown command: {command_name}")
+        if "--watch" in args:
+            raise ValueError("The --watch option is not supported by the server")
+
+        output = io.StringIO()
+        with self._lock, run_in_process(), redirect_stdout(output), redirect_stderr(output):
+            self.session.refresh()
+            exit_code = self._invoke(command, command_name, args)
+        return CommandResult(exit_code=exit_code, output=output.getvalue())
+
+    def _invoke(self, command: click.Command, command_name: str, args: list[str]) -> int:
+        try:
+            result = command.main(
+                args,
+                prog_name=f"s2dm {command_name}",
+                standalone_mode=False,
+                obj=self.session,
+            )
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except click.exceptions.Abort:
+            return 1
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                return e.code
+            return 0 if e.code is None else 1
+        except Exception as e:
+            log.error(f"Command failed: {e}")
+            return 1
+        return result if isinstance(result, int) else 0
+
+
+class CommandServerMixin:
+    """Gives the request handler access to the command runner and the access checks of the server.
+
+    Attributes:
+        runner: Runner executing the requested commands
+        token: Token clients must send as `Authorization: Bearer <token>` to run commands, None if not required
+        allowed_hosts: Values of the `Host` header the server accepts, None to accept any
+    """
+
+    runner: CommandRunner
+    token: str | None = None
+    allowed_hosts: frozenset[str] | None = None
+
+
+class CommandRequestHandler(BaseHTTPRequestHandler):
+    """Handles `GET /health` and `POST /<command>` requests with a JSON body of the form `{"args": [...]}`.
+
+    Requests naming another host are rejected, so that web pages cannot reach the server through a DNS name
+    resolving to it. Commands are only run for `application/json` requests carrying the token of the server, which
+    browsers cannot send cross-origin without the consent of the server.
+    """
+
+    def do_GET(self) -> None:
+        if not self._check_host():
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+        runner = cast(CommandServerMixin, self.server).runner
+        self._send_json(200, {"status": "ok", "version": __version__, "commands": list(runner.commands)})
+
+    def do_POST(self) -> None:
+        if not self._check_host() or not self._check_token():
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(415, {"error": "The request body must have the content type application/json"})
+            return
+
+        runner = cast(CommandServerMixin, self.server).runner
+        command_name = self.path.strip("/")
+        if command_name not in runner.commands:
+            self._send_json(404, {"error": f"Unknown command: {command_name}"})
+            return
+
+        content_length = int(self.headers.get("Content-Length") or 0)
+        if content_length > MAX_REQUEST_SIZE_BYTES:
+            self._send_json(413, {"error": "Request body too large"})
+            return
+
+        try:
+            body = json.loads(self.rfile.read(content_length) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        args = body.get("args", []) if isinstance(body, dict) else None
+        if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+            self._send_json(400, {"error": "The request body must be an object with a list of string 'args'"})
+            return
+
+        try:
+            result = runner.run(command_name, args)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(200, {"exit_code": result.exit_code, "output": result.output})
+
+    def _check_host(self) -> bool:
+        allowed_hosts = cast(CommandServerMixin, self.server).allowed_hosts
+        if allowed_hosts is None or self.headers.get("Host") in allowed_hosts:
+            return True
+        self._send_json(403, {"error": "Requests must be sent to the address the server listens on"})
+        return False
+
+    def _check_token(self) -> bool:
+        token = cast(CommandServerMixin, self.server).token
+        if token is None:
+            return True
+        scheme, _, given_token = (self.headers.get("Authorization") or "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(given_token.encode(), token.encode()):
+            return True
+        self._send_json(401, {"error": "Missing or invalid token"})
+        return False
+
+    def _send_json(self, status: int, data: dict[str, Any]) -> None:
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def address_string(self) -> str:
+        # Unix socket clients have an empty address instead of a host and port
+        client_address = cast(tuple[str, int] | str, self.client_address)
+        return str(client_address[0]) if isinstance(client_address, tuple) else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        log.debug(f"{self.address_string()} {format % args}")
+
+
+class CommandHTTPServer(CommandServerMixin, ThreadingHTTPServer):
+    """Serves commands over TCP, handling every connection in its own thread.
+
+    Commands are only run for clients sending the token of the server, as any local process can connect.
+    """
+
+    def __init__(self, address: tuple[str, int], runner: CommandRunner, token: str) -> None:
+        self.runner = runner
+        self.token = token
+        super().__init__(address, CommandRequestHandler)
+
+        host, port = self.server_address[:2]
+        host_names = {address[0], str(host)}
+        if ipaddress.ip_address(str(host)).is_loopback:
+            host_names.add("localhost")
+        self.allowed_hosts = frozenset(f"{host_name}:{port}" for host_name in host_names)
+
+    @property
+    def location(self) -> str:
+        """URL clients connect to."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+
+class CommandUnixServer(CommandServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves commands over a unix socket, handling every connection in its own thread.
+
+    The socket file is only accessible by the current user and is removed when the server is closed. Clients need
+    no token, as only the current user can connect.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, runner: CommandRunner) -> None:
+        self.runner = runner
+        self.socket_path = socket_path
+        socket_path.unlink(missing_ok=True)
+        super().__init__(str(socket_path), CommandRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    @property
+    def location(self) -> str:
+        """Socket path clients connect to."""
+        return str(self.socket_path)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def create_server(
+    runner: CommandRunner,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+    token: str | None = None,
+) -> CommandHTTPServer | CommandUnixServer:
+    """Create a server for the given command runner.
+
+    Args:
+        runner: Runner executing the requested commands
+        host: Host name or address to listen on
+        port: TCP port to listen on, 0 picks a free port
+        socket_path: Unix socket to listen on instead of the TCP port
+        token: Token TCP clients must send to run commands, a random token is generated if not given
+
+    Returns:
+        The server, not yet serving
+    """
+    if socket_path is not None:
+        return CommandUnixServer(socket_path, runner)
+    return CommandHTTPServer((host, port), runner, token or secrets.token_urlsafe(32))
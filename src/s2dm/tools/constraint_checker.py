@@ -6,9 +6,15 @@ from s2dm.tools.naming_checker import check_naming_conventions
 
 
 class ConstraintChecker:
-    def __init__(self, schema: GraphQLSchema, naming_config: NamingConventionConfig | None = None):
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        naming_config: NamingConventionConfig | None = None,
+        max_workers: int | None = None,
+    ):
         self.schema = schema
         self.naming_config = naming_config
+        self.max_workers = max_workers
 
     def check_min_leq_max(self, objects: list[GraphQLObjectType], directive: str) -> list[str]:
         errors = []
@@ -49,6 +55,6 @@ class ConstraintChecker:
         errors += self.check_min_leq_max(objects, "cardinality")
 
         if self.naming_config:
-            errors += check_naming_conventions(self.schema, self.naming_config)
+            errors += check_naming_conventions(self.schema, self.naming_config, self.max_workers)
 
         return errors
@@ -1,15 +1,21 @@
+import functools
+import re
+from dataclasses import dataclass, field
+
 import inflect
 from graphql import (
     GraphQLEnumType,
     GraphQLInputObjectType,
     GraphQLInterfaceType,
+    GraphQLNamedType,
     GraphQLObjectType,
     GraphQLSchema,
 )
 
 from s2dm.exporters.utils.field import FieldCase, get_field_case
+from s2dm.exporters.utils.forked_pool import fork_map
 from s2dm.exporters.utils.graphql_type import is_introspection_type
-from s2dm.exporters.utils.naming import TYPE_CONTEXTS, convert_name, is_instance_tag_field
+from s2dm.exporters.utils.naming import TYPE_CONTEXTS, convert_name, convert_names, is_instance_tag_field
 from s2dm.exporters.utils.naming_config import (
     CaseFormat,
     ContextType,
@@ -20,6 +26,23 @@ from s2dm.exporters.utils.naming_config import (
 
 _inflect_engine = inflect.engine()
 
+# Names matching these patterns are left unchanged by the case converter of their format, so they can be accepted
+# without converting them. The patterns are deliberately narrow: names they do not match are still converted, and
+# only then compared.
+_CASE_FORMAT_PATTERNS = {
+    CaseFormat.CAMEL_CASE: re.compile(r"[a-z]+(?:[A-Z][a-z]+)*[0-9]*"),
+    CaseFormat.PASCAL_CASE: re.compile(r"(?:[A-Z][a-z]+)+[0-9]*"),
+    CaseFormat.SNAKE_CASE: re.compile(r"[a-z][a-z0-9]*(?:_[a-z0-9]+)*"),
+    CaseFormat.KEBAB_CASE: re.compile(r"[a-z][a-z0-9]*(?:-[a-z0-9]+)*"),
+    CaseFormat.MACRO_CASE: re.compile(r"[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)*"),
+    CaseFormat.COBOL_CASE: re.compile(r"[A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*"),
+    CaseFormat.FLAT_CASE: re.compile(r"[a-z][a-z0-9]*"),
+    CaseFormat.TITLE_CASE: re.compile(r"[A-Z][a-z]+(?: [A-Z][a-z]+)*"),
+}
+
+# Number of types checked by one worker process call when checking in parallel
+CHECK_CHUNK_SIZE = 500
+
 
 def _matches_case_format(name: str, case_format: CaseFormat) -> tuple[bool, str]:
     """Check if a name matches the specified case format.
@@ -31,12 +54,16 @@ def _matches_case_format(name: str, case_format: CaseFormat) -> tuple[bool, str]
     Returns:
         True if the name matches the case format, False otherwise
     """
+    if _CASE_FORMAT_PATTERNS[case_format].fullmatch(name):
+        return True, name
+
     converted_name = convert_name(name, case_format)
     matches = name == converted_name
 
     return matches, converted_name
 
 
+@functools.cache
 def _is_plural(name: str) -> bool:
     """Check if a name is in plural form using inflect library.
 
@@ -50,93 +77,138 @@ def _is_plural(name: str) -> bool:
     return singular is not False
 
 
-def check_naming_conventions(
-    schema: GraphQLSchema,
-    config: NamingConventionConfig,
-) -> list[str]:
-    """Check all naming conventions for the schema.
+@functools.cache
+def _plural(name: str) -> str:
+    """Return the plural form of a name using inflect library."""
+    return str(_inflect_engine.plural(name))
 
-    Args:
-        schema: The GraphQL schema
-        config: The naming convention configuration
 
-    Returns:
-        List of error messages for violations
-    """
-    type_errors = []
-    field_errors = []
-    argument_errors = []
-    enum_value_errors = []
-    plural_errors = []
+@dataclass
+class _NamingViolations:
+    """Error messages of naming convention violations, grouped by the kind of element."""
 
-    for type_name, object_type in schema.type_map.items():
-        if is_introspection_type(type_name):
-            continue
+    type_errors: list[str] = field(default_factory=list)
+    field_errors: list[str] = field(default_factory=list)
+    argument_errors: list[str] = field(default_factory=list)
+    enum_value_errors: list[str] = field(default_factory=list)
+    plural_errors: list[str] = field(default_factory=list)
 
-        context = TYPE_CONTEXTS.get(type(object_type))
+    def extend(self, other: "_NamingViolations") -> None:
+        self.type_errors += other.type_errors
+        self.field_errors += other.field_errors
+        self.argument_errors += other.argument_errors
+        self.enum_value_errors += other.enum_value_errors
+        self.plural_errors += other.plural_errors
 
-        if not context:
-            continue
+    def messages(self) -> list[str]:
+        return self.type_errors + self.field_errors + self.argument_errors + self.enum_value_errors + self.plural_errors
 
-        expected_case = get_case_for_element(ElementType.TYPE, context, config)
+
+def _check_type(
+    schema: GraphQLSchema,
+    config: NamingConventionConfig,
+    type_name: str,
+    object_type: GraphQLNamedType,
+    violations: _NamingViolations,
+) -> None:
+    """Check the naming conventions of a type and its fields, arguments and values."""
+    context = TYPE_CONTEXTS.get(type(object_type))
+
+    if not context:
+        return
+
+    expected_case = get_case_for_element(ElementType.TYPE, context, config)
+    if expected_case:
+        matches, suggestion = _matches_case_format(type_name, expected_case)
+        if not matches:
+            violations.type_errors.append(
+                f"[naming] Type '{type_name}' should be {expected_case.value} (suggestion: '{suggestion}')"
+            )
+
+    if isinstance(object_type, GraphQLEnumType):
+        expected_case = get_case_for_element(ElementType.ENUM_VALUE, None, config)
         if expected_case:
-            matches, suggestion = _matches_case_format(type_name, expected_case)
-            if not matches:
-                type_errors.append(
-                    f"[naming] Type '{type_name}' should be {expected_case.value} (suggestion: '{suggestion}')"
+            pattern = _CASE_FORMAT_PATTERNS[expected_case]
+            value_names = [value_name for value_name in object_type.values if not pattern.fullmatch(value_name)]
+            for value_name, suggestion in zip(value_names, convert_names(value_names, expected_case), strict=True):
+                if value_name != suggestion:
+                    violations.enum_value_errors.append(
+                        f"[naming] Enum value '{object_type.name}.{value_name}' should be {expected_case.value} "
+                        f"(suggestion: '{suggestion}')"
+                    )
+
+    if isinstance(object_type, GraphQLObjectType | GraphQLInterfaceType | GraphQLInputObjectType):
+        field_case = get_case_for_element(ElementType.FIELD, context, config)
+        argument_case = (
+            get_case_for_element(ElementType.ARGUMENT, ContextType.FIELD, config)
+            if isinstance(object_type, GraphQLObjectType | GraphQLInterfaceType)
+            else None
+        )
+
+        for field_name, field_definition in object_type.fields.items():
+            if field_case:
+                matches, suggestion = _matches_case_format(field_name, field_case)
+                if not matches and not is_instance_tag_field(field_name, field_definition, schema):
+                    violations.field_errors.append(
+                        f"[naming] Field '{object_type.name}.{field_name}' should be {field_case.value} "
+                        f"(suggestion: '{suggestion}')"
+                    )
+
+            field_case_value = get_field_case(field_definition)
+            if (
+                isinstance(object_type, GraphQLObjectType | GraphQLInterfaceType)
+                and field_case_value
+                not in (
+                    FieldCase.DEFAULT,
+                    FieldCase.NON_NULL,
+                )
+                and not _is_plural(field_name)
+            ):
+                violations.plural_errors.append(
+                    f"[naming] List field '{object_type.name}.{field_name}' should be plural "
+                    f"(suggestion: '{_plural(field_name)}')"
                 )
 
-        if isinstance(object_type, GraphQLEnumType):
-            expected_case = get_case_for_element(ElementType.ENUM_VALUE, None, config)
-            if expected_case:
-                for value_name in object_type.values:
-                    matches, suggestion = _matches_case_format(value_name, expected_case)
+            if argument_case and field_definition.args:
+                for arg_name in field_definition.args:
+                    matches, suggestion = _matches_case_format(arg_name, argument_case)
                     if not matches:
-                        enum_value_errors.append(
-                            f"[naming] Enum value '{object_type.name}.{value_name}' should be {expected_case.value} "
-                            f"(suggestion: '{suggestion}')"
+                        violations.argument_errors.append(
+                            f"[naming] Argument '{object_type.name}.{field_name}({arg_name})' should be "
+                            f"{argument_case.value} (suggestion: '{suggestion}')"
                         )
 
-        if isinstance(object_type, GraphQLObjectType | GraphQLInterfaceType | GraphQLInputObjectType):
-            field_case = get_case_for_element(ElementType.FIELD, context, config)
-            argument_case = (
-                get_case_for_element(ElementType.ARGUMENT, ContextType.FIELD, config)
-                if isinstance(object_type, GraphQLObjectType | GraphQLInterfaceType)
-                else None
-            )
 
-            for field_name, field in object_type.fields.items():
-                if field_case:
-                    matches, suggestion = _matches_case_format(field_name, field_case)
-                    if not is_instance_tag_field(field_name, field, schema) and not matches:
-                        field_errors.append(
-                            f"[naming] Field '{object_type.name}.{field_name}' should be {field_case.value} "
-                            f"(suggestion: '{suggestion}')"
-                        )
+def _check_types(shared: tuple[GraphQLSchema, NamingConventionConfig], type_names: list[str]) -> _NamingViolations:
+    """Check the naming conventions of some types of a schema, in a worker process."""
+    schema, config = shared
+    violations = _NamingViolations()
+    for type_name in type_names:
+        _check_type(schema, config, type_name, schema.type_map[type_name], violations)
+    return violations
 
-                field_case_value = get_field_case(field)
-                if (
-                    isinstance(object_type, GraphQLObjectType | GraphQLInterfaceType)
-                    and field_case_value
-                    not in (
-                        FieldCase.DEFAULT,
-                        FieldCase.NON_NULL,
-                    )
-                    and not _is_plural(field_name)
-                ):
-                    suggestion = _inflect_engine.plural(field_name)
-                    plural_errors.append(
-                        f"[naming] List field '{object_type.name}.{field_name}' should be plural "
-                        f"(suggestion: '{suggestion}')"
-                    )
 
-                if argument_case and field.args:
-                    for arg_name in field.args:
-                        matches, suggestion = _matches_case_format(arg_name, argument_case)
-                        if not matches:
-                            argument_errors.append(
-                                f"[naming] Argument '{object_type.name}.{field_name}({arg_name})' should be "
-                                f"{argument_case.value} (suggestion: '{suggestion}')"
-                            )
+def check_naming_conventions(
+    schema: GraphQLSchema,
+    config: NamingConventionConfig,
+    max_workers: int | None = None,
+) -> list[str]:
+    """Check all naming conventions for the schema.
+
+    Args:
+        schema: The GraphQL schema
+        config: The naming convention configuration
+        max_workers: Optional maximum number of worker processes checking chunks of the types in parallel,
+            defaults to the number of CPUs
+
+    Returns:
+        List of error messages for violations
+    """
+    type_names = [type_name for type_name in schema.type_map if not is_introspection_type(type_name)]
+    chunks = [type_names[start : start + CHECK_CHUNK_SIZE] for start in range(0, len(type_names), CHECK_CHUNK_SIZE)]
+
+    violations = _NamingViolations()
+    for chunk_violations in fork_map(_check_types, (schema, config), chunks, max_workers):
+        violations.extend(chunk_violations)
 
-    return type_errors + field_errors + argument_errors + enum_value_errors + plural_errors
+    return violations.messages()
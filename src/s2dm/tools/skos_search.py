@@ -8,13 +8,10 @@ from rdflib import Graph, Literal
 from rdflib.plugins.sparql import prepareQuery
 from rdflib.query import ResultRow
 
-from s2dm.tools.string import normalize_whitespace
+from s2dm.tools.string import NO_LIMIT_KEYWORDS, normalize_whitespace
 
-# Module-level constant for limit keywords
-NO_LIMIT_KEYWORDS = {"inf", "infinity", "-1", "no", "none", "unlimited", "all"}
 
-
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Represents a search result from SPARQL query.
 
@@ -1,5 +1,8 @@
 import re
 
+# Keywords that can be given instead of a number to disable a result limit
+NO_LIMIT_KEYWORDS = {"inf", "infinity", "-1", "no", "none", "unlimited", "all"}
+
 
 def normalize_whitespace(text: str) -> str:
     """Normalize whitespace in text by collapsing multiple spaces/newlines."""
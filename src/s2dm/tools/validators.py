@@ -1,5 +1,4 @@
 import click
-import langcodes
 
 
 def validate_language_tag(ctx: click.Context, param: click.Parameter, value: str) -> str:
@@ -20,7 +19,9 @@ def validate_language_tag(ctx: click.Context, param: click.Parameter, value: str
     if not value.strip():
         raise click.BadParameter("Language tag cannot be empty")
 
-    # Check for valid BCP 47 format using langcodes
+    # Check for valid BCP 47 format using langcodes, which is slow to import
+    import langcodes
+
     try:
         if not langcodes.get(value).is_valid():
             raise click.BadParameter(f"'{value}' is not a valid BCP 47 language tag")
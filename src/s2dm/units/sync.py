@@ -76,7 +76,7 @@ class UnitEnumErrorMessages:
     INVALID_SDL = "Generated SDL for {enum_type} is not valid GraphQL"
 
 
-@dataclass
+@dataclass(slots=True)
 class UnitRow:
     """A single unit row from the SPARQL result.
 
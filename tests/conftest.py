@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import Callable, Generator
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -15,7 +15,8 @@ from hypothesis import strategies as st
 from hypothesis.strategies import composite
 
 from s2dm.exporters.utils.extraction import get_all_named_types
-from s2dm.exporters.utils.schema_loader import ensure_query
+from s2dm.exporters.utils.schema_cache import set_default_schema_cache
+from s2dm.exporters.utils.schema_loader import ensure_query, set_ingest_workers
 from s2dm.idgen.models import IDGenerationSpec
 from s2dm.units.sync import UnitRow, _uri_to_enum_symbol
 
@@ -49,6 +50,16 @@ class TestSchemaData:
     BREAKING_SCHEMA = TESTS_DATA_DIR / "breaking.graphql"
 
 
+@pytest.fixture(autouse=True)
+def isolated_schema_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Generator[Path, None, None]:
+    """Point the CLI schema cache to a per-test directory and reset the loader settings afterwards."""
+    cache_dir = tmp_path / "schema_cache"
+    monkeypatch.setenv("S2DM_CACHE_DIR", str(cache_dir))
+    yield cache_dir
+    set_default_schema_cache(None)
+    set_ingest_workers(None)
+
+
 @pytest.fixture(scope="session")
 def spec_directory() -> Path:
     """Return path to S2DM spec files."""
@@ -266,8 +277,8 @@ def units_sync_mocks(
     test_units_dir = tmp_path / "test_units"
     monkeypatch.setattr("s2dm.cli.DEFAULT_QUDT_UNITS_DIR", test_units_dir)
 
-    monkeypatch.setattr("s2dm.cli.sync_qudt_units", mock_sync_qudt_units)
-    monkeypatch.setattr("s2dm.cli.get_latest_qudt_version", mock_get_latest_qudt_version)
+    monkeypatch.setattr("s2dm.units.sync.sync_qudt_units", mock_sync_qudt_units)
+    monkeypatch.setattr("s2dm.units.sync.get_latest_qudt_version", mock_get_latest_qudt_version)
     return mock_sync_qudt_units, mock_get_latest_qudt_version
 
 
@@ -0,0 +1,265 @@
+import json
+import pickle
+import zlib
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from graphql import GraphQLObjectType, print_ast
+from graphql.language.ast import Node
+
+from s2dm.cli import cli
+from s2dm.exporters.utils.annotated_artifact import (
+    AnnotatedSchemaArtifact,
+    read_annotated_schema_artifact,
+    write_annotated_schema_artifact,
+)
+from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
+from s2dm.exporters.utils.directive import get_directive_arguments
+from s2dm.exporters.utils.schema_loader import (
+    SchemaSession,
+    load_and_process_schema,
+    print_schema_with_directives_preserved,
+)
+from tests.conftest import TestSchemaData as TSD
+
+EXPANDED_INSTANCES_SCHEMA = Path(__file__).parent / "test_expanded_instances" / "test_schema.graphql"
+
+NAMING_CONFIG = """type:
+  object: PascalCase
+field:
+  object: snake_case
+enumValue: MACROCASE
+instanceTag: COBOL-CASE
+"""
+
+
+@pytest.fixture
+def naming_config_path(tmp_path: Path) -> Path:
+    path = tmp_path / "naming.yaml"
+    path.write_text(NAMING_CONFIG)
+    return path
+
+
+@pytest.fixture
+def expanded_schema(spec_directory: Path, naming_config_path: Path) -> AnnotatedSchema:
+    annotated_schema, _, _ = load_and_process_schema(
+        [spec_directory, EXPANDED_INSTANCES_SCHEMA],
+        naming_config_path=naming_config_path,
+        expanded_instances=True,
+        session=SchemaSession(),
+    )
+    return annotated_schema
+
+
+def test_round_trip_keeps_schema_and_metadata(expanded_schema: AnnotatedSchema, tmp_path: Path) -> None:
+    path = tmp_path / "annotated.s2dm"
+    write_annotated_schema_artifact(AnnotatedSchemaArtifact(expanded_schema), path)
+
+    artifact = read_annotated_schema_artifact(path)
+    loaded = artifact.annotated_schema
+
+    assert print_schema_with_directives_preserved(loaded.schema) == print_schema_with_directives_preserved(
+        expanded_schema.schema
+    )
+    assert list(loaded.schema.type_map) == list(expanded_schema.schema.type_map)
+    assert loaded.type_metadata == expanded_schema.type_metadata
+    assert loaded.field_metadata.keys() == expanded_schema.field_metadata.keys()
+    assert artifact.query_document is None
+    assert artifact.root_type is None
+
+    expanded_keys = [key for key, metadata in expanded_schema.field_metadata.items() if metadata.is_expanded]
+    assert expanded_keys
+    for key in expanded_keys:
+        original, restored = expanded_schema.field_metadata[key], loaded.field_metadata[key]
+        assert list(restored.resolved_names) == list(original.resolved_names)
+        assert restored.resolved_type == original.resolved_type
+        assert restored.instances == original.instances
+        assert original.original_field is not None and restored.original_field is not None
+        assert str(restored.original_field.type) == str(original.original_field.type)
+
+    # Directives are read from the restored AST nodes
+    vehicle = loaded.schema.type_map["Vehicle"]
+    assert isinstance(vehicle, GraphQLObjectType)
+    assert get_directive_arguments(vehicle.fields["features"], "cardinality") == {"min": 1, "max": 10}
+    # Referenced types are the types of the loaded schema
+    assert vehicle.fields["door"].type.of_type is loaded.schema.type_map["DoorRow"]
+
+
+def test_round_trip_keeps_processing_inputs(spec_directory: Path, tmp_path: Path) -> None:
+    annotated_schema, _, query_document = load_and_process_schema(
+        [spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH],
+        selection_query_path=TSD.SCHEMA1_QUERY,
+        root_type="Vehicle",
+        session=SchemaSession(),
+    )
+    assert query_document is not None
+    path = tmp_path / "annotated.s2dm"
+    write_annotated_schema_artifact(AnnotatedSchemaArtifact(annotated_schema, query_document, "Vehicle"), path)
+
+    artifact = read_annotated_schema_artifact(path)
+
+    assert artifact.query_document is not None
+    assert print_ast(artifact.query_document) == print_ast(query_document)
+    assert artifact.query_document.loc is None
+    assert artifact.root_type == "Vehicle"
+
+
+def test_equal_ast_nodes_are_stored_once(expanded_schema: AnnotatedSchema, tmp_path: Path) -> None:
+    path = tmp_path / "annotated.s2dm"
+    write_annotated_schema_artifact(AnnotatedSchemaArtifact(expanded_schema), path)
+
+    schema = read_annotated_schema_artifact(path).annotated_schema.schema
+
+    door = schema.type_map["Door"]
+    seat = schema.type_map["Seat"]
+    assert isinstance(door, GraphQLObjectType) and isinstance(seat, GraphQLObjectType)
+    door_range = door.fields["position"].ast_node
+    seat_range = seat.fields["height"].ast_node
+    assert isinstance(door_range, Node) and isinstance(seat_range, Node)
+    assert door_range.directives[0] is seat_range.directives[0]  # type: ignore[attr-defined]
+
+
+def test_read_rejects_other_files(expanded_schema: AnnotatedSchema, tmp_path: Path) -> None:
+    not_an_artifact = tmp_path / "schema.graphql"
+    not_an_artifact.write_text("type Query { a: Int }\n")
+    with pytest.raises(ValueError, match="not an annotated schema artifact"):
+        read_annotated_schema_artifact(not_an_artifact)
+
+    path = tmp_path / "annotated.s2dm"
+    write_annotated_schema_artifact(AnnotatedSchemaArtifact(expanded_schema), path)
+    header, _, body = path.read_bytes().partition(b"\n")
+
+    other_version = tmp_path / "other_version.s2dm"
+    other_version.write_bytes(header.replace(b" 1 ", b" 0 ", 1) + b"\n" + body)
+    with pytest.raises(ValueError, match="compose it again"):
+        read_annotated_schema_artifact(other_version)
+
+    truncated = tmp_path / "truncated.s2dm"
+    truncated.write_bytes(header + b"\n" + body[: len(body) // 2])
+    with pytest.raises(ValueError, match="not a valid annotated schema artifact"):
+        read_annotated_schema_artifact(truncated)
+
+    foreign_class = tmp_path / "foreign_class.s2dm"
+    foreign_class.write_bytes(header + b"\n" + zlib.compress(pickle.dumps([(Path, "Query")])))
+    with pytest.raises(ValueError, match="cannot contain 'pathlib"):
+        read_annotated_schema_artifact(foreign_class)
+
+
+def pickled_string(value: str) -> bytes:
+    encoded = value.encode()
+    return pickle.SHORT_BINUNICODE + bytes([len(encoded)]) + encoded
+
+
+@pytest.mark.parametrize(
+    "module, name",
+    [
+        ("s2dm.exporters.utils.annotated_artifact", "os.system"),
+        ("s2dm.exporters.utils.annotated_artifact", "pickle.loads"),
+        ("s2dm.cli", "compose"),
+        ("os", "system"),
+    ],
+)
+def test_read_rejects_crafted_globals(expanded_schema: AnnotatedSchema, tmp_path: Path, module: str, name: str) -> None:
+    path = tmp_path / "annotated.s2dm"
+    write_annotated_schema_artifact(AnnotatedSchemaArtifact(expanded_schema), path)
+    header, _, _ = path.read_bytes().partition(b"\n")
+    marker = tmp_path / "called"
+
+    # Calls `module.name` with a shell command creating the marker file
+    payload = (
+        pickle.PROTO
+        + bytes([4])
+        + pickled_string(module)
+        + pickled_string(name)
+        + pickle.STACK_GLOBAL
+        + pickled_string(f"touch {marker}")
+        + pickle.TUPLE1
+        + pickle.REDUCE
+        + pickle.STOP
+    )
+    crafted = tmp_path / "crafted.s2dm"
+    crafted.write_bytes(header + b"\n" + zlib.compress(payload))
+
+    with pytest.raises(ValueError, match="cannot contain"):
+        read_annotated_schema_artifact(crafted)
+    assert not marker.exists()
+
+
+def test_cli_exports_from_annotated_artifact(spec_directory: Path, naming_config_path: Path, tmp_path: Path) -> None:
+    runner = CliRunner()
+    schema_args = ["-s", str(spec_directory), "-s", str(EXPANDED_INSTANCES_SCHEMA)]
+    processing_args = [*schema_args, "--naming-config", str(naming_config_path), "-e"]
+    artifact_path = tmp_path / "annotated.s2dm"
+
+    result = runner.invoke(
+        cli,
+        ["compose", *processing_args, "-o", str(tmp_path / "composed.graphql"), "--emit-annotated", str(artifact_path)],
+    )
+    assert result.exit_code == 0, result.output
+    assert artifact_path.exists()
+
+    for exporter in ("jsonschema", "vspec"):
+        processed_output = tmp_path / f"processed.{exporter}"
+        result = runner.invoke(cli, ["export", exporter, *processing_args, "-o", str(processed_output)])
+        assert result.exit_code == 0, result.output
+
+        artifact_output = tmp_path / f"artifact.{exporter}"
+        result = runner.invoke(cli, ["export", exporter, "--annotated", str(artifact_path), "-o", str(artifact_output)])
+        assert result.exit_code == 0, result.output
+
+        if exporter == "jsonschema":
+            assert json.loads(artifact_output.read_text()) == json.loads(processed_output.read_text())
+        else:
+            assert artifact_output.read_text() == processed_output.read_text()
+
+    result = runner.invoke(
+        cli, ["export", "vspec", "--annotated", str(artifact_path), "-e", "-o", str(tmp_path / "out.vspec")]
+    )
+    assert result.exit_code != 0
+    assert "--annotated cannot be used with --expanded-instances" in result.output
+
+    result = runner.invoke(cli, ["export", "vspec", "-o", str(tmp_path / "out.vspec")])
+    assert result.exit_code != 0
+    assert "Missing option '--schema' / '-s' or '--annotated'" in result.output
+
+
+def test_cli_annotated_artifact_keeps_selection_query(spec_directory: Path, tmp_path: Path) -> None:
+    runner = CliRunner()
+    schema_args: list[str] = []
+    for schema in (spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH):
+        schema_args += ["-s", str(schema)]
+    artifact_path = tmp_path / "annotated.s2dm"
+    unfiltered_artifact_path = tmp_path / "unfiltered.s2dm"
+
+    for args, path in (
+        ([*schema_args, "-q", str(TSD.SCHEMA1_QUERY)], artifact_path),
+        (schema_args, unfiltered_artifact_path),
+    ):
+        result = runner.invoke(
+            cli, ["compose", *args, "-o", str(tmp_path / "composed.graphql"), "--emit-annotated", str(path)]
+        )
+        assert result.exit_code == 0, result.output
+
+    proto_output = tmp_path / "schema.proto"
+    result = runner.invoke(cli, ["export", "protobuf", "--annotated", str(artifact_path), "-o", str(proto_output)])
+    assert result.exit_code == 0, result.output
+    assert "message Selection" in proto_output.read_text()
+
+    result = runner.invoke(
+        cli, ["export", "protobuf", "--annotated", str(unfiltered_artifact_path), "-o", str(proto_output)]
+    )
+    assert result.exit_code != 0
+    assert "composed without a selection query" in result.output
+
+    output_dir = tmp_path / "all"
+    result = runner.invoke(cli, ["export", "all", "--annotated", str(artifact_path), "-o", str(output_dir)])
+    assert result.exit_code == 0, result.output
+    assert (output_dir / "protobuf" / "schema.proto").exists()
+    assert not (output_dir / "skos").exists()
+
+    result = runner.invoke(
+        cli, ["export", "all", "--annotated", str(artifact_path), "-o", str(output_dir), "-x", "skos-skeleton"]
+    )
+    assert result.exit_code != 0
+    assert "require the unprocessed schema" in result.output
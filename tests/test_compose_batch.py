@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from s2dm.cli import cli
+from s2dm.exporters.utils.compose_batch import ComposeBatchInputs, compose_queries, resolve_query_files
+from s2dm.exporters.utils.schema_loader import load_schema_with_source_map
+from tests.conftest import TestSchemaData as TSD
+
+SPEED_QUERY = "query { vehicle { averageSpeed } }"
+ADAS_QUERY = "query { vehicle { adas { abs { isEngaged } } } }"
+
+
+@pytest.fixture
+def schema_paths(spec_directory: Path) -> list[Path]:
+    return [spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH]
+
+
+@pytest.fixture
+def query_dir(tmp_path: Path) -> Path:
+    query_dir = tmp_path / "queries"
+    query_dir.mkdir()
+    (query_dir / "speed.graphql").write_text(SPEED_QUERY)
+    (query_dir / "adas.graphql").write_text(ADAS_QUERY)
+    (query_dir / "notes.txt").write_text("not a query")
+    return query_dir
+
+
+def test_resolve_query_files(query_dir: Path) -> None:
+    expected = [query_dir / "adas.graphql", query_dir / "speed.graphql"]
+
+    assert resolve_query_files(str(query_dir)) == expected
+    assert resolve_query_files(str(query_dir / "*.graphql")) == expected
+    assert resolve_query_files(str(query_dir / "s*.graphql")) == [query_dir / "speed.graphql"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_compose_queries(tmp_path: Path, schema_paths: list[Path], query_dir: Path, max_workers: int) -> None:
+    schema, source_map = load_schema_with_source_map(schema_paths)
+    (query_dir / "broken.graphql").write_text("query { vehicle { noSuchField } }")
+    inputs = ComposeBatchInputs(schema=schema, source_map=source_map, output_dir=tmp_path / "out")
+
+    results = compose_queries(inputs, resolve_query_files(str(query_dir)), max_workers)
+
+    assert [result.query_path.name for result in results] == ["adas.graphql", "broken.graphql", "speed.graphql"]
+    adas, broken, speed = results
+    assert adas.error is None and speed.error is None
+    assert broken.error is not None and not broken.output.exists()
+    assert "averageSpeed" in speed.output.read_text()
+    assert "averageSpeed" not in adas.output.read_text()
+    assert all(result.seconds >= 0 for result in results)
+
+
+def test_compose_queries_rejects_duplicate_names(tmp_path: Path, schema_paths: list[Path], query_dir: Path) -> None:
+    schema, source_map = load_schema_with_source_map(schema_paths)
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    (other_dir / "speed.graphql").write_text(SPEED_QUERY)
+    inputs = ComposeBatchInputs(schema=schema, source_map=source_map, output_dir=tmp_path / "out")
+
+    with pytest.raises(ValueError, match="speed"):
+        compose_queries(inputs, [query_dir / "speed.graphql", other_dir / "speed.graphql"])
+
+
+def test_compose_batch_matches_single_compose(tmp_path: Path, schema_paths: list[Path], query_dir: Path) -> None:
+    runner = CliRunner()
+    schema_args = [arg for path in schema_paths for arg in ("-s", str(path))]
+    output_dir = tmp_path / "batch"
+
+    result = runner.invoke(cli, ["compose", *schema_args, "-Q", str(query_dir), "-o", str(output_dir)])
+    assert result.exit_code == 0, result.output
+    assert "speed.graphql" in result.output
+
+    for query_name in ("speed", "adas"):
+        single_output = tmp_path / f"{query_name}_single.graphql"
+        query_file = query_dir / f"{query_name}.graphql"
+        result = runner.invoke(cli, ["compose", *schema_args, "-q", str(query_file), "-o", str(single_output)])
+        assert result.exit_code == 0, result.output
+        assert (output_dir / f"{query_name}.graphql").read_text() == single_output.read_text()
+
+
+def test_compose_batch_reports_failed_queries(tmp_path: Path, schema_paths: list[Path], query_dir: Path) -> None:
+    (query_dir / "broken.graphql").write_text("query { vehicle { noSuchField } }")
+    schema_args = [arg for path in schema_paths for arg in ("-s", str(path))]
+
+    result = CliRunner().invoke(cli, ["compose", *schema_args, "-Q", str(query_dir), "-o", str(tmp_path / "out")])
+
+    assert result.exit_code == 1
+    assert (tmp_path / "out" / "speed.graphql").exists()
+
+
+def test_compose_batch_requires_query_files(tmp_path: Path, schema_paths: list[Path]) -> None:
+    schema_args = [arg for path in schema_paths for arg in ("-s", str(path))]
+
+    result = CliRunner().invoke(cli, ["compose", *schema_args, "-Q", str(tmp_path / "*.graphql"), "-o", str(tmp_path)])
+
+    assert result.exit_code == 2
+    assert "No selection query files found" in result.output
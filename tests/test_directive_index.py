@@ -0,0 +1,84 @@
+import gc
+from typing import cast
+
+from graphql import GraphQLObjectType, build_schema, parse
+
+from s2dm.exporters.utils.directive import (
+    DirectiveIndex,
+    get_directive_arguments,
+    get_directive_index,
+    has_given_directive,
+)
+from s2dm.exporters.utils.naming import apply_naming_to_schema
+from s2dm.exporters.utils.naming_config import CaseFormat, NamingConventionConfig, TypeNamingConfig
+from s2dm.exporters.utils.schema_fork import fork_schema
+from s2dm.exporters.utils.schema_loader import prune_schema_using_query_selection
+
+SCHEMA = """
+directive @range(min: Float, max: Float) on FIELD_DEFINITION
+directive @metadata(comment: String, tags: [String]) on FIELD_DEFINITION | OBJECT
+directive @noDuplicates on FIELD_DEFINITION
+type Query { vehicle: Vehicle }
+type Vehicle @metadata(comment: "A vehicle") {
+  speed: Int @range(min: 0, max: 250.5) @metadata(comment: "Speed", tags: ["a", "b"])
+  codes: [String] @noDuplicates
+  door: Door
+}
+type Door { isOpen: Boolean }
+"""
+
+
+def object_type(schema_type: object) -> GraphQLObjectType:
+    return cast(GraphQLObjectType, schema_type)
+
+
+def test_parses_directive_arguments() -> None:
+    schema = build_schema(SCHEMA)
+    vehicle = object_type(schema.type_map["Vehicle"])
+    index = DirectiveIndex()
+
+    directives = index.directives(vehicle.fields["speed"])
+
+    assert directives["range"] == {"min": 0, "max": 250.5}
+    assert directives["metadata"]["comment"] == "Speed"
+    assert index.directives(vehicle.fields["codes"]) == {"noDuplicates": {}}
+    assert index.directives(vehicle.fields["door"]) == {}
+    assert index.directives(vehicle) == {"metadata": {"comment": "A vehicle"}}
+    assert index.directives(vehicle.fields["speed"]) is directives
+
+
+def test_entries_are_removed_with_their_ast_nodes() -> None:
+    index = DirectiveIndex()
+    schema = build_schema(SCHEMA)
+    index.directives(object_type(schema.type_map["Vehicle"]).fields["speed"])
+    assert len(index) == 1
+
+    del schema
+    gc.collect()
+
+    assert len(index) == 0
+
+
+def test_stays_valid_after_naming_and_pruning() -> None:
+    schema = fork_schema(build_schema(SCHEMA))
+    speed = object_type(schema.type_map["Vehicle"]).fields["speed"]
+    assert get_directive_arguments(speed, "range") == {"min": 0, "max": 250.5}
+
+    naming_config = NamingConventionConfig(type=TypeNamingConfig(object=CaseFormat.MACRO_CASE))
+    apply_naming_to_schema(schema, naming_config)
+    schema = prune_schema_using_query_selection(schema, parse("{ vehicle { speed } }"))
+
+    vehicle = object_type(schema.type_map["VEHICLE"])
+    assert list(vehicle.fields) == ["speed"]
+    assert get_directive_arguments(vehicle.fields["speed"], "range") == {"min": 0, "max": 250.5}
+    assert has_given_directive(vehicle, "metadata")
+    assert not has_given_directive(vehicle.fields["speed"], "noDuplicates")
+
+
+def test_returned_arguments_do_not_change_the_index() -> None:
+    schema = build_schema(SCHEMA)
+    speed = object_type(schema.type_map["Vehicle"]).fields["speed"]
+
+    get_directive_arguments(speed, "range")["min"] = 100
+
+    assert get_directive_index().directives(speed)["range"]["min"] == 0
@@ -115,6 +115,21 @@ def test_export_vspec(runner: CliRunner, tmp_outputs: Path, spec_directory: Path
     assert "Vehicle_ADAS_ObstacleDetection:" in content
 
 
+def test_export_vspec_maps_metadata(runner: CliRunner, tmp_outputs: Path, spec_directory: Path) -> None:
+    schema_file = tmp_outputs / "metadata.graphql"
+    schema_file.write_text(
+        'type Vehicle { speed: Float @metadata(comment: "Measured at the wheels", vssType: "sensor") }\n'
+        "extend type Query { vehicle: Vehicle }\n"
+    )
+    out = tmp_outputs / "metadata.vspec"
+    result = runner.invoke(cli, ["export", "vspec", "-s", str(spec_directory), "-s", str(schema_file), "-o", str(out)])
+    assert result.exit_code == 0, result.output
+
+    content = out.read_text()
+    assert "comment: Measured at the wheels" in content
+    assert "type: sensor" in content
+
+
 def test_export_jsonschema(runner: CliRunner, tmp_outputs: Path, spec_directory: Path, units_directory: Path) -> None:
     out = tmp_outputs / "jsonschema.yaml"
     result = runner.invoke(
@@ -1097,6 +1112,38 @@ def test_stats_graphql(runner: CliRunner, spec_directory: Path, units_directory:
     assert '"UInt32": 1' in normalize_whitespace(result.output)
 
 
+def test_stats_graphql_expansion_estimate(runner: CliRunner, spec_directory: Path) -> None:
+    result = runner.invoke(
+        cli,
+        ["stats", "graphql", "-s", str(spec_directory), "-s", "tests/test_expanded_instances/test_schema.graphql"],
+    )
+
+    assert result.exit_code == 0, normalize_whitespace(result.output)
+    assert '"expanded_paths": 27' in normalize_whitespace(result.output)
+
+
+def test_max_expanded_paths_aborts_export(runner: CliRunner, tmp_outputs: Path, spec_directory: Path) -> None:
+    args = [
+        "export",
+        "jsonschema",
+        "-s",
+        str(spec_directory),
+        "-s",
+        "tests/test_expanded_instances/test_schema.graphql",
+        "-o",
+        str(tmp_outputs / "expanded.json"),
+        "--expanded-instances",
+    ]
+
+    result = runner.invoke(cli, [*args, "--max-expanded-paths", "10"])
+    assert result.exit_code == 1
+    assert "Instance expansion would produce 38 paths" in normalize_whitespace(result.output)
+    assert not (tmp_outputs / "expanded.json").exists()
+
+    result = runner.invoke(cli, [*args, "--max-expanded-paths", "38"])
+    assert result.exit_code == 0, normalize_whitespace(result.output)
+
+
 def test_units_sync_cli(
     runner: CliRunner,
     units_sync_mocks: tuple[Callable[..., list[Path]], Callable[[], str]],
@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from s2dm.cli import cli
+from s2dm.exporters.export_all import EXPORTERS, ExportInputs, ExportOptions, run_exporters
+from s2dm.exporters.utils.forked_pool import can_fork
+from s2dm.exporters.utils.schema_loader import SchemaSession, load_and_process_schema
+from tests.conftest import TestSchemaData as TSD
+
+
+@pytest.fixture
+def schema_args(spec_directory: Path) -> list[str]:
+    args: list[str] = []
+    for schema in (spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH):
+        args += ["-s", str(schema)]
+    return args
+
+
+def test_export_all_writes_every_output(tmp_path: Path, schema_args: list[str]) -> None:
+    output_dir = tmp_path / "artifacts"
+    result = CliRunner().invoke(
+        cli,
+        ["export", "all", *schema_args, "-q", str(TSD.SCHEMA1_QUERY), "-r", "Vehicle", "-o", str(output_dir)]
+        + ["--avro-namespace", "com.example", "--workers", "2"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert (output_dir / "shacl" / "schema.ttl").exists()
+    assert (output_dir / "jsonschema" / "schema.json").exists()
+    assert (output_dir / "vspec" / "schema.vspec").exists()
+    assert (output_dir / "avro" / "schema.avsc").exists()
+    assert (output_dir / "avro" / "protocol").is_dir()
+    assert (output_dir / "protobuf" / "schema.proto").exists()
+    assert (output_dir / "skos" / "schema.ttl").exists()
+
+
+def test_export_all_matches_single_exporters(tmp_path: Path, schema_args: list[str]) -> None:
+    runner = CliRunner()
+    output_dir = tmp_path / "artifacts"
+    result = runner.invoke(cli, ["export", "all", *schema_args, "-o", str(output_dir)])
+    assert result.exit_code == 0, result.output
+
+    for exporter, output in (("jsonschema", "jsonschema/schema.json"), ("vspec", "vspec/schema.vspec")):
+        single_output = tmp_path / exporter
+        result = runner.invoke(cli, ["export", exporter, *schema_args, "-o", str(single_output)])
+        assert result.exit_code == 0, result.output
+        assert (output_dir / output).read_text() == single_output.read_text()
+
+    # Exporters that need a selection query or an Avro namespace are skipped by default
+    assert not (output_dir / "protobuf").exists()
+    assert not (output_dir / "avro").exists()
+
+
+def test_export_all_selected_exporter_requires_query(tmp_path: Path, schema_args: list[str]) -> None:
+    result = CliRunner().invoke(cli, ["export", "all", *schema_args, "-o", str(tmp_path), "-x", "protobuf"])
+
+    assert result.exit_code != 0
+    assert "require a selection query" in result.output
+
+
+def fail_export(inputs: ExportInputs, options: ExportOptions, output_dir: Path) -> Path:
+    raise OSError("disk full")
+
+
+@pytest.mark.parametrize(
+    "workers", ["1", pytest.param("2", marks=pytest.mark.skipif(not can_fork(), reason="Cannot fork workers"))]
+)
+def test_export_all_reports_failing_exporter(
+    tmp_path: Path, schema_args: list[str], monkeypatch: pytest.MonkeyPatch, workers: str
+) -> None:
+    monkeypatch.setitem(EXPORTERS, "vspec", fail_export)
+
+    result = CliRunner().invoke(
+        cli,
+        ["export", "all", *schema_args, "-o", str(tmp_path), "-x", "jsonschema", "-x", "vspec", "--workers", workers],
+    )
+
+    assert result.exit_code == 1
+    assert "vspec failed: disk full" in result.output
+    assert "Usage:" not in result.output
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_run_exporters(tmp_path: Path, spec_directory: Path, max_workers: int) -> None:
+    session = SchemaSession()
+    schema_paths = [spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH]
+    annotated_schema, _, _ = load_and_process_schema(schema_paths, session=session)
+    inputs = ExportInputs(annotated_schema=annotated_schema, schema=session.schema(schema_paths))
+
+    outputs = run_exporters(inputs, ["vspec", "jsonschema", "skos-skeleton"], tmp_path, max_workers=max_workers)
+
+    assert list(outputs) == ["vspec", "jsonschema", "skos-skeleton"]
+    assert all(output.exists() for output in outputs.values())
+
+
+def test_run_exporters_rejects_missing_inputs(tmp_path: Path, spec_directory: Path) -> None:
+    session = SchemaSession()
+    schema_paths = [spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH]
+    annotated_schema, _, _ = load_and_process_schema(schema_paths, session=session)
+    inputs = ExportInputs(annotated_schema=annotated_schema, schema=session.schema(schema_paths))
+
+    with pytest.raises(ValueError, match="Unknown exporters"):
+        run_exporters(inputs, ["yaml"], tmp_path)
+    with pytest.raises(ValueError, match="selection query"):
+        run_exporters(inputs, ["avro-schema"], tmp_path, ExportOptions(avro_namespace="com.example"))
+    with pytest.raises(ValueError, match="Avro namespace"):
+        run_exporters(inputs, ["avro-protocol"], tmp_path)
+    with pytest.raises(ValueError, match="unprocessed schema"):
+        run_exporters(ExportInputs(annotated_schema=annotated_schema), ["skos-skeleton"], tmp_path)
+    assert set(EXPORTERS) >= {"shacl", "jsonschema", "vspec", "avro-schema", "avro-protocol", "protobuf"}
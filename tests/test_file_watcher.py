@@ -0,0 +1,93 @@
+import os
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from s2dm.cli import cli
+from s2dm.exporters.utils.file_watcher import FileWatcher, watch_files
+
+
+def bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_poll_reports_content_changes(tmp_path: Path) -> None:
+    first = tmp_path / "first.graphql"
+    second = tmp_path / "second.graphql"
+    first.write_text("type A { a: Int }")
+    second.write_text("type B { b: Int }")
+    watcher = FileWatcher([first, second])
+
+    assert watcher.poll() == []
+
+    second.write_text("type B { b: Float }")
+    bump_mtime(second)
+    assert watcher.poll() == [second]
+    assert watcher.poll() == []
+
+
+def test_poll_ignores_saves_without_changes(tmp_path: Path) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    schema_file.write_text("type A { a: Int }")
+    watcher = FileWatcher([schema_file])
+
+    bump_mtime(schema_file)
+
+    assert watcher.poll() == []
+
+
+def test_poll_reports_removed_files(tmp_path: Path) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    schema_file.write_text("type A { a: Int }")
+    watcher = FileWatcher([schema_file])
+
+    schema_file.unlink()
+
+    assert watcher.poll() == [schema_file]
+
+
+def test_watch_files_calls_on_change_until_interrupted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    schema_file.write_text("type A { a: Int }")
+    polls: list[float] = []
+    changes: list[list[Path]] = []
+
+    def sleep(seconds: float) -> None:
+        polls.append(seconds)
+        if len(polls) == 2:
+            schema_file.write_text("type A { a: Float }")
+            bump_mtime(schema_file)
+
+    def on_change(changed: list[Path]) -> None:
+        changes.append(changed)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("s2dm.exporters.utils.file_watcher.time.sleep", sleep)
+
+    watch_files([schema_file], on_change, poll_interval=0.1)
+
+    assert polls == [0.1, 0.1]
+    assert changes == [[schema_file]]
+
+
+def test_watch_rebuilds_output_on_change(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    schema_file.write_text("type Query { speed: Int }")
+    output = tmp_path / "composed.graphql"
+
+    def watch_files(paths: Iterable[Path], on_change: Callable[[list[Path]], None]) -> None:
+        assert list(paths) == [schema_file]
+        assert "speed: Int" in output.read_text()
+        schema_file.write_text("type Query { speed: Float }")
+        on_change([schema_file])
+
+    monkeypatch.setattr("s2dm.cli.watch_files", watch_files)
+
+    result = CliRunner().invoke(cli, ["compose", "-s", str(schema_file), "-o", str(output), "--watch"])
+
+    assert result.exit_code == 0, result.output
+    assert "speed: Float" in output.read_text()
+    assert result.output.count("Build finished in") == 2
@@ -1,5 +1,6 @@
 import ast
 from collections.abc import Callable
+from dataclasses import fields
 
 import pytest
 from faker import Faker
@@ -92,7 +93,7 @@ def test_id_generation_changes_with_field_changes_for_enum_field_allowed_values(
     initial_id = fnv1_32_wrapper(original_id_spec, strict_mode=strict_mode)
     assert initial_id is not None
 
-    id_spec_dict = original_id_spec.__dict__.copy()
+    id_spec_dict = {field.name: getattr(original_id_spec, field.name) for field in fields(original_id_spec)}
     original_allowed_values = ast.literal_eval(id_spec_dict["allowed"])
 
     for change_fn in changes_to_test:
@@ -121,7 +122,7 @@ def test_id_generation_changes_with_field_changes_for_non_enum_field(
     initial_id = fnv1_32_wrapper(id_spec, strict_mode=strict_mode)
     assert initial_id is not None
 
-    id_spec_dict = id_spec.__dict__
+    id_spec_dict = {field.name: getattr(id_spec, field.name) for field in fields(id_spec)}
 
     # Change the field to a new value
     if field_to_change in ["name", "data_type", "unit"]:
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative time in seconds importing the CLI may take. Importing it used to take several seconds, mostly
+# spent in inflect, rdflib and the exporters. The budget leaves room for slow CI machines.
+STARTUP_BUDGET_SECONDS = 1.5
+
+# Modules that only the commands using them may import
+DEFERRED_MODULES = [
+    "ariadne",
+    "inflect",
+    "jinja2",
+    "langcodes",
+    "rdflib",
+    "requests",
+    "rich.traceback",
+    "s2dm.concept.models",
+    "s2dm.exporters.avro",
+    "s2dm.exporters.jsonschema",
+    "s2dm.exporters.protobuf",
+    "s2dm.exporters.shacl",
+    "s2dm.exporters.skos",
+    "s2dm.exporters.vspec",
+    "s2dm.tools.constraint_checker",
+    "s2dm.units.sync",
+]
+
+
+@pytest.fixture(scope="module")
+def import_times() -> dict[str, int]:
+    """Cumulative import times in microseconds of all modules imported by `import s2dm.cli`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import s2dm.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_stays_within_budget(import_times: dict[str, int]) -> None:
+    assert import_times["s2dm.cli"] / 1_000_000 < STARTUP_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_cli_import_defers_heavy_modules(import_times: dict[str, int], module: str) -> None:
+    assert module not in import_times
@@ -1,7 +1,11 @@
+import pytest
 from graphql import build_schema
 
+from s2dm.exporters.utils.forked_pool import can_fork
+from s2dm.exporters.utils.naming import convert_name
 from s2dm.exporters.utils.naming_config import CaseFormat, NamingConventionConfig, ValidationMode
-from s2dm.tools.naming_checker import check_naming_conventions
+from s2dm.tools import naming_checker
+from s2dm.tools.naming_checker import _CASE_FORMAT_PATTERNS, _matches_case_format, check_naming_conventions
 
 
 def test_type_name_violations() -> None:
@@ -161,3 +165,57 @@ def test_multiple_violation_types() -> None:
     errors = check_naming_conventions(schema, config)
 
     assert len(errors) == 7
+
+
+@pytest.mark.parametrize("case_format", list(CaseFormat))
+@pytest.mark.parametrize(
+    "name",
+    [
+        "isOpen",
+        "IsOpen",
+        "is_open",
+        "is-open",
+        "IS_OPEN",
+        "IS-OPEN",
+        "isopen",
+        "Is Open",
+        "helloWORLD",
+        "hello2World",
+        "HelloABC",
+        "KILOM_PER_HR_2",
+        "row1",
+        "Vehicle_Cabin_Door",
+        "abcD",
+    ],
+)
+def test_case_format_fast_path_agrees_with_conversion(name: str, case_format: CaseFormat) -> None:
+    converted_name = convert_name(name, case_format)
+
+    if _CASE_FORMAT_PATTERNS[case_format].fullmatch(name):
+        assert converted_name == name
+    assert _matches_case_format(name, case_format) == (converted_name == name, converted_name)
+
+
+@pytest.mark.skipif(not can_fork(), reason="Worker processes cannot be forked on this platform")
+def test_parallel_check_reports_violations_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    schema = build_schema(
+        "\n".join(f"type type{index} {{ Field{index}: String, item: [String] }}" for index in range(10))
+        + "\nenum status { Active }"
+    )
+    config = NamingConventionConfig.model_validate(
+        {
+            "type": {"object": CaseFormat.PASCAL_CASE, "enum": CaseFormat.PASCAL_CASE},
+            "field": {"object": CaseFormat.CAMEL_CASE},
+            "enumValue": CaseFormat.MACRO_CASE,
+        },
+        context={"mode": ValidationMode.CHECK},
+    )
+    serial_errors = check_naming_conventions(schema, config, max_workers=1)
+
+    monkeypatch.setattr(naming_checker, "CHECK_CHUNK_SIZE", 3)
+    parallel_errors = check_naming_conventions(schema, config, max_workers=3)
+
+    assert parallel_errors == serial_errors
+    assert len(serial_errors) == 32
+    assert serial_errors[0].startswith("[naming] Type 'type0'")
+    assert serial_errors[-1].startswith("[naming] List field 'type9.item'")
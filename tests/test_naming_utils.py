@@ -17,10 +17,13 @@ from graphql import (
 from s2dm.exporters.utils.extraction import get_all_object_types, get_all_objects_with_directive
 from s2dm.exporters.utils.instance_tag import expand_instance_tag
 from s2dm.exporters.utils.naming import (
+    _convert_name,
     apply_naming_to_schema,
+    clear_name_conversion_cache,
     convert_enum_values,
     convert_field_names,
     convert_name,
+    convert_names,
 )
 from s2dm.exporters.utils.naming_config import (
     ArgumentNamingConfig,
@@ -61,6 +64,21 @@ class TestConvertName:
         result = convert_name("", CaseFormat.CAMEL_CASE)
         assert result == ""
 
+    def test_convert_names_keeps_order(self) -> None:
+        """Test bulk conversion returns the converted names in input order."""
+        result = convert_names(["HelloWorld", "speed", "HelloWorld"], CaseFormat.SNAKE_CASE)
+        assert result == ["hello_world", "speed", "hello_world"]
+
+    def test_conversions_are_memoized_per_case(self) -> None:
+        """Test repeated conversions are served from the cache, separately per target case."""
+        clear_name_conversion_cache()
+        assert convert_name("isOpen", CaseFormat.MACRO_CASE) == "IS_OPEN"
+        assert convert_names(["isOpen"], CaseFormat.MACRO_CASE) == ["IS_OPEN"]
+        assert convert_name("isOpen", CaseFormat.SNAKE_CASE) == "is_open"
+
+        cache_info = _convert_name.cache_info()
+        assert (cache_info.hits, cache_info.currsize) == (1, 2)
+
 
 class TestGetCaseForElement:
     """Test getting target case configuration for different element types."""
@@ -0,0 +1,83 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from graphql import parse
+
+from s2dm.exporters.jsonschema import translate_to_jsonschema, write_jsonschema
+from s2dm.exporters.protobuf import translate_to_protobuf, write_protobuf
+from s2dm.exporters.utils.annotated_schema import AnnotatedSchema
+from s2dm.exporters.utils.output_writer import open_output, write_json
+from s2dm.exporters.utils.schema_loader import load_and_process_schema
+from s2dm.exporters.vspec import translate_to_vspec, write_vspec
+from tests.conftest import TestSchemaData as TSD
+
+QUERY = "query Selection { vehicle { averageSpeed adas { abs { isEngaged } } } }"
+
+
+@pytest.fixture(scope="module")
+def annotated_schema(spec_directory: Path) -> AnnotatedSchema:
+    annotated_schema, _, _ = load_and_process_schema(
+        schema_paths=[spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH],
+        naming_config_path=None,
+        selection_query_path=None,
+        root_type=None,
+        expanded_instances=False,
+    )
+    return annotated_schema
+
+
+def test_write_json_matches_dumps() -> None:
+    data = {"name": "Vehicle", "fields": [{"speed": 1.5, "unit": None}, {"doors": ["ROW1", "ROW2"]}], "empty": {}}
+    output = io.StringIO()
+
+    write_json(data, output)
+
+    assert output.getvalue() == json.dumps(data, indent=2)
+
+
+def test_open_output_replaces_file_on_success(tmp_path: Path) -> None:
+    output = tmp_path / "nested" / "schema.json"
+
+    with open_output(output) as output_file:
+        output_file.write("{}")
+
+    assert output.read_text() == "{}"
+    assert list(output.parent.iterdir()) == [output]
+
+
+def test_open_output_keeps_previous_file_on_failure(tmp_path: Path) -> None:
+    output = tmp_path / "schema.json"
+    output.write_text("previous")
+
+    with pytest.raises(RuntimeError), open_output(output) as output_file:
+        output_file.write("partial")
+        raise RuntimeError("exporter failed")
+
+    assert output.read_text() == "previous"
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_open_output_writes_binary_files(tmp_path: Path) -> None:
+    output = tmp_path / "annotated.s2dm"
+
+    with open_output(output, binary=True) as output_file:
+        output_file.write(b"\x00\n\xff")
+
+    assert output.read_bytes() == b"\x00\n\xff"
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_streamed_exports_match_string_exports(annotated_schema: AnnotatedSchema) -> None:
+    jsonschema_output = io.StringIO()
+    write_jsonschema(annotated_schema, jsonschema_output, strict=True)
+    assert jsonschema_output.getvalue() == translate_to_jsonschema(annotated_schema, strict=True)
+
+    vspec_output = io.StringIO()
+    write_vspec(annotated_schema, vspec_output)
+    assert vspec_output.getvalue() == translate_to_vspec(annotated_schema)
+
+    protobuf_output = io.StringIO()
+    write_protobuf(annotated_schema, parse(QUERY), protobuf_output, package_name="vehicle")
+    assert protobuf_output.getvalue() == translate_to_protobuf(annotated_schema, parse(QUERY), package_name="vehicle")
@@ -0,0 +1,166 @@
+import json
+import pstats
+import tracemalloc
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from s2dm.cli import cli
+from s2dm.exporters.utils.forked_pool import can_fork, fork_map
+from s2dm.exporters.utils.profiling import Profiler, get_profiler, profile_stage, profiled, set_profiler
+
+SCHEMA = """
+type Query { vehicle: Vehicle }
+type Vehicle { speed: Float, doors: [Door] }
+type Door { isOpen: Boolean }
+"""
+
+
+@pytest.fixture
+def profiler() -> Generator[Profiler, None, None]:
+    profiler = Profiler()
+    set_profiler(profiler)
+    yield profiler
+    set_profiler(None)
+
+
+@profiled("square")
+def square(_: None, value: int) -> int:
+    with profile_stage("inner"):
+        return value * value
+
+
+def test_stages_are_not_recorded_without_profiler() -> None:
+    assert get_profiler() is None
+    assert square(None, 3) == 9
+
+
+def test_records_calls_and_nesting(profiler: Profiler) -> None:
+    with profile_stage("outer"):
+        square(None, 2)
+        square(None, 3)
+
+    stages = profiler.data.stages
+    assert list(stages) == ["outer", "square", "inner"]
+    assert [stats.calls for stats in stages.values()] == [1, 2, 2]
+    assert [stats.depth for stats in stages.values()] == [0, 1, 2]
+    assert stages["outer"].wall_seconds >= stages["square"].wall_seconds
+    assert "  square" in profiler.format_report()
+
+
+def test_reentered_stage_is_counted_once(profiler: Profiler) -> None:
+    with profile_stage("square"):
+        square(None, 2)
+
+    assert profiler.data.stages["square"].calls == 1
+    assert len([event for event in profiler.data.trace_events if event["name"] == "square"]) == 1
+
+
+def test_stage_is_recorded_when_it_raises(profiler: Profiler) -> None:
+    with pytest.raises(ValueError), profile_stage("failing"):
+        raise ValueError("failed")
+
+    assert profiler.data.stages["failing"].calls == 1
+
+
+@pytest.mark.skipif(not can_fork(), reason="Worker processes cannot be forked on this platform")
+def test_merges_stages_of_forked_workers(profiler: Profiler) -> None:
+    assert fork_map(square, None, [1, 2, 3], max_workers=3) == [1, 4, 9]
+
+    assert profiler.data.stages["square"].calls == 3
+    assert len({event["pid"] for event in profiler.data.trace_events}) > 1
+
+
+def test_memory_report_attributes_retained_memory(tmp_path: Path) -> None:
+    profiler = Profiler(memory=True)
+    retained: list[bytes] = []
+    try:
+        with profiler.stage("outer"):
+            with profiler.stage("allocate"):
+                retained.extend(bytes(1024) for _ in range(1000))
+            with profiler.stage("temporary"):
+                allocations = [bytes(1024) for _ in range(2000)]
+                del allocations
+    finally:
+        profiler.close()
+
+    allocate = profiler.data.stages["allocate"].memory
+    temporary = profiler.data.stages["temporary"].memory
+    outer = profiler.data.stages["outer"].memory
+    assert allocate is not None and temporary is not None and outer is not None
+    assert allocate.retained_bytes >= 1000 * 1024
+    assert "test_profiling.py" in allocate.top_allocation_sites()[0].location
+    assert temporary.retained_bytes < 100 * 1024
+    assert temporary.peak_bytes >= 2000 * 1024
+    assert outer.peak_bytes >= temporary.peak_bytes
+
+    profiler.write_json(tmp_path / "report.json")
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert [stage["name"] for stage in report["stages"]] == ["outer", "allocate", "temporary"]
+    assert report["stages"][1]["retained_bytes"] == allocate.retained_bytes
+    assert "test_profiling.py" in profiler.format_memory_report()
+
+
+def test_cli_profile_outputs(tmp_path: Path) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    schema_file.write_text(SCHEMA)
+    stats_path = tmp_path / "profile.pstats"
+    trace_path = tmp_path / "trace.json"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--no-cache",
+            "--profile",
+            "--profile-stats",
+            str(stats_path),
+            "--profile-trace",
+            str(trace_path),
+            "export",
+            "jsonschema",
+            "-s",
+            str(schema_file),
+            "-o",
+            str(tmp_path / "schema.json"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    for stage in ("read_and_parse", "build_schema", "validate", "export:jsonschema"):
+        assert stage in result.output
+    assert get_profiler() is None
+
+    trace = json.loads(trace_path.read_text())
+    assert {event["name"] for event in trace["traceEvents"]} >= {"build_schema", "export:jsonschema"}
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+    assert pstats.Stats(str(stats_path)).get_stats_profile().func_profiles
+
+
+def test_cli_memory_report(tmp_path: Path) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    schema_file.write_text(SCHEMA)
+    report_path = tmp_path / "memory.json"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--no-cache",
+            "--memory-report-json",
+            str(report_path),
+            "export",
+            "vspec",
+            "-s",
+            str(schema_file),
+            "-o",
+            str(tmp_path / "schema.vspec"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Retained" in result.output
+    stages = {stage["name"]: stage for stage in json.loads(report_path.read_text())["stages"]}
+    assert stages["build_schema"]["retained_bytes"] > 0
+    assert stages["export:vspec"]["peak_bytes"] > 0
+    assert not tracemalloc.is_tracing()
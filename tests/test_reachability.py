@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import cast
+
+import pytest
+from graphql import GraphQLObjectType, GraphQLSchema, build_schema, get_named_type
+
+from s2dm.exporters.utils.naming import apply_naming_to_schema
+from s2dm.exporters.utils.naming_config import CaseFormat, NamingConventionConfig, TypeNamingConfig
+from s2dm.exporters.utils.reachability import (
+    ReachabilityIndex,
+    get_reachability_index,
+    invalidate_reachability_index,
+)
+from s2dm.exporters.utils.schema_loader import get_referenced_types, load_schema
+from tests.conftest import TestSchemaData as TSD
+
+SCHEMA = """
+directive @instanceTag on OBJECT
+type Query { vehicle: Vehicle }
+type Vehicle { body: Body, doors: [Door!]! }
+type Body { vehicle: Vehicle, shape: Shape }
+type Door { instanceTag: DoorPosition, window: Window }
+type DoorPosition @instanceTag { row: Row }
+type Window { isOpen: Boolean }
+enum Row { ROW1 ROW2 }
+enum Shape { SEDAN COUPE }
+union Part = Body | Door
+"""
+
+
+@pytest.fixture
+def schema() -> GraphQLSchema:
+    return build_schema(SCHEMA)
+
+
+def test_reachable_names_follow_cycles(schema: GraphQLSchema) -> None:
+    index = ReachabilityIndex(schema)
+
+    expected = {"Vehicle", "Body", "Shape", "Door", "DoorPosition", "Window", "Boolean"}
+    assert index.reachable_names("Vehicle") == expected
+    assert index.reachable_names("Body") == expected
+    assert index.reachable_names("Part") == expected | {"Part"}
+    assert index.reachable_names("Window") == {"Window", "Boolean"}
+
+
+def test_instance_tag_fields_are_followed_on_request(schema: GraphQLSchema) -> None:
+    assert "Row" not in ReachabilityIndex(schema).reachable_names("Door")
+    assert "Row" in ReachabilityIndex(schema, include_instance_tag_fields=True).reachable_names("Door")
+
+
+def test_root_and_unknown_types_reach_nothing(schema: GraphQLSchema) -> None:
+    index = ReachabilityIndex(schema)
+
+    assert index.reachable_names("Query") == frozenset()
+    assert index.reachable_names("__Schema") == frozenset()
+    assert index.reachable_names("Missing") == frozenset()
+
+
+def test_index_is_reused_until_invalidated(schema: GraphQLSchema) -> None:
+    index = get_reachability_index(schema)
+    assert get_reachability_index(schema) is index
+    assert get_reachability_index(schema, include_instance_tag_fields=True) is not index
+
+    invalidate_reachability_index(schema)
+    assert get_reachability_index(schema) is not index
+
+
+def test_index_is_rebuilt_after_schema_changes(schema: GraphQLSchema) -> None:
+    assert schema.type_map["Window"] in get_referenced_types(schema, "Door")
+
+    del schema.type_map["Window"]
+    assert "Window" not in get_reachability_index(schema).reachable_names("Door")
+
+    apply_naming_to_schema(schema, NamingConventionConfig(type=TypeNamingConfig(object=CaseFormat.SNAKE_CASE)))
+    assert "door_position" in get_reachability_index(schema).reachable_names("door")
+
+
+def test_matches_traversal_of_spec(spec_directory: Path) -> None:
+    schema = load_schema([spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH])
+    vehicle = cast(GraphQLObjectType, schema.type_map["Vehicle"])
+
+    # Plain breadth-first traversal of the fields and interfaces to compare against
+    expected = {"Vehicle"}
+    pending = [vehicle]
+    while pending:
+        current = pending.pop()
+        referenced = [get_named_type(field.type) for field in current.fields.values()] + list(current.interfaces)
+        for referenced_type in referenced:
+            if referenced_type.name not in expected:
+                expected.add(referenced_type.name)
+                if isinstance(referenced_type, GraphQLObjectType):
+                    pending.append(referenced_type)
+
+    assert get_referenced_types(schema, "Vehicle", True) == {schema.type_map[name] for name in expected}
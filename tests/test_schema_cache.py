@@ -0,0 +1,197 @@
+from pathlib import Path
+
+import pytest
+from ariadne.exceptions import GraphQLFileSyntaxError
+from click.testing import CliRunner
+from graphql import DocumentNode, parse, print_schema
+
+from s2dm.cli import cli
+from s2dm.exporters.utils import schema_loader
+from s2dm.exporters.utils.schema_cache import SchemaCache, get_default_schema_cache, set_default_schema_cache
+from s2dm.exporters.utils.schema_loader import (
+    build_schema_document_with_source_map,
+    load_schema,
+    load_schema_with_source_map,
+    set_ingest_workers,
+)
+
+SCHEMA_A = """
+type Query { vehicle: Vehicle }
+type Vehicle { speed: Float }
+"""
+
+SCHEMA_B = """
+enum Color { RED GREEN }
+"""
+
+
+@pytest.fixture
+def schema_files(tmp_path: Path) -> list[Path]:
+    file_a = tmp_path / "a.graphql"
+    file_b = tmp_path / "b.graphql"
+    file_a.write_text(SCHEMA_A)
+    file_b.write_text(SCHEMA_B)
+    return [file_a, file_b]
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SchemaCache:
+    schema_cache = SchemaCache(tmp_path / "cache")
+    set_default_schema_cache(schema_cache)
+    return schema_cache
+
+
+@pytest.fixture
+def parsed_sources(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the source of every parse call made by the schema loader."""
+    sources: list[str] = []
+
+    def recording_parse(source: str, **kwargs: bool) -> DocumentNode:
+        sources.append(source)
+        return parse(source, **kwargs)
+
+    monkeypatch.setattr(schema_loader, "parse", recording_parse)
+    return sources
+
+
+def cache_entries(cache: SchemaCache) -> list[Path]:
+    assert cache.cache_dir is not None
+    return list(cache.cache_dir.rglob("*.pickle"))
+
+
+def test_repeat_load_is_served_from_cache(
+    schema_files: list[Path], cache: SchemaCache, parsed_sources: list[str]
+) -> None:
+    schema, source_map = load_schema_with_source_map(schema_files)
+    assert len(parsed_sources) == 2
+    assert len(cache_entries(cache)) == 2
+
+    set_default_schema_cache(SchemaCache(cache.cache_dir))
+    cached_schema, cached_source_map = load_schema_with_source_map(schema_files)
+
+    assert len(parsed_sources) == 2
+    assert print_schema(cached_schema) == print_schema(schema)
+    assert cached_source_map == source_map == {"Query": "a.graphql", "Vehicle": "a.graphql", "Color": "b.graphql"}
+
+
+def test_only_changed_file_is_parsed_again(
+    schema_files: list[Path], cache: SchemaCache, parsed_sources: list[str]
+) -> None:
+    load_schema(schema_files)
+    schema_files[1].write_text("enum Color { RED GREEN BLUE }")
+
+    schema = load_schema(schema_files)
+
+    assert parsed_sources[2:] == ["enum Color { RED GREEN BLUE }"]
+    assert "BLUE" in print_schema(schema)
+    assert len(cache_entries(cache)) == 3
+
+
+def test_memory_only_cache(schema_files: list[Path], parsed_sources: list[str]) -> None:
+    set_default_schema_cache(SchemaCache())
+
+    load_schema(schema_files)
+    load_schema(schema_files)
+
+    assert len(parsed_sources) == 2
+
+
+def test_rebuild_drops_superseded_documents(schema_files: list[Path], parsed_sources: list[str]) -> None:
+    cache = SchemaCache()
+    set_default_schema_cache(cache)
+    load_schema(schema_files)
+    superseded_key = SchemaCache.compute_key(SCHEMA_B.encode())
+    assert cache.get(superseded_key) is not None
+
+    schema_files[1].write_text("enum Color { RED GREEN BLUE }")
+    load_schema(schema_files)
+
+    assert superseded_key not in cache._documents
+    assert len(cache._documents) == 2
+    # Unchanged files are still served from memory
+    load_schema(schema_files)
+    assert len(parsed_sources) == 3
+
+
+def test_memory_keeps_recently_used_documents() -> None:
+    cache = SchemaCache(max_memory_documents=2)
+    keys = [SchemaCache.compute_key(content.encode()) for content in (SCHEMA_A, SCHEMA_B, "scalar Unit")]
+    for key in keys:
+        cache.put(key, parse("scalar Unit"))
+        cache.get(keys[0])
+
+    assert list(cache._documents) == [keys[2], keys[0]]
+
+
+def test_unreadable_entry_is_ignored(schema_files: list[Path], cache: SchemaCache) -> None:
+    load_schema(schema_files)
+    for entry in cache_entries(cache):
+        entry.write_bytes(b"not a pickle")
+
+    set_default_schema_cache(SchemaCache(cache.cache_dir))
+    schema = load_schema(schema_files)
+
+    assert "Vehicle" in schema.type_map
+
+
+def test_cache_key_depends_on_content() -> None:
+    key = SchemaCache.compute_key(SCHEMA_A.encode())
+
+    assert key == SchemaCache.compute_key(SCHEMA_A.encode())
+    assert key != SchemaCache.compute_key(SCHEMA_B.encode())
+
+
+def test_source_map_comes_from_defining_document(tmp_path: Path) -> None:
+    file_a = tmp_path / "a.graphql"
+    file_b = tmp_path / "b.graphql"
+    file_a.write_text('"""Multi-line\ntype NotAType\n"""\ntype Vehicle { speed: Float }\n  enum Indented { A }')
+    file_b.write_text("extend type Vehicle { weight: Float }")
+
+    document, source_map = build_schema_document_with_source_map([file_a, file_b])
+
+    assert source_map == {"Vehicle": "a.graphql", "Indented": "a.graphql"}
+    assert len(document.definitions) == 3
+
+
+def test_syntax_error_names_file(tmp_path: Path) -> None:
+    broken_file = tmp_path / "broken.graphql"
+    broken_file.write_text("type Vehicle {")
+
+    with pytest.raises(GraphQLFileSyntaxError, match="broken.graphql"):
+        load_schema([broken_file])
+
+
+def test_cli_no_cache_option(schema_files: list[Path], tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cli_cache"
+    output = tmp_path / "out.graphql"
+    runner = CliRunner()
+    compose_args = ["compose", "-s", str(schema_files[0]), "-o", str(output)]
+
+    result = runner.invoke(cli, ["--cache-dir", str(cache_dir), "--no-cache", *compose_args])
+    assert result.exit_code == 0, result.output
+    assert get_default_schema_cache() is None
+    assert not cache_dir.exists()
+
+    result = runner.invoke(cli, ["--cache-dir", str(cache_dir), *compose_args])
+    assert result.exit_code == 0, result.output
+    assert len(list(cache_dir.rglob("*.pickle"))) == 1
+
+
+def test_concurrent_ingest_keeps_path_order(tmp_path: Path) -> None:
+    files = []
+    for index in range(40):
+        schema_file = tmp_path / f"type{index:02d}.graphql"
+        schema_file.write_text(f"type Type{index} {{ value: Int }}")
+        files.append(schema_file)
+
+    sequential_document, sequential_source_map = build_schema_document_with_source_map(files, max_workers=1)
+    concurrent_document, concurrent_source_map = build_schema_document_with_source_map(files, max_workers=8)
+
+    assert concurrent_document == sequential_document
+    assert list(concurrent_source_map) == [f"Type{index}" for index in range(40)]
+    assert concurrent_source_map == sequential_source_map
+
+
+def test_ingest_workers_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        set_ingest_workers(0)
@@ -0,0 +1,115 @@
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from s2dm.cli import cli
+from s2dm.exporters.utils.schema_fetch import SchemaFetcher
+from s2dm.exporters.utils.schema_loader import download_schema_to_temp
+
+SCHEMAS = {
+    "/query.graphql": b"type Query { vehicle: Vehicle }",
+    "/vehicle.graphql": b"type Vehicle { speed: Float }",
+}
+ETAG = '"v1"'
+
+
+class SchemaServer(ThreadingHTTPServer):
+    requests_by_path: dict[str, list[int]]
+
+
+class SchemaRequestHandler(BaseHTTPRequestHandler):
+    server: SchemaServer
+
+    def do_GET(self) -> None:
+        content = SCHEMAS.get(self.path.split("?")[0])
+        if self.path == "/large.graphql":
+            content = b"#" * (2 * 1024 * 1024)
+
+        if content is None:
+            status = 404
+        elif self.headers.get("If-None-Match") == ETAG:
+            status = 304
+        else:
+            status = 200
+        self.server.requests_by_path.setdefault(self.path, []).append(status)
+
+        self.send_response(status)
+        self.send_header("ETag", ETAG)
+        if status == 200 and content is not None and self.path != "/large.graphql":
+            self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if status == 200 and content is not None:
+            self.wfile.write(content)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def schema_server() -> Generator[SchemaServer, None, None]:
+    server = SchemaServer(("127.0.0.1", 0), SchemaRequestHandler)
+    server.requests_by_path = {}
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def server_url(server: SchemaServer, path: str) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host!s}:{port}{path}"
+
+
+def test_fetch_downloads_to_temporary_file(schema_server: SchemaServer) -> None:
+    path = download_schema_to_temp(server_url(schema_server, "/query.graphql"))
+
+    assert path.name == "query.graphql"
+    assert path.read_bytes() == SCHEMAS["/query.graphql"]
+
+
+def test_fetch_revalidates_cached_file(tmp_path: Path, schema_server: SchemaServer) -> None:
+    url = server_url(schema_server, "/query.graphql")
+
+    first_path = SchemaFetcher(tmp_path).fetch(url)
+    second_path = SchemaFetcher(tmp_path).fetch(url)
+
+    assert second_path == first_path
+    assert second_path.read_bytes() == SCHEMAS["/query.graphql"]
+    assert schema_server.requests_by_path["/query.graphql"] == [200, 304]
+
+
+def test_fetch_fails_for_missing_schema(tmp_path: Path, schema_server: SchemaServer) -> None:
+    with pytest.raises(RuntimeError, match="Failed to download schema"):
+        SchemaFetcher(tmp_path).fetch(server_url(schema_server, "/missing.graphql"))
+
+
+def test_fetch_enforces_size_limit_while_streaming(tmp_path: Path, schema_server: SchemaServer) -> None:
+    with pytest.raises(RuntimeError, match="Schema file too large"):
+        SchemaFetcher(tmp_path, max_size_mb=1).fetch(server_url(schema_server, "/large.graphql"))
+
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+
+def test_fetch_all_keeps_order(tmp_path: Path, schema_server: SchemaServer) -> None:
+    urls = [server_url(schema_server, path) for path in ("/vehicle.graphql", "/query.graphql")]
+
+    paths = SchemaFetcher(tmp_path).fetch_all(urls)
+
+    assert [path.read_bytes() for path in paths] == [SCHEMAS["/vehicle.graphql"], SCHEMAS["/query.graphql"]]
+
+
+def test_cli_loads_schemas_from_urls(tmp_path: Path, schema_server: SchemaServer) -> None:
+    output = tmp_path / "composed.graphql"
+    schema_args = [arg for path in SCHEMAS for arg in ("-s", server_url(schema_server, path))]
+
+    result = CliRunner().invoke(
+        cli, ["--cache-dir", str(tmp_path / "cache"), "compose", *schema_args, "-o", str(output)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "speed: Float" in output.read_text()
@@ -0,0 +1,79 @@
+from pathlib import Path
+from typing import cast
+
+import pytest
+from graphql import GraphQLObjectType, GraphQLSchema, GraphQLString, build_schema, parse, print_schema
+
+from s2dm.exporters.utils.naming import apply_naming_to_schema
+from s2dm.exporters.utils.naming_config import CaseFormat, FieldNamingConfig, NamingConventionConfig, TypeNamingConfig
+from s2dm.exporters.utils.schema_fork import fork_schema
+from s2dm.exporters.utils.schema_loader import load_schema, print_schema_with_directives_preserved, process_schema
+from tests.conftest import TestSchemaData as TSD
+
+SCHEMA = """
+directive @range(min: Float, max: Float) on FIELD_DEFINITION
+enum Unit { KILOMETER_PER_HOUR METER_PER_SECOND }
+interface Named { name: String }
+type Query { vehicle: Vehicle }
+type Vehicle implements Named {
+  name: String
+  speed(unit: Unit = KILOMETER_PER_HOUR): Float @range(min: 0)
+  body: Vehicle_Body
+}
+type Vehicle_Body { doorCount: Int }
+input Filter { unit: Unit }
+union Part = Vehicle | Vehicle_Body
+"""
+
+
+@pytest.fixture
+def schema() -> GraphQLSchema:
+    return build_schema(SCHEMA)
+
+
+def test_fork_prints_like_original(schema: GraphQLSchema) -> None:
+    forked_schema = fork_schema(schema)
+
+    assert print_schema(forked_schema) == print_schema(schema)
+    assert list(forked_schema.type_map) == list(schema.type_map)
+
+
+def test_fork_has_own_types_and_shares_builtins(schema: GraphQLSchema) -> None:
+    forked_schema = fork_schema(schema)
+
+    vehicle = cast(GraphQLObjectType, forked_schema.type_map["Vehicle"])
+    assert vehicle is not schema.type_map["Vehicle"]
+    assert vehicle.fields["body"].type is forked_schema.type_map["Vehicle_Body"]
+    assert vehicle.interfaces[0] is forked_schema.type_map["Named"]
+    assert forked_schema.type_map["String"] is GraphQLString
+    assert vehicle.ast_node is schema.type_map["Vehicle"].ast_node
+
+
+def test_modifying_fork_keeps_original(schema: GraphQLSchema) -> None:
+    original_sdl = print_schema(schema)
+    forked_schema = fork_schema(schema)
+
+    naming_config = NamingConventionConfig(
+        type=TypeNamingConfig(object=CaseFormat.PASCAL_CASE), field=FieldNamingConfig(object=CaseFormat.SNAKE_CASE)
+    )
+    apply_naming_to_schema(forked_schema, naming_config)
+    del cast(GraphQLObjectType, forked_schema.type_map["Vehicle"]).fields["name"]
+
+    assert "VehicleBody" in forked_schema.type_map
+    assert print_schema(schema) == original_sdl
+
+
+def test_process_schema_derives_variants_from_one_base(spec_directory: Path) -> None:
+    base_schema = load_schema([spec_directory, TSD.SAMPLE1_1, TSD.SAMPLE1_2, TSD.UNITS_SCHEMA_PATH])
+    original_sdl = print_schema_with_directives_preserved(base_schema)
+
+    speed_query = parse("query { vehicle { averageSpeed } }")
+    adas_query = parse("query { vehicle { adas { abs { isEngaged } } } }")
+    speed_variant = process_schema(base_schema, {}, query_document=speed_query)
+    adas_variant = process_schema(base_schema, {}, query_document=adas_query)
+
+    speed_vehicle = cast(GraphQLObjectType, speed_variant.schema.type_map["Vehicle"])
+    adas_vehicle = cast(GraphQLObjectType, adas_variant.schema.type_map["Vehicle"])
+    assert list(speed_vehicle.fields) == ["averageSpeed"]
+    assert list(adas_vehicle.fields) == ["adas"]
+    assert print_schema_with_directives_preserved(base_schema) == original_sdl
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from graphql import DocumentNode, GraphQLSchema
+
+from s2dm.cli import cli
+from s2dm.exporters.utils import schema_loader
+from s2dm.exporters.utils.schema_loader import SchemaSession
+
+SCHEMA_A = """
+type Query { vehicle: Vehicle }
+type Vehicle { id: ID! speed: Float }
+"""
+
+SCHEMA_B = """
+enum Color { RED GREEN }
+"""
+
+
+@pytest.fixture
+def schema_files(tmp_path: Path) -> list[Path]:
+    file_a = tmp_path / "a.graphql"
+    file_b = tmp_path / "b.graphql"
+    file_a.write_text(SCHEMA_A)
+    file_b.write_text(SCHEMA_B)
+    return [file_a, file_b]
+
+
+@pytest.fixture
+def schema_builds(monkeypatch: pytest.MonkeyPatch) -> list[DocumentNode]:
+    """Record every document a schema is built from by the schema loader."""
+    documents: list[DocumentNode] = []
+    build_schema_from_document = schema_loader.build_schema_from_document
+
+    def recording_build(document: DocumentNode) -> GraphQLSchema:
+        documents.append(document)
+        return build_schema_from_document(document)
+
+    monkeypatch.setattr(schema_loader, "build_schema_from_document", recording_build)
+    return documents
+
+
+@pytest.fixture
+def file_loads(monkeypatch: pytest.MonkeyPatch) -> list[list[Path]]:
+    """Record every set of paths read by the schema loader."""
+    loads: list[list[Path]] = []
+    load_schema_files = schema_loader.load_schema_files
+
+    def recording_load(paths: list[Path], max_workers: int | None = None) -> list[schema_loader.SchemaFile]:
+        loads.append(paths)
+        return load_schema_files(paths, max_workers)
+
+    monkeypatch.setattr(schema_loader, "load_schema_files", recording_load)
+    return loads
+
+
+def test_session_memoizes_artifacts(
+    schema_files: list[Path], schema_builds: list[DocumentNode], file_loads: list[list[Path]]
+) -> None:
+    session = SchemaSession()
+
+    schema = session.schema(schema_files)
+    assert session.schema(list(schema_files)) is schema
+    assert session.document(schema_files) is session.document(schema_files)
+    assert {named_type.name for named_type in session.named_types(schema_files)} >= {"Query", "Vehicle", "Color"}
+    assert session.source_map(schema_files) == {"Query": "a.graphql", "Vehicle": "a.graphql", "Color": "b.graphql"}
+    assert session.composed_sdl(schema_files) == f"{SCHEMA_A}\n{SCHEMA_B}\n"
+
+    assert len(schema_builds) == 1
+    assert len(file_loads) == 1
+
+
+def test_session_keys_on_inputs(schema_files: list[Path], file_loads: list[list[Path]]) -> None:
+    session = SchemaSession()
+
+    session.document(schema_files)
+    session.document(schema_files[0])
+    session.document(list(reversed(schema_files)))
+
+    assert len(file_loads) == 3
+
+
+def test_build_schema_returns_independent_copies(schema_files: list[Path], file_loads: list[list[Path]]) -> None:
+    session = SchemaSession()
+
+    schema = session.build_schema(schema_files)
+    schema.type_map.pop("Color")
+
+    assert "Color" in session.build_schema(schema_files).type_map
+    assert "Color" in session.schema(schema_files).type_map
+    assert len(file_loads) == 1
+
+
+def test_registry_init_parses_inputs_once(
+    tmp_path: Path, schema_files: list[Path], schema_builds: list[DocumentNode], file_loads: list[list[Path]]
+) -> None:
+    output = tmp_path / "out" / "spec_history.json"
+    args = ["registry", "init", "-o", str(output)]
+    for schema_file in schema_files:
+        args += ["-s", str(schema_file)]
+
+    result = CliRunner().invoke(cli, args)
+
+    assert result.exit_code == 0, result.output
+    assert output.exists()
+    assert len(file_loads) == 1
+    assert len(schema_builds) == 1
@@ -0,0 +1,62 @@
+import io
+
+from graphql import build_schema, print_schema
+
+from s2dm.exporters.utils.directive import build_directive_map
+from s2dm.exporters.utils.sdl_printer import write_schema_sdl
+
+SCHEMA = '''
+"""Custom root types"""
+schema { query: Root }
+directive @range(min: Float, max: Float) on FIELD_DEFINITION | INPUT_FIELD_DEFINITION
+directive @tag(name: String) on OBJECT | INTERFACE | UNION | ENUM | ENUM_VALUE | SCALAR | INPUT_OBJECT
+scalar Date @tag(name: "date") @specifiedBy(url: "https://example.com/date")
+interface Node @tag(name: "node") { id: ID! }
+"""
+A vehicle with a
+multi-line description
+"""
+type Root implements Node @tag(name: "root") {
+  id: ID!
+  "Speed of the vehicle { in km/h }"
+  speed(
+    "Unit to convert to"
+    unit: Unit = KILOMETER_PER_HOUR
+  ): Float @deprecated(reason: "Use velocity") @range(min: 0, max: 250)
+  parts: [Part!]
+}
+union Part @tag(name: "part") = Root
+enum Unit @tag(name: "unit") {
+  KILOMETER_PER_HOUR @tag(name: "kmh")
+  METER_PER_SECOND @deprecated
+}
+input Filter @tag(name: "filter") { minSpeed: Float = 0 @range(min: 0) }
+'''
+
+
+def test_prints_like_graphql_core_without_directives() -> None:
+    schema = build_schema(SCHEMA)
+    output = io.StringIO()
+
+    write_schema_sdl(schema, output)
+
+    assert output.getvalue() == print_schema(schema)
+
+
+def test_prints_directives_of_all_elements() -> None:
+    schema = build_schema(SCHEMA)
+    output = io.StringIO()
+
+    write_schema_sdl(schema, output, build_directive_map(schema))
+    result = output.getvalue()
+
+    assert 'scalar Date @tag(name: "date") @specifiedBy(url: "https://example.com/date")' in result
+    assert 'interface Node @tag(name: "node") {' in result
+    assert 'type Root implements Node @tag(name: "root") {' in result
+    assert '  ): Float @deprecated(reason: "Use velocity") @range(min: 0, max: 250)' in result
+    assert 'union Part @tag(name: "part") = Root' in result
+    assert 'enum Unit @tag(name: "unit") {' in result
+    assert '  KILOMETER_PER_HOUR @tag(name: "kmh")' in result
+    assert 'input Filter @tag(name: "filter") {' in result
+    assert "  minSpeed: Float = 0 @range(min: 0)" in result
+    assert build_schema(result).type_map.keys() == schema.type_map.keys()
@@ -0,0 +1,156 @@
+import json
+import os
+import socket
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import click
+import pytest
+import requests
+
+from s2dm.cli import cli
+from s2dm.exporters.utils.forked_pool import fork_map, run_in_process
+from s2dm.server import CommandHTTPServer, CommandRunner, create_server
+
+
+@pytest.fixture
+def server() -> Generator[CommandHTTPServer, None, None]:
+    server = create_server(CommandRunner(cli), port=0)
+    assert isinstance(server, CommandHTTPServer)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def auth_headers(server: CommandHTTPServer) -> dict[str, str]:
+    return {"Authorization": f"Bearer {server.token}"}
+
+
+def run_command(server: CommandHTTPServer, command: str, args: list[str]) -> dict[str, Any]:
+    response = requests.post(
+        f"{server.location}/{command}", json={"args": args}, headers=auth_headers(server), timeout=60
+    )
+    assert response.status_code == 200, response.text
+    result: dict[str, Any] = response.json()
+    return result
+
+
+def get_pid(_shared: None, _item: int) -> int:
+    return os.getpid()
+
+
+def test_health(server: CommandHTTPServer) -> None:
+    response = requests.get(f"{server.location}/health", timeout=10)
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert "compose" in response.json()["commands"]
+
+
+def test_rejects_invalid_requests(server: CommandHTTPServer) -> None:
+    url = f"{server.location}/compose"
+    headers = {**auth_headers(server), "Content-Type": "application/json"}
+    assert requests.post(f"{server.location}/units", json={"args": []}, headers=headers, timeout=10).status_code == 404
+    assert requests.post(url, data=b"{", headers=headers, timeout=10).status_code == 400
+    assert requests.post(url, json={"args": [1]}, headers=headers, timeout=10).status_code == 400
+    assert requests.post(url, json={"args": ["--watch"]}, headers=headers, timeout=10).status_code == 400
+
+
+def test_rejects_requests_from_other_origins(server: CommandHTTPServer) -> None:
+    url = f"{server.location}/compose"
+    port = server.server_address[1]
+    body = json.dumps({"args": ["--help"]})
+
+    # Without the token, or with a wrong one
+    assert requests.post(url, json={"args": ["--help"]}, timeout=10).status_code == 401
+    wrong_token = {"Authorization": "Bearer wrong"}
+    assert requests.post(url, json={"args": ["--help"]}, headers=wrong_token, timeout=10).status_code == 401
+    # Bodies a browser can send cross-origin without a preflight request
+    headers = {**auth_headers(server), "Content-Type": "text/plain"}
+    assert requests.post(url, data=body, headers=headers, timeout=10).status_code == 415
+    # Requests for another host name resolving to the server
+    headers = {**auth_headers(server), "Host": f"attacker.example:{port}"}
+    assert requests.post(url, json={"args": ["--help"]}, headers=headers, timeout=10).status_code == 403
+    assert requests.get(f"{server.location}/health", headers=headers, timeout=10).status_code == 403
+
+    headers = {**auth_headers(server), "Host": f"localhost:{port}"}
+    assert requests.post(url, json={"args": ["--help"]}, headers=headers, timeout=10).status_code == 200
+
+
+def test_runs_forking_commands_in_process() -> None:
+    @click.group()
+    def group() -> None:
+        pass
+
+    @group.command()
+    def pids() -> None:
+        click.echo(set(fork_map(get_pid, None, [1, 2, 3], max_workers=3)))
+
+    result = CommandRunner(group, ("pids",)).run("pids", [])
+
+    assert result.output.strip() == str({os.getpid()})
+    with run_in_process():
+        assert fork_map(get_pid, None, [1, 2, 3], max_workers=3) == [os.getpid()] * 3
+
+
+def test_reports_command_errors(server: CommandHTTPServer, tmp_path: Path) -> None:
+    result = run_command(server, "compose", ["-s", str(tmp_path / "missing.graphql"), "-o", "out.graphql"])
+
+    assert result["exit_code"] == 2
+    assert "does not exist" in result["output"]
+
+
+def test_serves_concurrent_clients(server: CommandHTTPServer, tmp_path: Path) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    schema_file.write_text("type Query { vehicle: Vehicle }\ntype Vehicle { speed: Float }")
+
+    def compose(index: int) -> dict[str, Any]:
+        return run_command(server, "compose", ["-s", str(schema_file), "-o", str(tmp_path / f"out{index}.graphql")])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(compose, range(8)))
+
+    assert [result["exit_code"] for result in results] == [0] * 8
+    assert all("speed: Float" in (tmp_path / f"out{index}.graphql").read_text() for index in range(8))
+    assert len(server.runner.session._schemas) == 1
+
+
+def test_reloads_changed_schema_files(server: CommandHTTPServer, tmp_path: Path) -> None:
+    schema_file = tmp_path / "schema.graphql"
+    output = tmp_path / "composed.graphql"
+    schema_file.write_text("type Query { speed: Int }")
+    assert run_command(server, "compose", ["-s", str(schema_file), "-o", str(output)])["exit_code"] == 0
+
+    schema_file.write_text("type Query { speed: Float, doors: Int }")
+    stat = schema_file.stat()
+    os.utime(schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert run_command(server, "compose", ["-s", str(schema_file), "-o", str(output)])["exit_code"] == 0
+
+    assert "speed: Float" in output.read_text()
+
+
+def test_serves_unix_socket(tmp_path: Path) -> None:
+    socket_path = tmp_path / "s2dm.sock"
+    server = create_server(CommandRunner(cli), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    headers, body = response.split(b"\r\n\r\n", 1)
+    assert headers.startswith(b"HTTP/1.0 200")
+    assert json.loads(body)["status"] == "ok"
+    assert not socket_path.exists()
@@ -5,7 +5,8 @@ from pathlib import Path
 import pytest
 
 from s2dm.exporters.skos import SKOSConcept
-from s2dm.tools.skos_search import NO_LIMIT_KEYWORDS, SKOSSearchService
+from s2dm.tools.skos_search import SKOSSearchService
+from s2dm.tools.string import NO_LIMIT_KEYWORDS
 
 
 @pytest.fixture
@@ -1,10 +1,9 @@
+import itertools
 from pathlib import Path
 from typing import Any, cast
-from unittest.mock import Mock, patch
 
 import pytest
-import requests
-from graphql import DirectiveLocation, build_schema, parse
+from graphql import DirectiveLocation, build_schema, get_named_type, parse
 from graphql.type import (
     GraphQLEnumType,
     GraphQLEnumValue,
@@ -12,6 +11,7 @@ from graphql.type import (
     GraphQLInterfaceType,
     GraphQLObjectType,
     GraphQLScalarType,
+    GraphQLSchema,
     GraphQLUnionType,
 )
 
@@ -44,43 +44,6 @@ def test_is_url(value: str, expected: bool, description: str) -> None:
     assert schema_loader_utils.is_url(value) == expected, description
 
 
-def test_download_schema_to_temp_success() -> None:
-    mock_response = Mock()
-    mock_response.text = "type Query { ping: String }"
-    mock_response.headers = {}
-    mock_response.raise_for_status = Mock()
-
-    with patch("s2dm.exporters.utils.schema_loader.requests.get", return_value=mock_response):
-        result = schema_loader_utils.download_schema_to_temp("https://example.com/schema.graphql")
-
-        assert result.exists()
-        assert result.suffix == ".graphql"
-        assert result.read_text() == "type Query { ping: String }"
-        result.unlink()
-
-
-def test_download_schema_to_temp_failure() -> None:
-    with (
-        patch(
-            "s2dm.exporters.utils.schema_loader.requests.get", side_effect=requests.RequestException("Network error")
-        ),
-        pytest.raises(RuntimeError, match="Failed to download schema"),
-    ):
-        schema_loader_utils.download_schema_to_temp("https://example.com/schema.graphql")
-
-
-def test_download_schema_to_temp_size_limit() -> None:
-    mock_response = Mock()
-    mock_response.headers = {"content-length": str(15 * 1024 * 1024)}
-    mock_response.raise_for_status = Mock()
-
-    with (
-        patch("s2dm.exporters.utils.schema_loader.requests.get", return_value=mock_response),
-        pytest.raises(RuntimeError, match="Schema file too large"),
-    ):
-        schema_loader_utils.download_schema_to_temp("https://example.com/schema.graphql", max_size_mb=10)
-
-
 def test_build_schema_str(schema_path: list[Path]) -> None:
     schema_str: str = schema_loader_utils.build_schema_str(schema_path)
     assert isinstance(schema_str, str)
@@ -243,10 +206,35 @@ def test_get_all_objects_with_directive(schema_path: list[Path]) -> None:
 
 def test_expand_instance_tag_and_get_all_expanded_instance_tags(schema_path: list[Path]) -> None:
     schema = schema_loader_utils.load_schema(schema_path)
-    tags: dict[GraphQLObjectType, list[str]] = instance_tag_utils.get_all_expanded_instance_tags(schema)
+    tags = instance_tag_utils.get_all_expanded_instance_tags(schema)
     assert isinstance(tags, dict)
 
 
+def test_instance_paths() -> None:
+    levels = [["ROW1", "ROW2"], ["LEFT", "CENTER", "RIGHT"], ["FRONT", "REAR"]]
+    paths = instance_tag_utils.InstancePaths(levels, prefix="Seat")
+    expected = [f"Seat.{'.'.join(combination)}" for combination in itertools.product(*levels)]
+
+    assert len(paths) == 12
+    assert list(paths) == expected
+    assert paths == expected
+    assert [paths[index] for index in range(-12, 12)] == expected + expected
+    assert paths[3:8:2] == expected[3:8:2]
+    assert "Seat.ROW2.CENTER.REAR" in paths
+    assert "Seat.ROW2.CENTER" not in paths
+    assert "ROW2.CENTER.REAR" not in paths
+    assert "Seat.ROW3.CENTER.REAR" not in paths
+    assert paths.index("Seat.ROW2.CENTER.REAR") == expected.index("Seat.ROW2.CENTER.REAR")
+    with pytest.raises(IndexError):
+        paths[12]
+    with pytest.raises(ValueError):
+        paths.index("Seat.ROW3.CENTER.REAR")
+
+    unprefixed = instance_tag_utils.InstancePaths(levels[:1])
+    assert list(unprefixed) == ["ROW1", "ROW2"]
+    assert "ROW1" in unprefixed
+
+
 def test_is_valid_instance_tag_field_and_has_valid_instance_tag_field(schema_path: list[Path]) -> None:
     schema = schema_loader_utils.load_schema(schema_path)
     object_types = extraction_utils.get_all_object_types(schema)
@@ -319,6 +307,80 @@ def test_expand_instances_in_schema(spec_directory: Path) -> None:
     assert "instanceTag" not in seat_type.fields
 
 
+def test_expand_instances_shares_intermediate_types() -> None:
+    schema = build_schema("""
+        directive @instanceTag on OBJECT
+        enum RowEnum { ROW1 ROW2 }
+        enum SideEnum { LEFT RIGHT }
+        type DoorPosition @instanceTag { row: RowEnum side: SideEnum }
+        type Door { isOpen: Boolean instanceTag: DoorPosition }
+        type Cabin { doors: [Door] }
+        type Vehicle { doors: [Door] cabin: Cabin }
+        type Query { vehicle: Vehicle }
+    """)
+
+    expanded_schema, type_metadata, field_metadata = instance_tag_utils.expand_instances_in_schema(schema)
+
+    door_row_type = expanded_schema.type_map["Door_Row"]
+    vehicle_type = cast(GraphQLObjectType, expanded_schema.type_map["Vehicle"])
+    cabin_type = cast(GraphQLObjectType, expanded_schema.type_map["Cabin"])
+    assert get_named_type(vehicle_type.fields["Door"].type) is door_row_type
+    assert get_named_type(cabin_type.fields["Door"].type) is door_row_type
+    assert set(type_metadata) == {"Door_Row", "Door_Side"}
+    assert field_metadata[("Cabin", "Door")].resolved_names == field_metadata[("Vehicle", "Door")].resolved_names
+
+
+EXPANSION_SCHEMA = """
+    directive @instanceTag on OBJECT
+    enum RowEnum { ROW1 ROW2 }
+    enum SideEnum { LEFT RIGHT }
+    enum PositionEnum { LEFT CENTER RIGHT }
+    type DoorPosition @instanceTag { row: RowEnum side: SideEnum }
+    type SeatPosition @instanceTag { row: RowEnum position: PositionEnum }
+    type Window { isOpen: Boolean position: Int }
+    type Door { isOpen: Boolean window: Window instanceTag: DoorPosition }
+    type Seat { isOccupied: Boolean instanceTag: SeatPosition }
+    type Cabin { doors: [Door] seats: [Seat!] temperature: Float }
+    type Vehicle { speed: Float cabin: Cabin doors: [Door] }
+    type Query { vehicle: Vehicle }
+"""
+
+
+def count_leaf_paths(schema: GraphQLSchema, type_name: str) -> int:
+    named_type = schema.type_map[type_name]
+    if not isinstance(named_type, GraphQLObjectType):
+        return 1
+    return sum(count_leaf_paths(schema, get_named_type(field.type).name) for field in named_type.fields.values())
+
+
+def test_estimate_expansion_matches_expanded_schema() -> None:
+    schema = build_schema(EXPANSION_SCHEMA)
+
+    estimates = instance_tag_utils.estimate_expansion(schema)
+    expanded_schema, type_metadata, _ = instance_tag_utils.expand_instances_in_schema(schema)
+
+    assert [estimate.root for estimate in estimates] == ["Vehicle"]
+    estimate = estimates[0]
+    assert estimate.paths == 1 + (3 + 1 + 1) + 3
+    assert estimate.expanded_paths == count_leaf_paths(expanded_schema, "Vehicle") == 1 + (4 * 3 + 6 * 1 + 1) + 4 * 3
+    assert estimate.intermediate_types == len(type_metadata) == 4
+    assert estimate.factor == estimate.expanded_paths / estimate.paths
+
+
+def test_expansion_budget_aborts_before_expanding() -> None:
+    schema = build_schema(EXPANSION_SCHEMA)
+
+    instance_tag_utils.set_max_expanded_paths(10)
+    try:
+        with pytest.raises(instance_tag_utils.ExpansionBudgetError, match="32 paths"):
+            instance_tag_utils.expand_instances_in_schema(schema)
+    finally:
+        instance_tag_utils.set_max_expanded_paths(None)
+
+    assert "doors" in cast(GraphQLObjectType, schema.type_map["Cabin"]).fields
+    assert "Door_Row" not in schema.type_map
+
+
 # #########################################################
 # Directive utils
 # #########################################################